@@ -0,0 +1,153 @@
+"""
+임베딩 모델 tier / 추론 backend 벤치마크
+현재 alias 가 가리키는 매장 컬렉션의 문서(일부)로 모델 조합별
+쿼리 1건 인코딩 p50 / p99, 문서 인코딩 처리량(docs/s), recall@k (e5-large sentence-transformers 기준)를 비교합니다.
+
+recall 은 조합마다 자기 모델로 문서를 다시 임베딩하고 전수 검색한 상위 k 개가
+기준 모델 상위 k 개와 얼마나 겹치는지로 계산합니다. chroma_db 는 변경하지 않습니다.
+onnx 조합은 onnxruntime / transformers 가 설치된 경우에만 측정합니다.
+"""
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent.parent
+sys.path.append(str(project_root))
+
+import chromadb
+from chromadb.config import Settings
+
+from src.logger.custom_logger import get_logger
+from src.service.chromadb.collection_alias import resolve_collection_name
+from src.service.suggest.embedding_provider import MODEL_TIERS, create_embedding_provider
+
+logger = get_logger(__name__)
+
+DOCS = 2000
+TOP_K = 5
+REPEAT = 3
+
+# 검색 서비스에 들어오는 형태의 쿼리
+SAMPLE_QUERIES = [
+    "조용한 분위기의 카페",
+    "아이랑 가기 좋은 브런치 맛집",
+    "데이트하기 좋은 파스타 레스토랑",
+    "혼밥하기 편한 국밥집",
+    "야경이 보이는 루프탑 바",
+    "주차 가능한 한식당",
+    "비 오는 날 가기 좋은 전집",
+    "디저트가 맛있는 베이커리 카페",
+    "회식하기 좋은 고깃집",
+    "반려견 동반 가능한 카페",
+    "전시를 볼 수 있는 복합문화공간",
+    "늦게까지 하는 이자카야",
+    "건강한 샐러드 가게",
+    "친구들과 보드게임 카페",
+    "가성비 좋은 초밥집",
+    "산책하기 좋은 공원 근처 카페",
+]
+
+CONFIGS = [
+    {"tier": "large", "backend": "sentence_transformers"},
+    {"tier": "base", "backend": "sentence_transformers"},
+    {"tier": "small", "backend": "sentence_transformers"},
+    {"tier": "large", "backend": "onnx"},
+    {"tier": "base", "backend": "onnx"},
+    {"tier": "small", "backend": "onnx"},
+    {"tier": "small", "backend": "onnx", "onnx_int8": True},
+    {"tier": "base", "backend": "onnx", "onnx_int8": True},
+]
+
+
+def load_documents(persist_directory: str, limit: int) -> list:
+    client = chromadb.PersistentClient(path=persist_directory, settings=Settings(anonymized_telemetry=False))
+    collection_name = resolve_collection_name(persist_directory)
+    page = client.get_collection(name=collection_name).get(include=["documents"], limit=limit)
+    logger.info(f"컬렉션 '{collection_name}': 문서 {len(page['documents'])}개 사용")
+    return page["documents"]
+
+
+def config_name(config: dict) -> str:
+    suffix = "-int8" if config.get("onnx_int8") else ""
+    return f"{config['tier']}/{config['backend']}{suffix}"
+
+
+def measure(provider, documents: list, queries: list, top_k: int) -> dict:
+    # 워밍업
+    provider.encode(queries[0])
+
+    latencies = []
+    for _ in range(REPEAT):
+        for query in queries:
+            start = time.perf_counter()
+            provider.encode(query)
+            latencies.append((time.perf_counter() - start) * 1000)
+    latencies.sort()
+
+    start = time.perf_counter()
+    doc_embeddings = provider.encode(documents, batch_size=32)
+    docs_per_s = len(documents) / (time.perf_counter() - start)
+
+    query_embeddings = provider.encode(queries, batch_size=32)
+    top = np.argsort(-(query_embeddings @ doc_embeddings.T), axis=1)[:, :top_k]
+
+    return {
+        "p50_ms": round(statistics.median(latencies), 2),
+        "p99_ms": round(latencies[max(0, int(len(latencies) * 0.99) - 1)], 2),
+        "docs_per_s": round(docs_per_s, 1),
+        "dim": int(doc_embeddings.shape[1]),
+        "top": top,
+    }
+
+
+def recall_at_k(top: np.ndarray, truth: np.ndarray) -> float:
+    hits = sum(len(set(got) & set(expected)) for got, expected in zip(top.tolist(), truth.tolist()))
+    return round(hits / truth.size, 4) if truth.size else 1.0
+
+
+def main(persist_directory: str, n_docs: int, top_k: int, threads: int, tiers: list):
+    documents = load_documents(persist_directory, n_docs)
+    queries = SAMPLE_QUERIES
+
+    rows = {}
+    for config in CONFIGS:
+        if config["tier"] not in tiers:
+            continue
+
+        name = config_name(config)
+        try:
+            provider = create_embedding_provider(config, threads=threads)
+        except ImportError as e:
+            logger.warning(f"{name} 건너뜀 (의존성 없음): {e}")
+            continue
+
+        rows[name] = measure(provider, documents, queries, top_k)
+        del provider
+
+    reference = rows.get(config_name(CONFIGS[0]))
+    if reference is None:
+        logger.warning("기준 모델(large/sentence_transformers) 결과 없음 - recall 생략")
+
+    logger.info(f"{'모델':<28}{'차원':>6}{'p50(ms)':>10}{'p99(ms)':>10}{'docs/s':>10}{f'recall@{top_k}':>12}")
+    for name, row in rows.items():
+        recall = recall_at_k(row["top"], reference["top"]) if reference is not None else "-"
+        logger.info(
+            f"{name:<28}{row['dim']:>6}{row['p50_ms']:>10}{row['p99_ms']:>10}{row['docs_per_s']:>10}{recall:>12}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="임베딩 모델 tier / backend 벤치마크")
+    parser.add_argument("--persist-directory", default="./chroma_db")
+    parser.add_argument("--docs", type=int, default=DOCS)
+    parser.add_argument("--top-k", type=int, default=TOP_K)
+    parser.add_argument("--threads", type=int, default=0, help="추론 스레드 수 (0 이면 라이브러리 기본값)")
+    parser.add_argument("--tiers", nargs="+", default=list(MODEL_TIERS), choices=list(MODEL_TIERS))
+    args = parser.parse_args()
+
+    main(args.persist_directory, args.docs, args.top_k, args.threads, args.tiers)
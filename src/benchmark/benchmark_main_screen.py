@@ -0,0 +1,109 @@
+"""
+메인 화면 조회 벤치마크
+카테고리 5 / 50 / 500개 기준으로 기존 N×M 조회와 JOIN 조회의
+DB 왕복 횟수와 p95 지연 시간을 비교합니다.
+"""
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from sqlalchemy import event
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent.parent
+sys.path.append(str(project_root))
+
+from src.infra.database.repository.maria_engine import get_engine, dispose_engine
+from src.logger.custom_logger import get_logger
+from src.service.application.main_screen_service import MainScreenService
+
+logger = get_logger(__name__)
+
+CATEGORY_SIZES = [5, 50, 500]
+ITERATIONS = 20
+
+
+class QueryCounter:
+    """엔진에서 실행되는 SQL 문 수를 센다"""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+
+async def to_main_per_row(service: MainScreenService, limit: int, tag_limit: int = 5):
+    """
+    기존 방식: 카테고리마다 category_tags 조회, 태그마다 tags 조회
+    """
+    categories = await service.category_repo.select(limit=limit)
+
+    result = {}
+    for item in categories:
+        tag_in_category = await service.category_tags_repo.select(category_id=item.id, limit=tag_limit)
+
+        names = []
+        for tag_item in tag_in_category:
+            tag_entity = await service.tags_repo.select(id=tag_item.tag_id)
+            if tag_entity:
+                names.append(tag_entity[0].name)
+        result[item.id] = names
+
+    return result
+
+
+async def to_main_joined(service: MainScreenService, limit: int):
+    return await service.to_main(limit=limit)
+
+
+async def measure(name: str, func, service: MainScreenService, limit: int, counter: QueryCounter) -> dict:
+    # 워밍업 (커넥션 풀 생성)
+    await func(service, limit)
+
+    latencies = []
+    queries = 0
+    for _ in range(ITERATIONS):
+        counter.count = 0
+        start = time.perf_counter()
+        await func(service, limit)
+        latencies.append((time.perf_counter() - start) * 1000)
+        queries = counter.count
+
+    latencies.sort()
+    p95 = latencies[max(0, int(len(latencies) * 0.95) - 1)]
+
+    return {
+        "name": name,
+        "categories": limit,
+        "queries": queries,
+        "p50_ms": round(statistics.median(latencies), 2),
+        "p95_ms": round(p95, 2),
+    }
+
+
+async def main():
+    engine = await get_engine()
+    counter = QueryCounter()
+    event.listen(engine.sync_engine, "before_cursor_execute", counter)
+
+    service = MainScreenService()
+    results = []
+
+    try:
+        for size in CATEGORY_SIZES:
+            results.append(await measure("per_row", to_main_per_row, service, size, counter))
+            results.append(await measure("joined", to_main_joined, service, size, counter))
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", counter)
+        await dispose_engine()
+
+    logger.info(f"{'방식':<10}{'카테고리':>10}{'쿼리 수':>10}{'p50(ms)':>12}{'p95(ms)':>12}")
+    for r in results:
+        logger.info(f"{r['name']:<10}{r['categories']:>10}{r['queries']:>10}{r['p50_ms']:>12}{r['p95_ms']:>12}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,151 @@
+"""
+벡터 검색 백엔드 벤치마크
+현재 alias 가 가리키는 매장 컬렉션으로 ChromaDB(HNSW) 와 NumPy 전수 검색(float32 / float16 / int8)의
+p50 / p99 지연 시간, 검색 행렬 메모리, recall@k (NumPy float32 전수 검색 결과 기준)를 비교합니다.
+양자화(float16 / int8)는 원본 재정렬 사용 / 미사용(_norerank)을 함께 측정합니다.
+
+쿼리는 저장된 매장 임베딩에 노이즈를 더해 만들고, 절반은 해당 매장의 (구, 타입) 필터를 함께 적용합니다.
+NumPy 백엔드용 export 는 임시 디렉토리에 만들므로 chroma_db 는 변경하지 않습니다.
+"""
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent.parent
+sys.path.append(str(project_root))
+
+import chromadb
+from chromadb.config import Settings
+
+from src.logger.custom_logger import get_logger
+from src.service.chromadb.collection_alias import resolve_collection_name
+from src.service.chromadb.partitions import manifest_path
+from src.service.chromadb.vector_export import write_vector_export
+from src.service.suggest.vector_backend import ChromaVectorBackend, NumpyVectorBackend
+
+logger = get_logger(__name__)
+
+QUERIES = 200
+TOP_K = 5
+NOISE = 0.05
+
+
+def load_collection(collection, page_size: int = 1000) -> dict:
+    data = {"ids": [], "embeddings": [], "metadatas": [], "documents": []}
+    offset = 0
+    while True:
+        page = collection.get(include=["embeddings", "metadatas", "documents"], limit=page_size, offset=offset)
+        if not page["ids"]:
+            return data
+        for key in data:
+            data[key].extend(page[key])
+        offset += len(page["ids"])
+
+
+def make_queries(data: dict, n_queries: int, noise: float, seed: int = 0) -> list:
+    """[(쿼리 벡터, region, type_code), ...] 절반은 필터 없음"""
+    rng = np.random.default_rng(seed)
+    embeddings = np.asarray(data["embeddings"], dtype=np.float32)
+
+    queries = []
+    for i, row in enumerate(rng.integers(0, len(embeddings), size=n_queries)):
+        vector = embeddings[row] + rng.normal(scale=noise, size=embeddings.shape[1]).astype(np.float32)
+        vector /= np.linalg.norm(vector)
+
+        if i % 2:
+            metadata = data["metadatas"][row]
+            queries.append((vector, metadata.get("region"), metadata.get("type_code")))
+        else:
+            queries.append((vector, None, None))
+    return queries
+
+
+def measure(backend, queries: list, top_k: int) -> dict:
+    # 워밍업
+    backend.query(queries[0][0], n_results=top_k, region=queries[0][1], type_code=queries[0][2])
+
+    latencies = []
+    results = []
+    for vector, region, type_code in queries:
+        start = time.perf_counter()
+        result = backend.query(vector, n_results=top_k, region=region, type_code=type_code)
+        latencies.append((time.perf_counter() - start) * 1000)
+        results.append(result["ids"])
+
+    latencies.sort()
+    return {
+        "p50_ms": round(statistics.median(latencies), 3),
+        "p99_ms": round(latencies[max(0, int(len(latencies) * 0.99) - 1)], 3),
+        "results": results,
+    }
+
+
+def recall_at_k(results: list, truth: list) -> float:
+    hits = total = 0
+    for got, expected in zip(results, truth):
+        hits += len(set(got) & set(expected))
+        total += len(expected)
+    return round(hits / total, 4) if total else 1.0
+
+
+def matrix_mb(backend) -> str:
+    """쿼리마다 전체를 읽는 검색 행렬 크기 (워커 상주 메모리), Chroma 는 측정 안 함"""
+    matrix = getattr(backend, "matrix", None)
+    return f"{matrix.nbytes / 1024 / 1024:.2f}" if matrix is not None else "-"
+
+
+def main(persist_directory: str, n_queries: int, top_k: int, noise: float, rerank_factor: int):
+    client = chromadb.PersistentClient(path=persist_directory, settings=Settings(anonymized_telemetry=False))
+    collection_name = resolve_collection_name(persist_directory)
+    data = load_collection(client.get_collection(name=collection_name))
+    logger.info(f"컬렉션 '{collection_name}': {len(data['ids'])}개 벡터")
+
+    queries = make_queries(data, n_queries, noise)
+    export_directory = tempfile.mkdtemp(prefix="vector_backend_bench_")
+
+    backends = {}
+    for dtype in ("float32", "float16", "int8"):
+        name = f"numpy_{dtype}"
+        write_vector_export(export_directory, name, data["ids"], data["embeddings"], data["metadatas"],
+                            data["documents"], dtype=dtype)
+        backends[name] = NumpyVectorBackend(export_directory, rerank_factor=rerank_factor)
+        backends[name].switch(name)
+
+        if dtype != "float32":
+            backends[f"{name}_norerank"] = NumpyVectorBackend(export_directory)
+            backends[f"{name}_norerank"].switch(name)
+            backends[f"{name}_norerank"].full_matrix = None
+
+    backends["chroma"] = ChromaVectorBackend(client, persist_directory, {"enabled": False})
+    backends["chroma"].switch(collection_name)
+    if manifest_path(persist_directory, collection_name).exists():
+        backends["chroma_partition"] = ChromaVectorBackend(client, persist_directory, {"enabled": True})
+        backends["chroma_partition"].switch(collection_name)
+
+    rows = {name: measure(backend, queries, top_k) for name, backend in backends.items()}
+    truth = rows["numpy_float32"]["results"]
+
+    logger.info(f"{'백엔드':<26}{'p50(ms)':>10}{'p99(ms)':>10}{'행렬(MB)':>10}{f'recall@{top_k}':>12}")
+    for name, row in rows.items():
+        logger.info(
+            f"{name:<26}{row['p50_ms']:>10}{row['p99_ms']:>10}{matrix_mb(backends[name]):>10}"
+            f"{recall_at_k(row['results'], truth):>12}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="벡터 검색 백엔드 벤치마크")
+    parser.add_argument("--persist-directory", default="./chroma_db")
+    parser.add_argument("--queries", type=int, default=QUERIES)
+    parser.add_argument("--top-k", type=int, default=TOP_K)
+    parser.add_argument("--noise", type=float, default=NOISE)
+    parser.add_argument("--rerank-factor", type=int, default=4)
+    args = parser.parse_args()
+
+    main(args.persist_directory, args.queries, args.top_k, args.noise, args.rerank_factor)
@@ -20,4 +20,5 @@ class ResponseDetailCategoryDTO(BaseModel):
     # average_stars: int
     is_like: bool
     tags: Optional[list[str]]
-    reviews: Optional[list[DetailCategoryReview]]
\ No newline at end of file
+    reviews: Optional[list[DetailCategoryReview]]
+    next_cursor: Optional[str] = None   #   다음 리뷰 페이지 커서 (마지막 페이지면 None)
\ No newline at end of file
@@ -15,6 +15,7 @@ class MainScreenCategoryList(BaseModel):
     image_url: str
     detail_address: str
     sub_category: str
+    tags: Optional[List[str]] = None
     # stars: int
 
 
@@ -1,4 +1,4 @@
-from sqlalchemy import select, join, and_, outerjoin
+from sqlalchemy import select, join, and_, outerjoin, exists
 from sqlalchemy.exc import IntegrityError
 
 from src.infra.database.repository.maria_engine import get_engine
@@ -37,6 +37,7 @@ class BaseRepository:
             columns=None,
             return_dto=None,
             limit=None,
+            order_by=None,
             **filters
     ) -> list:
         """
@@ -78,6 +79,12 @@ class BaseRepository:
             columns=['id', 'comment', 'user.nickname'],
             category_id='cat123'
         )
+
+        # 정렬 ('-' 접두사는 내림차순)
+        tags = await repo.select(
+            order_by=['-count', 'id'],
+            category_id=['cat1', 'cat2']
+        )
         """
         try:
             engine = await get_engine()
@@ -112,11 +119,15 @@ class BaseRepository:
                     else:
                         stmt = stmt.where(col == value)
 
-                # 5. LIMIT
+                # 5. ORDER BY
+                if order_by:
+                    stmt = stmt.order_by(*self._build_order_by(order_by, join_map))
+
+                # 6. LIMIT
                 if limit is not None:
                     stmt = stmt.limit(limit)
 
-                # 6. 실행
+                # 7. 실행
                 result = await conn.execute(stmt)
                 rows = list(result.mappings())
 
@@ -124,7 +135,7 @@ class BaseRepository:
                     self.logger.info(f"no items in {self.table} with filters: {filters}")
                     return []
 
-                # 7. 반환 형식 결정
+                # 8. 반환 형식 결정
                 if return_dto:
                     return [return_dto(**row) for row in rows]
                 elif not joins:
@@ -175,6 +186,30 @@ class BaseRepository:
         return ans
 
 
+    async def exists(self, **filters) -> bool:
+        """
+            SELECT EXISTS(SELECT 1 FROM table WHERE ...) 로 존재 여부만 확인
+
+            liked = await repo.exists(user_id='user123', category_id='cat123')
+        """
+        try:
+            engine = await get_engine()
+            async with engine.begin() as conn:
+                conditions = [
+                    getattr(self.table.c, column) == value
+                    for column, value in filters.items()
+                    if hasattr(self.table.c, column)
+                ]
+                stmt = select(exists().where(and_(*conditions)))
+
+                result = await conn.execute(stmt)
+                return bool(result.scalar())
+
+        except Exception as e:
+            self.logger.error(f"exists error in {self.table}: {e}")
+            raise e
+
+
     async def delete(self, **filters):
         try:
             engine = await get_engine()
@@ -251,6 +286,23 @@ class BaseRepository:
 
         return selected
 
+    def _build_order_by(self, order_by, join_map: dict) -> list:
+        """
+            order_by 형식:
+            ['-count', 'id', 'user.nickname'] → count DESC, id ASC, user.nickname ASC
+        """
+        if isinstance(order_by, str):
+            order_by = [order_by]
+
+        clauses = []
+        for col_str in order_by:
+            if col_str.startswith('-'):
+                clauses.append(self._parse_column(col_str[1:], join_map).desc())
+            else:
+                clauses.append(self._parse_column(col_str, join_map).asc())
+
+        return clauses
+
     def _parse_column(self, col_str: str, join_map: dict):
         """
             'user.nickname' → user_table.c.nickname
@@ -1,5 +1,8 @@
+from sqlalchemy import select, func
+
 from src.domain.entities.category_entity import CategoryEntity
 from src.infra.database.repository import base_repository
+from src.infra.database.repository.maria_engine import get_engine
 from src.infra.database.tables.table_category import category_table
 
 
@@ -20,3 +23,55 @@ class CategoryRepository(base_repository.BaseRepository):
         
     async def delete(self, **filters):
         return await super().delete(**filters)
+
+    async def select_page(self, after_id: str = None, limit: int = 500, crawled_after=None) -> list:
+        """
+            id 기준 keyset 페이지 조회 (전체 적재 시 청크 단위 스트리밍)
+
+            page = await repo.select_page(after_id=None, limit=500)
+            page = await repo.select_page(after_id=page[-1].id, limit=500)
+
+            # 증분 동기화: last_crawl 이 기준 시각 이후인 매장만
+            page = await repo.select_page(after_id=None, limit=500, crawled_after=high_water_mark)
+        """
+        try:
+            engine = await get_engine()
+            async with engine.begin() as conn:
+                stmt = select(self.table)
+                if after_id is not None:
+                    stmt = stmt.where(self.table.c.id > after_id)
+                if crawled_after is not None:
+                    stmt = stmt.where(self.table.c.last_crawl > crawled_after)
+                stmt = stmt.order_by(self.table.c.id.asc()).limit(limit)
+
+                result = await conn.execute(stmt)
+                return [self.entity(**row) for row in result.mappings()]
+
+        except Exception as e:
+            self.logger.error(f"select page error in {self.table}: {e}")
+            raise e
+
+    async def select_ids(self) -> list:
+        """
+            전체 매장 id 만 조회 (벡터 DB 와 삭제 여부 비교용)
+        """
+        try:
+            engine = await get_engine()
+            async with engine.begin() as conn:
+                result = await conn.execute(select(self.table.c.id))
+                return [row[0] for row in result]
+
+        except Exception as e:
+            self.logger.error(f"select ids error in {self.table}: {e}")
+            raise e
+
+    async def count(self) -> int:
+        try:
+            engine = await get_engine()
+            async with engine.begin() as conn:
+                result = await conn.execute(select(func.count()).select_from(self.table))
+                return result.scalar()
+
+        except Exception as e:
+            self.logger.error(f"count error in {self.table}: {e}")
+            raise e
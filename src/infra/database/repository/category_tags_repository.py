@@ -1,6 +1,7 @@
 from src.domain.entities.category_tags_entity import CategoryTagsEntity
 from src.infra.database.repository import base_repository
 from src.infra.database.tables.table_category_tags import category_tags_table
+from src.infra.database.tables.table_tags import tags_table
 
 
 class CategoryTagsRepository(base_repository.BaseRepository):
@@ -20,3 +21,28 @@ class CategoryTagsRepository(base_repository.BaseRepository):
 
     async def delete(self, **filters):
         return await super().delete(**filters)
+
+    async def select_with_tag_names(self, **filters):
+        """
+            category_tags ⋈ tags 를 한 번에 조회 (count 내림차순)
+
+            rows = await repo.select_with_tag_names(category_id=['cat1', 'cat2'])
+            -> [{'category_id': 'cat1', 'tag_id': 101, 'count': 12, 'name': '조용한'}, ...]
+        """
+        return await super().select(
+            joins=[
+                {
+                    'table': tags_table,
+                    'on': {'tag_id': 'id'},
+                    'alias': 'tag'
+                }
+            ],
+            columns={
+                'category_id': None,
+                'tag_id': None,
+                'count': None,
+                'tag.name': 'name'
+            },
+            order_by=['category_id', '-count'],
+            **filters
+        )
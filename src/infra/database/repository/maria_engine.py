@@ -1,10 +1,43 @@
-
+import asyncio
 from json import load
 from pathlib import Path
 
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine
 
 _ENGINE = None
+_ENGINE_LOCK = asyncio.Lock()
+
+#   database_config.json 에 값이 없을 때 사용할 풀 기본값
+_POOL_DEFAULTS = {
+    "max_pool_size": 20,
+    "max_overflow": 10,
+    "pool_pre_ping": True,
+    "pool_recycle": 3600,      #   MariaDB wait_timeout 보다 짧게 유지
+    "pool_timeout": 30,
+    "connect_timeout": 10,
+}
+
+
+def _load_config() -> dict:
+    config_path = Path(__file__).parent.parent.parent.parent.joinpath('resources').joinpath('config').joinpath('database_config.json')
+
+    with open(config_path) as f:
+        return load(f)["maria"]
+
+
+def _create_engine(config: dict) -> AsyncEngine:
+    pool = {key: config.get(key, default) for key, default in _POOL_DEFAULTS.items()}
+
+    return create_async_engine(
+        f'mysql+asyncmy://{config["user"]}:{config["password"]}'
+        f'@{config["host"]}:{config["port"]}/{config["database"]}',
+        pool_size=pool["max_pool_size"],
+        max_overflow=pool["max_overflow"],
+        pool_pre_ping=pool["pool_pre_ping"],
+        pool_recycle=pool["pool_recycle"],
+        pool_timeout=pool["pool_timeout"],
+        connect_args={"connect_timeout": pool["connect_timeout"]},
+    )
 
 
 async def get_engine() -> AsyncEngine:
@@ -13,20 +46,46 @@ async def get_engine() -> AsyncEngine:
     if _ENGINE is not None:
         return _ENGINE
 
-    try:
+    #   동시 요청이 몰려도 엔진은 한 번만 생성
+    async with _ENGINE_LOCK:
+        if _ENGINE is not None:
+            return _ENGINE
 
-        config_path = Path(__file__).parent.parent.parent.parent.joinpath('resources').joinpath('config').joinpath('database_config.json')
+        try:
+            _ENGINE = _create_engine(_load_config())
+            return _ENGINE
 
-        with open(config_path) as f:
-            config = load(f)["maria"]
+        except Exception as e:
+            print(e)
+            raise Exception("engine error: ") from e
 
-            _ENGINE = create_async_engine(
-                f'mysql+asyncmy://{config["user"]}:{config["password"]}'
-                f'@{config["host"]}:{config["port"]}/{config["database"]}'
-            )
 
-        return _ENGINE
+async def dispose_engine() -> None:
+    """
+        lifespan 종료 시 커넥션 풀 정리
+    """
+    global _ENGINE
+
+    async with _ENGINE_LOCK:
+        if _ENGINE is not None:
+            await _ENGINE.dispose()
+            _ENGINE = None
+
+
+def get_pool_status() -> dict:
+    """
+        커넥션 풀 상태 (부하 테스트 시 풀 크기 산정용)
+    """
+    if _ENGINE is None:
+        return {"initialized": False}
+
+    pool = _ENGINE.pool
 
-    except Exception as e:
-        print(e)
-        raise Exception("engine error: ") from e
\ No newline at end of file
+    return {
+        "initialized": True,
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+        "status": pool.status(),
+    }
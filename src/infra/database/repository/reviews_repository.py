@@ -1,6 +1,10 @@
+from sqlalchemy import select
+
 from src.domain.entities.reviews_entity import ReviewsEntity
+from src.infra.database.repository.maria_engine import get_engine
 from . import base_repository
 from ..tables.table_reviews import reviews_table
+from ..tables.table_users import users_table
 
 
 class ReviewsRepository(base_repository.BaseRepository):
@@ -21,3 +25,53 @@ class ReviewsRepository(base_repository.BaseRepository):
 
     async def delete(self, **filters):
         return await super().delete(**filters)
+
+    async def select_page_with_nickname(self, category_id: str, cursor: str = None, size: int = 20) -> tuple:
+        """
+            reviews ⋈ users 커서 기반 페이지 조회 (id 오름차순)
+
+            rows, next_cursor = await repo.select_page_with_nickname('cat123', cursor=None, size=20)
+            -> rows: [{'id': ..., 'nickname': ..., 'stars': ..., 'comment': ...}, ...]
+               next_cursor: 다음 페이지 요청 시 넘길 마지막 리뷰 id (마지막 페이지면 None)
+        """
+        try:
+            engine = await get_engine()
+            async with engine.begin() as conn:
+                from_clause, join_map = self._build_joins([
+                    {
+                        'table': users_table,
+                        'on': {'user_id': 'id'},
+                        'alias': 'user'
+                    }
+                ])
+                selected = self._build_columns({
+                    'id': None,
+                    'user.nickname': 'nickname',
+                    'stars': None,
+                    'comments': 'comment'
+                }, join_map)
+
+                stmt = (
+                    select(*selected)
+                    .select_from(from_clause)
+                    .where(self.table.c.category_id == category_id)
+                )
+                if cursor is not None:
+                    stmt = stmt.where(self.table.c.id > cursor)
+
+                #   한 개 더 가져와서 다음 페이지 존재 여부 판단
+                stmt = stmt.order_by(self.table.c.id.asc()).limit(size + 1)
+
+                result = await conn.execute(stmt)
+                rows = list(result.mappings())
+
+            next_cursor = None
+            if len(rows) > size:
+                rows = rows[:size]
+                next_cursor = rows[-1]['id']
+
+            return rows, next_cursor
+
+        except Exception as e:
+            self.logger.error(f"select page error in {self.table}: {e}")
+            raise e
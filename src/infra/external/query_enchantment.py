@@ -3,11 +3,14 @@ Copilot API를 사용한 검색 쿼리 개선 서비스
 """
 import os
 import asyncio
+import unicodedata
 import aiohttp
 from dotenv import load_dotenv
 from typing import Optional
 
+from src.utils.config import get_service_config
 from src.utils.path import path_dic
+from src.utils.ttl_cache import TTLCache
 from src.logger.custom_logger import get_logger
 
 load_dotenv(dotenv_path=path_dic["env"])
@@ -18,6 +21,21 @@ class QueryEnhancementService:
     """사용자 입력을 자연스러운 검색 쿼리로 변환하는 클래스"""
     
     def __init__(self):
+        config = get_service_config("query_enhancement")
+        self.latency_budget_s = config.get("latency_budget_s", 3.0)     # 전체 시간 예산 (초과 시 기본 쿼리)
+        self.request_timeout_s = config.get("request_timeout_s", 2.0)   # 1회 호출 제한 시간
+        self.max_retries = config.get("max_retries", 3)
+        self.pool_limit = config.get("pool_limit", 20)
+
+        # 개선된 쿼리 캐시: (혼자 방문 여부, 카테고리 타입, 정규화된 키워드)
+        self.cache = TTLCache(
+            max_entries=config.get("cache_max_entries", 2000),
+            ttl_s=config.get("cache_ttl_s", 3600)
+        )
+
+        # 요청마다 세션을 만들지 않도록 서비스가 세션을 보유 (첫 호출 시 생성)
+        self._session: Optional[aiohttp.ClientSession] = None
+
         self.api_token = os.getenv('COPILOT_API_KEY2')
         if self.api_token:
             self.api_endpoint = "https://api.githubcopilot.com/chat/completions"
@@ -30,21 +48,46 @@ class QueryEnhancementService:
         else:
             logger.warning("GitHub API 토큰이 없습니다. 쿼리 개선 기능이 비활성화됩니다.")
     
+    async def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.pool_limit)
+            )
+        return self._session
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    @staticmethod
+    def _make_cache_key(
+        personnel: Optional[int],
+        category_type: Optional[str],
+        user_keyword: str
+    ) -> tuple:
+        """프롬프트에 영향을 주는 값만으로 캐시 키 구성 (키워드 순서/공백/대소문자 무시)"""
+        keywords = unicodedata.normalize("NFC", user_keyword).lower().split(",")
+        keywords = sorted({" ".join(k.split()) for k in keywords if k.strip()})
+
+        return personnel == 1, category_type or "", tuple(keywords)
+
     async def enhance_query(
         self,
         personnel: Optional[int],
         category_type: Optional[str],
         user_keyword: str,
-        max_retries: int = 10
+        max_retries: Optional[int] = None
     ) -> str:
         """
         사용자 입력을 자연스러운 검색 문장으로 변환
+        전체 시간 예산(latency_budget_s)을 넘기면 재시도하지 않고 기본 쿼리 반환
         
         Args:
             personnel: 인원 수
             category_type: 카테고리 타입 (음식점, 카페, 콘텐츠)
             user_keyword: 사용자 입력 키워드
-            max_retries: 최대 재시도 횟수
+            max_retries: 최대 재시도 횟수 (None 이면 설정값)
             
         Returns:
             str: 개선된 검색 쿼리
@@ -57,6 +100,14 @@ class QueryEnhancementService:
         if not user_keyword or not user_keyword.strip():
             return self._build_fallback_query(personnel, category_type, user_keyword)
         
+        cache_key = self._make_cache_key(personnel, category_type, user_keyword)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            logger.info(f"쿼리 개선 캐시 사용: '{user_keyword}' → '{cached}'")
+            return cached
+        
+        max_retries = max_retries if max_retries is not None else self.max_retries
+        
         # 프롬프트 구성
         prompt = self._build_prompt(personnel, category_type, user_keyword)
         
@@ -85,51 +136,48 @@ class QueryEnhancementService:
             "max_tokens": 100
         }
         
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.latency_budget_s
+        session = await self._get_session()
+        
         for attempt in range(1, max_retries + 1):
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            
             try:
-                timeout = aiohttp.ClientTimeout(total=10)
-                async with aiohttp.ClientSession(timeout=timeout) as session:
-                    async with session.post(
-                        self.api_endpoint,
-                        headers=self.headers,
-                        json=payload
-                    ) as response:
-                        if response.status == 200:
-                            result = await response.json()
-                            enhanced_query = result['choices'][0]['message']['content'].strip()
-                            
-                            # 불필요한 따옴표나 마침표 제거
-                            enhanced_query = enhanced_query.strip('"\'.')
-                            
-                            logger.info(f"쿼리 개선 완료: '{user_keyword}' → '{enhanced_query}'")
-                            return enhanced_query
-                        else:
-                            logger.warning(f"쿼리 개선 API 호출 실패 ({attempt}번째 시도) - 상태 코드: {response.status}")
-                            
-                            if attempt < max_retries:
-                                await asyncio.sleep(0.5)
-                            else:
-                                logger.warning("최대 재시도 초과 - 기본 쿼리 사용")
-                                return self._build_fallback_query(personnel, category_type, user_keyword)
+                timeout = aiohttp.ClientTimeout(total=min(self.request_timeout_s, remaining))
+                async with session.post(
+                    self.api_endpoint,
+                    headers=self.headers,
+                    json=payload,
+                    timeout=timeout
+                ) as response:
+                    if response.status == 200:
+                        result = await response.json()
+                        enhanced_query = result['choices'][0]['message']['content'].strip()
+                        
+                        # 불필요한 따옴표나 마침표 제거
+                        enhanced_query = enhanced_query.strip('"\'.')
+                        
+                        logger.info(f"쿼리 개선 완료: '{user_keyword}' → '{enhanced_query}'")
+                        self.cache.set(cache_key, enhanced_query)
+                        return enhanced_query
+                    else:
+                        logger.warning(f"쿼리 개선 API 호출 실패 ({attempt}번째 시도) - 상태 코드: {response.status}")
                 
             except asyncio.TimeoutError:
                 logger.warning(f"쿼리 개선 API 시간 초과 ({attempt}번째 시도)")
-                
-                if attempt < max_retries:
-                    await asyncio.sleep(1)
-                else:
-                    logger.warning("최대 재시도 초과 - 기본 쿼리 사용")
-                    return self._build_fallback_query(personnel, category_type, user_keyword)
                     
             except Exception as e:
                 logger.error(f"쿼리 개선 중 오류 ({attempt}번째 시도): {e}")
-                
-                if attempt < max_retries:
-                    await asyncio.sleep(1)
-                else:
-                    logger.error("최대 재시도 초과 - 기본 쿼리 사용")
-                    return self._build_fallback_query(personnel, category_type, user_keyword)
+            
+            # 남은 예산 안에서만 대기 후 재시도
+            backoff = min(0.5 * attempt, deadline - loop.time())
+            if attempt < max_retries and backoff > 0:
+                await asyncio.sleep(backoff)
         
+        logger.warning(f"쿼리 개선 시간 예산({self.latency_budget_s}초) 또는 재시도 초과 - 기본 쿼리 사용")
         return self._build_fallback_query(personnel, category_type, user_keyword)
     
     def _build_prompt(
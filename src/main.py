@@ -1,22 +1,49 @@
-from contextlib import asynccontextmanager
+import asyncio
+from contextlib import asynccontextmanager, suppress
 
 import uvicorn
 from fastapi import FastAPI
 from starlette.middleware.cors import CORSMiddleware
 
+from src.infra.database.repository.maria_engine import get_engine, dispose_engine
+from src.router.admin import monitoring_controller
 from src.router.users import user_controller, service_controller, my_info_controller
+from src.service.application.session_store import get_session_store, close_session_store, \
+    run_session_sweeper
+from src.service.suggest.suggest_registry import init_suggest_service, close_suggest_service
 from src.utils.exception_handler.http_log_handler import setup_exception_handlers
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    #   커넥션 풀은 앱 시작 시 한 번만 생성
+    await get_engine()
+
+    #   채팅 세션 저장소 (sqlite / redis 연결 확인, 실패하면 기동 중단) + 만료 / 초과 세션 정리
+    await get_session_store().ping()
+    session_sweeper = asyncio.create_task(run_session_sweeper())
+
+    #   임베딩 모델 / ChromaDB 로드는 오래 걸리므로 백그라운드에서 진행 (/api/admin/health 로 확인)
+    suggest_loading = asyncio.create_task(init_suggest_service())
 
     yield
+
+    suggest_loading.cancel()
+    session_sweeper.cancel()
+    with suppress(asyncio.CancelledError, Exception):
+        await suggest_loading
+    with suppress(asyncio.CancelledError):
+        await session_sweeper
+    await close_suggest_service()
+    await close_session_store()
+    await dispose_engine()
 app = FastAPI(lifespan=lifespan)
 setup_exception_handlers(app)
 app.include_router(user_controller.router)
 app.include_router(my_info_controller.router)
 app.include_router(service_controller.router)
+app.include_router(monitoring_controller.router)
+app.include_router(monitoring_controller.health_router)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=[
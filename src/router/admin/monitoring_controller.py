@@ -0,0 +1,94 @@
+from fastapi import APIRouter, Depends
+from starlette.responses import JSONResponse
+
+from src.infra.database.repository.maria_engine import get_pool_status
+from src.logger.custom_logger import get_logger
+from src.service.application.session_store import get_session_store
+from src.service.application.tag_cache import get_tag_cache
+from src.service.auth.jwt import validate_jwt_token
+from src.service.suggest.store_detail_cache import get_store_detail_cache
+from src.service.suggest.suggest_registry import get_suggest_status, is_suggest_service_ready, \
+    get_loaded_suggest_service
+
+router = APIRouter(
+    prefix="/api/admin",
+    tags=["admin"],
+    dependencies=[Depends(validate_jwt_token)]
+)
+#   로드밸런서 프로브용 헬스 체크만 인증 없이 노출
+health_router = APIRouter(prefix="/api/admin", tags=["admin"])
+logger = get_logger(__name__)
+
+
+#   DB 커넥션 풀 상태
+@router.get("/pool")
+async def pool_status():
+    return JSONResponse(content=get_pool_status())
+
+
+#   헬스 체크: 임베딩 모델 / ChromaDB 로드 완료 전에는 503
+@health_router.get("/health")
+async def health():
+    ready = is_suggest_service_ready()
+
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={
+            "status": "ready" if ready else "not_ready",
+            "database": get_pool_status().get("initialized", False),
+            "suggest_service": get_suggest_status(),
+        }
+    )
+
+
+#   임베딩 배치 실행기 지표 (큐 길이, 배치 채움률)
+@router.get("/embedding")
+async def embedding_status():
+    service = get_loaded_suggest_service()
+
+    if service is None:
+        return JSONResponse(status_code=503, content={"status": get_suggest_status()["status"]})
+
+    return JSONResponse(content=service.embedding_executor.get_metrics())
+
+
+#   캐시 적중률
+@router.get("/cache")
+async def cache_status():
+    content = {"tag_extraction": get_tag_cache().stats()}
+
+    store_detail_cache = get_store_detail_cache()
+    if store_detail_cache is not None:
+        content["store_detail"] = store_detail_cache.stats()
+
+    service = get_loaded_suggest_service()
+    if service is not None:
+        content["query_enhancement"] = service.query_enhancer.cache.stats()
+        content["query_embedding"] = service.embedding_cache.stats()
+
+    return JSONResponse(content=content)
+
+
+#   벡터 검색 백엔드 (종류, 컬렉션, 벡터 수, BM25 색인 사용 여부)
+@router.get("/vector")
+async def vector_status():
+    service = get_loaded_suggest_service()
+
+    if service is None:
+        return JSONResponse(status_code=503, content={"status": get_suggest_status()["status"]})
+
+    content = service.vector_backend.stats()
+    content["lexical_index"] = len(service.lexical_index) if service.lexical_index is not None else None
+
+    return JSONResponse(content=content)
+
+
+#   채팅 세션 저장소 (종류, 세션 수 / 바이트, 만료·제거 수)
+@router.get("/sessions")
+async def session_status():
+    session_store = get_session_store()
+
+    content = session_store.stats()
+    content.update(await session_store.metrics())
+
+    return JSONResponse(content=content)
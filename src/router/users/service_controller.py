@@ -1,16 +1,20 @@
+import asyncio
+import json
 import uuid
-from typing import Dict
+from typing import AsyncIterator, Dict, Optional
 
-from fastapi import APIRouter, HTTPException, Request, Depends
-from starlette.responses import JSONResponse
+from fastapi import APIRouter, HTTPException, Request, Depends, Query
+from starlette.responses import JSONResponse, StreamingResponse
 
 from src.domain.dto.service.haru_service_dto import (RequestStartMainServiceDTO, ResponseStartMainServiceDTO
 , RequestChatServiceDTO, ResponseChatServiceDTO)
 from src.logger.custom_logger import get_logger
 from src.service.application.ai_service_handler import handle_modification_mode, handle_user_message, \
-    handle_user_action_response
+    handle_user_action_response, is_recommendation_request, iter_store_recommendations, order_by_category, \
+    complete_with_recommendations
 from src.service.application.main_screen_service import MainScreenService
 from src.service.application.prompts import RESPONSE_MESSAGES
+from src.service.application.session_store import SessionStore, SessionConflictError, get_session_store
 from src.service.auth.jwt import validate_jwt_token
 
 router = APIRouter(
@@ -19,9 +23,13 @@ router = APIRouter(
 )
 logger = get_logger(__name__)
 
-# 현재는 메모리 기반 딕셔너리 사용 (서버 재시작 시 초기화됨)
-#   수정 예정
-sessions: Dict[str, Dict] = {}
+#   세션은 session_store 설정(memory / sqlite / redis)에 저장
+#   sqlite / redis 를 쓰면 재시작 후에도 유지되고 여러 워커가 같은 세션을 사용
+
+#   채팅 처리 중 클라이언트 연결 확인 주기 (초)
+DISCONNECT_POLL_INTERVAL = 0.5
+
+SESSION_CONFLICT_DETAIL = "같은 세션의 다른 요청이 먼저 처리되었습니다. 다시 시도해주세요."
 
 
 #   메인 화면: 로그인 후 바로 보여지는 화면
@@ -35,10 +43,21 @@ async def to_main_screen(request: Request):
     )
 
 @router.get("/detail/{category_id}")
-async def to_detail(category_id: str, request: Request):
+async def to_detail(
+        category_id: str,
+        request: Request,
+        user_id: Optional[str] = None,
+        cursor: Optional[str] = None,
+        size: int = Query(20, ge=1, le=100)
+):
 
     main_service_class = MainScreenService()
-    content = await main_service_class.get_category_detail(category_id)
+    content = await main_service_class.get_category_detail(
+        category_id,
+        user_id=user_id,
+        cursor=cursor,
+        size=size
+    )
     return JSONResponse(
         content=content.model_dump()
     )
@@ -57,7 +76,7 @@ async def start_conversation(data: RequestStartMainServiceDTO, request: Request)
     session_id = str(uuid.uuid4())
 
     # 세션 데이터 초기화
-    sessions[session_id] = {
+    await get_session_store().set(session_id, {
         "play_address": data.play_address,
         "peopleCount": data.peopleCount,
         "selectedCategories": data.selectedCategories,
@@ -69,7 +88,7 @@ async def start_conversation(data: RequestStartMainServiceDTO, request: Request)
         "lastUserMessage": "",  # 마지막 사용자 메시지
         "pendingTags": [],  # 대기 중인 태그들
         "modificationMode": False,  # 수정 모드인지
-    }
+    })
 
     # 첫 번째 카테고리에 대한 질문 생성 (인원수와 카테고리 정보 포함)
     first_category = data.selectedCategories[0]
@@ -97,42 +116,176 @@ async def start_conversation(data: RequestStartMainServiceDTO, request: Request)
     )
 
 
+def completed_response() -> ResponseChatServiceDTO:
+    return ResponseChatServiceDTO(
+        status="success",
+        message="대화가 완료되었습니다. 새로운 대화를 시작하려면 처음부터 다시 시작해주세요.",
+        stage="completed"
+    )
+
+
+async def save_session(session_store: SessionStore, session_id: str, session: Dict):
+    """
+    처리 결과 저장 (조회 후 다른 요청이 먼저 저장했으면 409, 앞선 변경을 덮어쓰지 않음)
+    """
+    try:
+        await session_store.set(session_id, session)
+    except SessionConflictError:
+        logger.warning(f"세션 저장 충돌: {session_id}")
+        raise HTTPException(status_code=409, detail=SESSION_CONFLICT_DETAIL)
+
+
+async def run_until_disconnected(http_request: Request, coro):
+    """
+    클라이언트 연결이 끊기면 진행 중인 LLM / 추천 작업을 취소
+    """
+    task = asyncio.create_task(coro)
+
+    while True:
+        done, _ = await asyncio.wait({task}, timeout=DISCONNECT_POLL_INTERVAL)
+        if done:
+            return task.result()
+
+        if await http_request.is_disconnected():
+            task.cancel()
+            logger.info("클라이언트 연결 종료 - 진행 중인 작업 취소")
+            raise HTTPException(status_code=499, detail="클라이언트 연결이 종료되었습니다.")
+
+
 @router.get("/chat")
 @router.post("/chat")
-async def chat(request: RequestChatServiceDTO):
+async def chat(request: RequestChatServiceDTO, http_request: Request):
 
-    # 세션 확인
-    if request.sessionId not in sessions:
+    # 세션 확인 (저장소에서 읽은 복사본이므로 처리 후 다시 저장)
+    session_store = get_session_store()
+    session = await session_store.get(request.sessionId)
+    if session is None:
         raise HTTPException(status_code=404, detail="세션을 찾을 수 없습니다.")
 
-    session = sessions[request.sessionId]
-
     # completed 상태 처리 - 대화 완료 후 추가 메시지
     if session.get("stage") == "completed":
 
-        contents = ResponseChatServiceDTO(
-                status="success",
-                message="대화가 완료되었습니다. 새로운 대화를 시작하려면 처음부터 다시 시작해주세요.",
-                stage="completed"
-        )
-
         return JSONResponse(
-            content=contents.model_dump()
+            content=completed_response().model_dump()
         )
 
     # modification_mode 처리
     if session.get("stage") == "modification_mode":
+        response = handle_modification_mode(session, request.message)
+        await save_session(session_store, request.sessionId, session)
 
         return JSONResponse(
-            content=handle_modification_mode(session, request.message).model_dump()
+            content=response.model_dump()
         )
 
     # 사용자 액션(Next/More 또는 Yes) 응답 처리
     if session.get("waitingForUserAction", False):
-        response = await handle_user_action_response(session, request.message)
+        response = await run_until_disconnected(
+            http_request, handle_user_action_response(session, request.message)
+        )
+        await save_session(session_store, request.sessionId, session)
         return JSONResponse(content=response.model_dump())
 
     # 일반 메시지 처리 (태그 생성)
+    response = await run_until_disconnected(
+        http_request, handle_user_message(session, request.message)
+    )
+    await save_session(session_store, request.sessionId, session)
     return JSONResponse(
-        content=handle_user_message(session, request.message).model_dump()
+        content=response.model_dump()
+    )
+
+
+"""
+
+    하루랑 채팅 (스트리밍, Server-Sent Events)
+
+    /chat 과 같은 요청 / 세션 처리를 하면서 결과가 준비되는 대로 이벤트 전송
+    - ack: 요청 수신 즉시 (sessionId, stage)
+    - tags: 태그 추출 완료 응답 (/chat 응답과 같은 형식)
+    - recommendation: 카테고리 추천이 끝날 때마다 (category, stores, completed, total)
+    - message: 그 외 / 최종 응답 (/chat 응답과 같은 형식, 추천 완료 시 전체 recommendations 포함)
+    - error: 처리 중 오류 (세션 저장 충돌이면 status 409)
+    - done: 스트림 종료
+
+"""
+
+def to_sse(event: str, data: Dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+
+
+async def stream_chat_events(session_id: str, session: Dict, message: str,
+                             session_store: SessionStore) -> AsyncIterator[str]:
+    """
+    클라이언트 연결이 끊기면 StreamingResponse 가 제너레이터를 취소하므로 진행 중인 작업도 함께 취소
+    (세션은 처리가 끝난 경우에만 저장)
+    """
+    yield to_sse("ack", {"sessionId": session_id, "stage": session.get("stage")})
+
+    try:
+        if session.get("stage") == "completed":
+            yield to_sse("message", completed_response().model_dump())
+
+        elif session.get("stage") == "modification_mode":
+            response = handle_modification_mode(session, message)
+            await session_store.set(session_id, session)
+            yield to_sse("message", response.model_dump())
+
+        elif session.get("waitingForUserAction", False) and is_recommendation_request(session, message):
+            # 매장 추천: 카테고리별로 끝나는 순서대로 전송
+            results = {}
+            total = len(session.get("collectedTags", {}))
+            async for category, stores in iter_store_recommendations(session):
+                results[category] = stores
+                yield to_sse("recommendation", {
+                    "category": category,
+                    "stores": stores,
+                    "completed": len(results),
+                    "total": total
+                })
+
+            response = complete_with_recommendations(session, order_by_category(session, results))
+            await session_store.set(session_id, session)
+            yield to_sse("message", response.model_dump())
+
+        elif session.get("waitingForUserAction", False):
+            response = await handle_user_action_response(session, message)
+            await session_store.set(session_id, session)
+            yield to_sse("message", response.model_dump())
+
+        else:
+            # 일반 메시지 처리 (태그 생성)
+            response = await handle_user_message(session, message)
+            await session_store.set(session_id, session)
+            yield to_sse("tags" if response.tags is not None else "message", response.model_dump())
+
+    except SessionConflictError:
+        # 이미 보낸 tags / recommendation 이벤트는 저장되지 않은 결과
+        logger.warning(f"세션 저장 충돌: {session_id}")
+        yield to_sse("error", {"status": 409, "detail": SESSION_CONFLICT_DETAIL})
+
+    except Exception as e:
+        logger.error(f"스트리밍 채팅 처리 중 오류: {e}")
+        yield to_sse("error", {"detail": "채팅 처리 중 오류가 발생했습니다."})
+
+    yield to_sse("done", {})
+
+
+@router.get("/chat/stream")
+@router.post("/chat/stream")
+async def chat_stream(request: RequestChatServiceDTO):
+
+    # 세션 확인 (스트림 시작 전에 404 반환)
+    session_store = get_session_store()
+    session = await session_store.get(request.sessionId)
+    if session is None:
+        raise HTTPException(status_code=404, detail="세션을 찾을 수 없습니다.")
+
+    return StreamingResponse(
+        stream_chat_events(request.sessionId, session, request.message, session_store),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",  # 프록시(nginx) 버퍼링 끄기
+        }
     )
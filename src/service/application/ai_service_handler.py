@@ -2,12 +2,15 @@
 대화 흐름 제어 핸들러
 """
 
-from typing import Dict, List
+import asyncio
+from typing import AsyncIterator, Dict, List, Tuple
 
 from src.domain.dto.service.haru_service_dto import ResponseChatServiceDTO
 from src.service.application.prompts import RESPONSE_MESSAGES
-from src.service.application.utils import extract_tags_by_category, format_collected_data_for_server
+from src.service.application.utils import aextract_tags_by_category, format_collected_data_for_server
+from src.service.suggest.suggest_registry import get_suggest_service
 from src.logger.custom_logger import get_logger
+from src.utils.config import get_service_config
 
 logger = get_logger(__name__)
 
@@ -15,20 +18,36 @@ logger = get_logger(__name__)
 async def get_store_recommendations(session: Dict) -> Dict[str, List[Dict]]:
     """
     세션의 collectedData를 기반으로 매장 추천
+    카테고리별 추천은 동시에 실행하고, 마감 시간 안에 끝나지 않은 카테고리는 빈 결과로 반환
     
     Args:
         session: 세션 데이터 (collectedTags, play_address, peopleCount 포함)
     
     Returns:
-        카테고리별 추천 매장 딕셔너리
+        카테고리별 추천 매장 딕셔너리 (collectedTags 카테고리 순서)
     """
-    from src.service.suggest.store_suggest_service import StoreSuggestService
+    results = {category: stores async for category, stores in iter_store_recommendations(session)}
     
+    return order_by_category(session, results)
+
+
+def order_by_category(session: Dict, results: Dict[str, List[Dict]]) -> Dict[str, List[Dict]]:
+    """끝난 순서로 모은 카테고리별 추천을 collectedTags 카테고리 순서로 정렬"""
+    return {category: results[category] for category in session.get("collectedTags", {}) if category in results}
+
+
+async def iter_store_recommendations(session: Dict) -> AsyncIterator[Tuple[str, List[Dict]]]:
+    """
+    카테고리별 추천을 동시에 실행하고 끝나는 순서대로 (카테고리, 추천 매장) 반환 (스트리밍 응답용)
+    중간에 소비를 멈추면 (클라이언트 연결 종료) 남은 카테고리 추천은 취소
+    """
     logger.info("=" * 60)
     logger.info("매장 추천 시작")
     
-    suggest_service = StoreSuggestService()
-    recommendations = {}
+    suggest_service = await get_suggest_service()
+    config = get_service_config("recommendation")
+    semaphore = asyncio.Semaphore(config.get("max_concurrency", 3))
+    deadline = asyncio.get_running_loop().time() + config.get("category_timeout_s", 15)
     
     # 지역 추출
     region = extract_region_from_address(session.get("play_address", ""))
@@ -39,46 +58,95 @@ async def get_store_recommendations(session: Dict) -> Dict[str, List[Dict]]:
     logger.info(f"인원: {people_count}명")
     logger.info(f"수집된 태그: {collected_tags}")
     
-    # 각 카테고리별로 매장 추천
-    for category, keywords in collected_tags.items():
-        keyword_string = ", ".join(keywords) if keywords else ""
-        
-        logger.info(f"[{category}] 키워드: {keyword_string}")
-        
-        try:
-            # 매장 제안 요청
-            suggestions = await suggest_service.suggest_stores(
-                personnel=people_count,
-                region=region,
-                category_type=category,
-                user_keyword=keyword_string,
-                n_results=5,
-                use_ai_enhancement=True,
-                min_similarity_threshold=0.80
-            )
-            
-            logger.info(f"[{category}] 유사도 검색 결과: {len(suggestions)}개")
-            
-            # store_id 추출
-            store_ids = [sug.get('store_id') for sug in suggestions if sug.get('store_id')]
-            
-            # 상세 정보 조회
-            if store_ids:
-                store_details = await suggest_service.get_store_details(store_ids)
-                recommendations[category] = store_details
-                logger.info(f"[{category}] 최종 추천: {len(store_details)}개")
-            else:
-                recommendations[category] = []
-                logger.warning(f"[{category}] 추천 결과 없음")
-                
-        except Exception as e:
-            logger.error(f"[{category}] 추천 중 오류: {e}")
-            recommendations[category] = []
+    # 각 카테고리별로 매장 추천 (동시 실행)
+    tasks = [
+        asyncio.create_task(recommend_category_within_deadline(
+            suggest_service, semaphore, deadline, category, keywords, region, people_count
+        ))
+        for category, keywords in collected_tags.items()
+    ]
+    
+    total = 0
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            category, stores = await next_done
+            total += len(stores)
+            yield category, stores
+    finally:
+        for task in tasks:
+            task.cancel()
     
-    logger.info(f"전체 추천 완료: {sum(len(v) for v in recommendations.values())}개 매장")
+    logger.info(f"전체 추천 완료: {total}개 매장")
     logger.info("=" * 60)
+
+
+async def recommend_category_within_deadline(
+    suggest_service,
+    semaphore: asyncio.Semaphore,
+    deadline: float,
+    category: str,
+    keywords: List[str],
+    region: str,
+    people_count: int
+) -> Tuple[str, List[Dict]]:
+    """
+    동시 실행 수와 마감 시간을 지키며 한 카테고리 추천
+    시간 초과나 오류 시 해당 카테고리만 빈 결과 반환
+    """
+    async def run():
+        async with semaphore:
+            return await recommend_category(suggest_service, category, keywords, region, people_count)
+
+    remaining = deadline - asyncio.get_running_loop().time()
+
+    try:
+        return category, await asyncio.wait_for(run(), timeout=max(0.0, remaining))
+
+    except asyncio.TimeoutError:
+        logger.warning(f"[{category}] 추천 시간 초과 - 빈 결과 반환")
+        return category, []
+
+    except Exception as e:
+        logger.error(f"[{category}] 추천 중 오류: {e}")
+        return category, []
+
+
+async def recommend_category(
+    suggest_service,
+    category: str,
+    keywords: List[str],
+    region: str,
+    people_count: int
+) -> List[Dict]:
+    """
+    한 카테고리에 대한 유사도 검색 + 상세 정보 조회
+    """
+    keyword_string = ", ".join(keywords) if keywords else ""
+    
+    logger.info(f"[{category}] 키워드: {keyword_string}")
+    
+    # 매장 제안 요청
+    suggestions = await suggest_service.suggest_stores(
+        personnel=people_count,
+        region=region,
+        category_type=category,
+        user_keyword=keyword_string,
+        n_results=5,
+        use_ai_enhancement=True,
+        min_similarity_threshold=0.80
+    )
+    
+    logger.info(f"[{category}] 유사도 검색 결과: {len(suggestions)}개")
+    
+    if not any(sug.get('store_id') for sug in suggestions):
+        logger.warning(f"[{category}] 추천 결과 없음")
+        return []
     
-    return recommendations
+    # 상세 정보 (메타데이터 projection 우선, 없으면 DB 조회)
+    store_details = await suggest_service.get_store_cards(suggestions)
+    logger.info(f"[{category}] 최종 추천: {len(store_details)}개")
+    
+    return store_details
 
 
 def extract_region_from_address(address: str) -> str:
@@ -98,7 +166,7 @@ def extract_region_from_address(address: str) -> str:
     return None
 
 
-def handle_user_message(session: Dict, user_message: str) -> ResponseChatServiceDTO:
+async def handle_user_message(session: Dict, user_message: str) -> ResponseChatServiceDTO:
     """
     사용자 메시지 처리 및 태그 생성
     """
@@ -126,7 +194,7 @@ def handle_user_message(session: Dict, user_message: str) -> ResponseChatService
     current_category = selected_categories[current_index]
 
     people_count = session.get("peopleCount", 1)
-    new_tags = extract_tags_by_category(user_message, current_category, people_count)
+    new_tags = await aextract_tags_by_category(user_message, current_category, people_count)
 
     if "collectedTags" not in session:
         session["collectedTags"] = {}
@@ -161,37 +229,60 @@ def handle_user_message(session: Dict, user_message: str) -> ResponseChatService
     )
 
 
-async def handle_user_action_response(session: Dict, user_response: str) -> ResponseChatServiceDTO:
+def parse_user_action(user_response: str) -> Tuple[bool, bool]:
     """
-    사용자 버튼 액션 처리 (Next / More / Yes)
+    버튼 / 자유 입력 응답 해석
+
+    Returns:
+        (Next·Yes 여부, More 여부)
     """
     is_next = any(word in user_response.lower() for word in
                   ["yes", "네", "넵", "예", "좋아", "좋아요", "그래", "맞아", "ㅇㅇ", "기기", "ㄱㄱ", "고고", "네네", "다음"])
     is_more = any(word in user_response.lower() for word in ["추가", "더", "더해", "추가하기", "추가요", "더할래"])
+    return is_next, is_more
+
+
+def is_recommendation_request(session: Dict, user_response: str) -> bool:
+    """결과 출력 확인 단계에서 Yes → 매장 추천 생성 요청인지"""
+    return session.get("stage") == "confirming_results" and parse_user_action(user_response)[0]
+
+
+def complete_with_recommendations(session: Dict, recommendations: Dict[str, List[Dict]]) -> ResponseChatServiceDTO:
+    """
+    추천 결과를 세션에 저장하고 완료 응답 생성
+    """
+    # 수집된 데이터 구조화
+    collected_data = format_collected_data_for_server(session)
+
+    # 세션에 저장
+    session["recommendations"] = recommendations
+    session["stage"] = "completed"
+    session["waitingForUserAction"] = False
+
+    return ResponseChatServiceDTO(
+        status="success",
+        message=RESPONSE_MESSAGES["start"]["final_result"],
+        stage="completed",
+        recommendations=recommendations,  # 🔥 Flutter로 전달
+        collectedData=collected_data
+    )
+
+
+async def handle_user_action_response(session: Dict, user_response: str) -> ResponseChatServiceDTO:
+    """
+    사용자 버튼 액션 처리 (Next / More / Yes)
+    """
+    is_next, is_more = parse_user_action(user_response)
 
     # 🔥 결과 출력 확인 단계: Yes(매장 추천 생성)
     if session.get("stage") == "confirming_results":
         if is_next:
             logger.info("confirming_results 단계에서 '네' 선택 -> 매장 추천 생성")
             
-            # 수집된 데이터 구조화
-            collected_data = format_collected_data_for_server(session)
-            
             # 🔥 매장 추천 생성
             recommendations = await get_store_recommendations(session)
-            
-            # 세션에 저장
-            session["recommendations"] = recommendations
-            session["stage"] = "completed"
-            session["waitingForUserAction"] = False
 
-            return ResponseChatServiceDTO(
-                status="success",
-                message=RESPONSE_MESSAGES["start"]["final_result"],
-                stage="completed",
-                recommendations=recommendations,  # 🔥 Flutter로 전달
-                collectedData=collected_data
-            )
+            return complete_with_recommendations(session, recommendations)
         else:
             return ResponseChatServiceDTO(
                 status="success",
@@ -1,3 +1,5 @@
+import asyncio
+
 from fastapi import HTTPException
 
 from src.domain.dto.service.detail_category_dto import ResponseDetailCategoryDTO, DetailCategoryReview
@@ -7,7 +9,6 @@ from src.infra.database.repository.category_tags_repository import CategoryTagsR
 from src.infra.database.repository.reviews_repository import ReviewsRepository
 from src.infra.database.repository.tags_repository import TagsRepository
 from src.infra.database.repository.user_like_repository import UserLikeRepository
-from src.infra.database.repository.users_repository import UserRepository
 
 
 class MainScreenService:
@@ -17,27 +18,24 @@ class MainScreenService:
         self.reviews_repo = ReviewsRepository()
         self.category_tags_repo = CategoryTagsRepository()
         self.tags_repo = TagsRepository()
+        self.user_like_repo = UserLikeRepository()
 
 
-    async def to_main(self) -> ResponseMainScreenDTO:
-        categories = await self.category_repo.select(limit=5)
+    async def to_main(self, limit: int = 5, tag_limit: int = 5) -> ResponseMainScreenDTO:
+        categories = await self.category_repo.select(limit=limit)
 
-        tags = []
+        #   카테고리별 태그는 IN 조회 한 번으로 가져옴
+        tags_by_category = {}
+        if categories:
+            rows = await self.category_tags_repo.select_with_tag_names(
+                category_id=[item.id for item in categories]
+            )
+            tags_by_category = self._group_tag_names(rows, tag_limit)
 
         request_main_screen_body_categories = []
-        limit = 5
 
         for item in categories:
 
-            #   todo: 나중에 리펙토링 하기 여기 성능 문제 발생
-            tag_in_category = await self.category_tags_repo.select(category_id=item.id, limit=limit)
-            # reviews = await self.reviews_repo.select_by(category_id=item.id)
-
-            for tag_item in tag_in_category:
-                tag_entity = await self.tags_repo.select(tag_id=tag_item.id)
-                if tag_entity is not None:
-                    tags.extend(tag_entity[0].name)
-
             address = (
                     (item.do+" " if item.do is not None else "")+
                     (item.si+" " if item.si is not None else "")+
@@ -50,7 +48,8 @@ class MainScreenService:
                 image_url=item.image,
                 detail_address=address,
                 sub_category=item.sub_category,
-                title=item.name
+                title=item.name,
+                tags=tags_by_category.get(item.id, [])
             )
 
             request_main_screen_body_categories.append(tmp)
@@ -60,58 +59,63 @@ class MainScreenService:
         )
 
 
-    async def get_category_detail(self, category_id) -> ResponseDetailCategoryDTO:
-        user_repo = UserRepository()
-
-
-        category = await self.category_repo.select(id=category_id)
+    @staticmethod
+    def _group_tag_names(rows, tag_limit: int) -> dict:
+        """
+            count 내림차순으로 정렬된 row 를 카테고리별 상위 tag_limit 개로 묶음
+        """
+        grouped = {}
+        for row in rows:
+            names = grouped.setdefault(row["category_id"], [])
+            if len(names) < tag_limit and row["name"]:
+                names.append(row["name"].replace("\"", ""))
+
+        return grouped
+
+
+    async def get_category_detail(
+            self,
+            category_id: str,
+            user_id: str = None,
+            cursor: str = None,
+            size: int = 20
+    ) -> ResponseDetailCategoryDTO:
+        #   리뷰 수와 관계없이 고정된 쿼리 4개로 상세 화면 구성
+        #   (category, category_tags ⋈ tags, reviews ⋈ users, user_like EXISTS)
+        like_filters = {"category_id": category_id}
+        if user_id is not None:
+            like_filters["user_id"] = user_id
+
+        category, tag_rows, (review_rows, next_cursor), is_like = await asyncio.gather(
+            self.category_repo.select(id=category_id),
+            self.category_tags_repo.select_with_tag_names(category_id=category_id, limit=5),
+            self.reviews_repo.select_page_with_nickname(category_id, cursor=cursor, size=size),
+            self.user_like_repo.exists(**like_filters),
+        )
 
-        if category is None:
+        if not category:
             raise HTTPException(status_code=404, detail="Category not found")
         elif len(category) > 1:
             raise HTTPException(status_code=404, detail="Too many categories")
-        category = category[0]
-
-
-        #   todo: 여기도 성능 잡아야 함 join 처리 해야 할 듯
-
-
-        category_in_tags = await self.category_tags_repo.select(category_id=category.id, limit=5)
-
-        #   is_like
-        repo = UserLikeRepository()
-        result = await repo.select(category_id=category.id)
-        if result:
-            is_like = True
-        else:
-            is_like = False
 
 
         #   tags
-        tag_names = []
-        for tag_ids in category_in_tags:
-            tag_name = await self.tags_repo.select(id=tag_ids.tag_id)
-            for i in tag_name:
-                tag_names.append(i.name.replace("\"", ""))
+        tag_names = [row["name"].replace("\"", "") for row in tag_rows if row["name"]]
 
 
         #   reviews
-        reviews_list = []
-        review_entity_list = await self.reviews_repo.select(category_id=category.id)
-        for review_entity in review_entity_list:
-            nickname = (await user_repo.select(id=review_entity.user_id))[0].nickname
-            star = review_entity.star
-            comment = review_entity.comment
-            reviews_list.append(
-                DetailCategoryReview(
-                    nickname=nickname,
-                    star=star,
-                    comment=comment,
-                )
+        reviews_list = [
+            DetailCategoryReview(
+                nickname=row["nickname"],
+                star=row["stars"],
+                comment=row["comment"],
             )
+            for row in review_rows
+        ]
 
         return ResponseDetailCategoryDTO(
             is_like=is_like,
             tags=tag_names,
             reviews=reviews_list,
-        )
\ No newline at end of file
+            next_cursor=next_cursor,
+        )
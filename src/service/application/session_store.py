@@ -0,0 +1,558 @@
+"""
+하루 채팅 세션 저장소
+세션 dict 를 직렬화(orjson, 없으면 json)해서 저장하므로 조회한 세션을 수정한 뒤에는 set 으로 다시 저장해야 합니다.
+저장은 compare-and-set: get 이 돌려준 version 그대로일 때만 저장되고, 그 사이 다른 요청(다른 워커 포함)이
+먼저 저장했으면 SessionConflictError (마지막에 저장한 요청이 앞선 변경을 덮어쓰지 않도록)
+
+- memory: 프로세스 내 LRU + TTL (워커 간 공유 안 됨, 재시작 시 초기화)
+- sqlite: 파일 저장 (재시작 후 유지, 같은 서버의 워커끼리 공유)
+- redis: Redis 프로토콜 서버 (Redis / Valkey / KeyDB 등, 여러 서버의 워커끼리 공유)
+
+service_config.json 의 session_store 섹션으로 선택합니다.
+
+메모리 관리
+- ttl_s: 마지막 저장 후 이 시간 동안 사용되지 않은 세션 만료 (idle TTL)
+- max_sessions: 최대 세션 수 (초과 시 가장 오래 저장되지 않은 세션부터 제거, memory 는 저장 시점 / sqlite · redis 는 sweeper)
+- max_history_turns: conversationHistory 는 최근 N 개만 저장
+- 완료(completed)된 세션은 추천 매장 ID 만 남기고 저장
+- 백그라운드 sweeper(run_session_sweeper)가 sweep_interval_s 마다 만료 / 초과 세션 정리
+"""
+import asyncio
+import decimal
+import json
+import math
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, Optional
+
+from src.logger.custom_logger import get_logger
+from src.utils.config import get_service_config
+from src.utils.ttl_cache import TTLCache
+
+logger = get_logger(__name__)
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _default(value):
+    # DB 에서 온 좌표 등 (Decimal), 그 외 직렬화 안 되는 값은 문자열로
+    if isinstance(value, decimal.Decimal):
+        return float(value)
+    return str(value)
+
+
+def dumps_session(session: Dict) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(session, default=_default)
+    return json.dumps(session, ensure_ascii=False, separators=(",", ":"), default=_default).encode("utf-8")
+
+
+def loads_session(data: bytes) -> Dict:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def compact_session(session: Dict, max_history_turns: int = 0) -> Dict:
+    """
+    저장용 세션 축소 (원본은 그대로 두고 얕은 복사본 반환)
+
+    - conversationHistory 는 최근 max_history_turns 개만 유지 (0 이면 전체)
+    - completed 세션은 대화 기록 / 대기 태그를 버리고 recommendations 를 카테고리별 매장 ID 목록으로 축소
+    """
+    session = dict(session)
+
+    history = session.get("conversationHistory")
+    if max_history_turns and history and len(history) > max_history_turns:
+        session["conversationHistory"] = history[-max_history_turns:]
+
+    if session.get("stage") == "completed" and not session.get("compacted"):
+        session["recommendations"] = {
+            category: [store.get("id") if isinstance(store, dict) else store for store in stores]
+            for category, stores in (session.get("recommendations") or {}).items()
+        }
+        session["conversationHistory"] = []
+        session["pendingTags"] = []
+        session["lastUserMessage"] = ""
+        session["compacted"] = True
+
+    return session
+
+
+class SessionConflictError(Exception):
+    """세션 저장 충돌 (조회 후 다른 요청이 먼저 저장했거나 그 사이 세션이 만료됨)"""
+
+
+class SessionStore(ABC):
+    """세션 저장소 인터페이스 (조회 결과는 복사본, version 키 포함)"""
+
+    name = ""
+
+    def __init__(self, ttl_s: Optional[float] = None, max_sessions: int = 10000, max_history_turns: int = 0):
+        """
+        Args:
+            ttl_s: 세션 idle 유효 시간 (마지막 저장 기준, None 이면 만료 없음)
+            max_sessions: 최대 세션 수
+            max_history_turns: 저장할 conversationHistory 최대 개수 (0 이면 전체)
+        """
+        self.ttl_s = ttl_s
+        self.max_sessions = max(1, max_sessions)
+        self.max_history_turns = max_history_turns
+
+        self.expired = 0
+        self.evicted = 0
+        self.sweeps = 0
+
+    @abstractmethod
+    async def get(self, session_id: str) -> Optional[Dict]:
+        """세션 조회 (없거나 만료되면 None, 저장된 version 을 session["version"] 으로 반환)"""
+
+    async def set(self, session_id: str, session: Dict):
+        """
+        세션 저장 (축소 후 저장, 유효 시간 갱신)
+        session["version"] (새 세션은 없음 = 0) 이 저장된 version 과 같을 때만 저장하고 version 을 1 올림
+
+        Raises:
+            SessionConflictError: 다른 요청이 먼저 저장함 / 세션 만료
+        """
+        expected = session.get("version", 0)
+
+        stored = compact_session(session, self.max_history_turns)
+        stored.pop("version", None)
+        if not await self._write(session_id, dumps_session(stored), expected):
+            raise SessionConflictError(session_id)
+
+        session["version"] = expected + 1
+
+    @abstractmethod
+    async def _write(self, session_id: str, data: bytes, expected_version: int) -> bool:
+        """
+        저장된 version (없거나 만료면 0) 이 expected_version 일 때만 version + 1 로 저장
+
+        Returns:
+            저장 여부
+        """
+
+    @abstractmethod
+    async def delete(self, session_id: str):
+        """세션 삭제"""
+
+    async def sweep(self) -> int:
+        """만료 / 최대 개수 초과 세션 정리, 제거한 개수 반환"""
+        return 0
+
+    @abstractmethod
+    async def metrics(self) -> dict:
+        """현재 세션 수 / 직렬화 바이트 합계"""
+
+    async def ping(self):
+        """저장소 연결 확인 (lifespan 시작 시 호출, 실패하면 예외)"""
+
+    async def close(self):
+        """lifespan 종료 시 연결 정리"""
+
+    def stats(self) -> dict:
+        return {
+            "backend": self.name,
+            "ttl_s": self.ttl_s,
+            "max_sessions": self.max_sessions,
+            "max_history_turns": self.max_history_turns,
+            "expired": self.expired,
+            "evicted": self.evicted,
+            "sweeps": self.sweeps,
+        }
+
+
+class MemorySessionStore(SessionStore):
+    """프로세스 내 LRU + TTL 저장소 ((version, 직렬화된 bytes) 저장)"""
+
+    name = "memory"
+
+    def __init__(self, ttl_s: Optional[float] = None, max_sessions: int = 10000, max_history_turns: int = 0):
+        super().__init__(ttl_s, max_sessions, max_history_turns)
+        # 최대 개수 초과 시 LRU 제거는 TTLCache 가 저장 시점에 수행
+        self.cache = TTLCache(max_entries=self.max_sessions, ttl_s=ttl_s)
+        self._write_lock = threading.Lock()
+
+    async def get(self, session_id: str) -> Optional[Dict]:
+        item = self.cache.get(session_id)
+        if item is None:
+            return None
+
+        version, data = item
+        session = loads_session(data)
+        session["version"] = version
+        return session
+
+    async def _write(self, session_id: str, data: bytes, expected_version: int) -> bool:
+        with self._write_lock:
+            item = self.cache.get(session_id)
+            if (item[0] if item is not None else 0) != expected_version:
+                return False
+
+            self.cache.set(session_id, (expected_version + 1, data))
+            return True
+
+    async def delete(self, session_id: str):
+        self.cache.delete(session_id)
+
+    async def sweep(self) -> int:
+        removed = self.cache.purge_expired()
+        self.expired += removed
+        self.sweeps += 1
+        return removed
+
+    async def metrics(self) -> dict:
+        values = self.cache.values()
+        return {"sessions": len(values), "bytes": sum(len(data) for _, data in values)}
+
+    def stats(self) -> dict:
+        stats = super().stats()
+        stats["evicted"] = self.cache.evictions
+        stats["hits"] = self.cache.hits
+        stats["misses"] = self.cache.misses
+        return stats
+
+
+class SqliteSessionStore(SessionStore):
+    """SQLite 파일 저장소 (WAL 모드, 쿼리는 이벤트 루프 밖 스레드에서 실행)"""
+
+    name = "sqlite"
+
+    def __init__(self, sqlite_path: str, ttl_s: Optional[float] = None, max_sessions: int = 10000,
+                 max_history_turns: int = 0):
+        super().__init__(ttl_s, max_sessions, max_history_turns)
+        self.sqlite_path = sqlite_path
+
+        Path(sqlite_path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(sqlite_path, check_same_thread=False, timeout=5)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            "session_id TEXT PRIMARY KEY, data BLOB NOT NULL, expires_at REAL, "
+            "version INTEGER NOT NULL DEFAULT 1, saved_at REAL NOT NULL DEFAULT 0)"
+        )
+        # version / saved_at 이전에 만든 파일 (기존 세션은 version 1)
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(sessions)")}
+        if "version" not in columns:
+            self._db.execute("ALTER TABLE sessions ADD COLUMN version INTEGER NOT NULL DEFAULT 1")
+        if "saved_at" not in columns:
+            self._db.execute("ALTER TABLE sessions ADD COLUMN saved_at REAL NOT NULL DEFAULT 0")
+        self._db.execute("CREATE INDEX IF NOT EXISTS sessions_expires_at ON sessions (expires_at)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS sessions_saved_at ON sessions (saved_at)")
+        self._db.commit()
+        logger.info(f"세션 저장소 SQLite 사용: {sqlite_path}")
+
+    def _get(self, session_id: str):
+        with self._lock:
+            row = self._db.execute(
+                "SELECT data, expires_at, version FROM sessions WHERE session_id = ?", (session_id,)
+            ).fetchone()
+
+        if row is None or (row[1] is not None and row[1] <= time.time()):
+            return None
+        return row[0], row[2]
+
+    def _set(self, session_id: str, data: bytes, expected_version: int) -> bool:
+        now = time.time()
+        expires_at = now + self.ttl_s if self.ttl_s is not None else None
+
+        # 한 문장으로 비교 + 저장 (같은 파일을 쓰는 다른 워커와도 원자적)
+        with self._lock:
+            if expected_version == 0:
+                # 새 세션: 없거나 만료된 경우에만
+                cursor = self._db.execute(
+                    "INSERT INTO sessions (session_id, data, expires_at, version, saved_at) VALUES (?, ?, ?, 1, ?) "
+                    "ON CONFLICT(session_id) DO UPDATE SET data = excluded.data, expires_at = excluded.expires_at, "
+                    "version = 1, saved_at = excluded.saved_at "
+                    "WHERE sessions.expires_at IS NOT NULL AND sessions.expires_at <= ?",
+                    (session_id, data, expires_at, now, now)
+                )
+            else:
+                cursor = self._db.execute(
+                    "UPDATE sessions SET data = ?, expires_at = ?, version = version + 1, saved_at = ? "
+                    "WHERE session_id = ? AND version = ? AND (expires_at IS NULL OR expires_at > ?)",
+                    (data, expires_at, now, session_id, expected_version, now)
+                )
+            self._db.commit()
+
+        return cursor.rowcount == 1
+
+    def _delete(self, session_id: str):
+        with self._lock:
+            self._db.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+            self._db.commit()
+
+    def _sweep(self):
+        with self._lock:
+            expired = self._db.execute(
+                "DELETE FROM sessions WHERE expires_at IS NOT NULL AND expires_at <= ?", (time.time(),)
+            ).rowcount
+
+            # 마지막 저장 시각이 오래된 순서로 제거 (LRU)
+            count = self._db.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+            evicted = 0
+            if count > self.max_sessions:
+                evicted = self._db.execute(
+                    "DELETE FROM sessions WHERE session_id IN "
+                    "(SELECT session_id FROM sessions ORDER BY saved_at LIMIT ?)",
+                    (count - self.max_sessions,)
+                ).rowcount
+            self._db.commit()
+
+        return expired, evicted
+
+    def _metrics(self) -> dict:
+        with self._lock:
+            count, size = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(LENGTH(data)), 0) FROM sessions "
+                "WHERE expires_at IS NULL OR expires_at > ?", (time.time(),)
+            ).fetchone()
+        return {"sessions": count, "bytes": size}
+
+    async def get(self, session_id: str) -> Optional[Dict]:
+        row = await asyncio.to_thread(self._get, session_id)
+        if row is None:
+            return None
+
+        session = loads_session(row[0])
+        session["version"] = row[1]
+        return session
+
+    async def _write(self, session_id: str, data: bytes, expected_version: int) -> bool:
+        return await asyncio.to_thread(self._set, session_id, data, expected_version)
+
+    async def delete(self, session_id: str):
+        await asyncio.to_thread(self._delete, session_id)
+
+    async def sweep(self) -> int:
+        expired, evicted = await asyncio.to_thread(self._sweep)
+        self.expired += expired
+        self.evicted += evicted
+        self.sweeps += 1
+        return expired + evicted
+
+    async def metrics(self) -> dict:
+        return await asyncio.to_thread(self._metrics)
+
+    async def ping(self):
+        await asyncio.to_thread(self._ping)
+
+    def _ping(self):
+        with self._lock:
+            self._db.execute("SELECT 1").fetchone()
+
+    async def close(self):
+        with self._lock:
+            self._db.close()
+
+    def stats(self) -> dict:
+        stats = super().stats()
+        stats["sqlite_path"] = self.sqlite_path
+        return stats
+
+
+class RedisSessionStore(SessionStore):
+    """
+    Redis 프로토콜 저장소 (redis 패키지 필요)
+    세션마다 hash {data, version}, 저장은 WATCH / MULTI 로 compare-and-set
+    키 만료는 서버 TTL, 최대 개수는 sorted set 색인 (session_id → 마지막 저장 시각) 으로 sweeper 가 오래된 순서로 제거
+    """
+
+    METRICS_CHUNK = 1000
+
+    name = "redis"
+
+    def __init__(self, url: str = "redis://localhost:6379/0", key_prefix: str = "haru:session:",
+                 ttl_s: Optional[float] = None, max_sessions: int = 10000, max_history_turns: int = 0,
+                 client=None):
+        """
+        Args:
+            client: redis.asyncio 호환 클라이언트 (None 이면 url 로 생성, 테스트에서는 fakeredis 사용)
+        """
+        super().__init__(ttl_s, max_sessions, max_history_turns)
+        self.key_prefix = key_prefix
+        self.index_key = f"{key_prefix}__index__"
+
+        if client is None:
+            import redis.asyncio as redis
+
+            # from_url 은 연결하지 않으므로 연결 확인은 ping 으로
+            client = redis.from_url(url)
+            logger.info(f"세션 저장소 Redis 사용: {url}")
+        self.client = client
+
+    def _key(self, session_id: str) -> str:
+        return f"{self.key_prefix}{session_id}"
+
+    async def get(self, session_id: str) -> Optional[Dict]:
+        data, version = await self.client.hmget(self._key(session_id), ["data", "version"])
+        if data is None:
+            return None
+
+        session = loads_session(data)
+        session["version"] = int(version or 1)
+        return session
+
+    async def _write(self, session_id: str, data: bytes, expected_version: int) -> bool:
+        from redis.exceptions import WatchError
+
+        key = self._key(session_id)
+        try:
+            async with self.client.pipeline(transaction=True) as pipe:
+                await pipe.watch(key)
+                current = await pipe.hget(key, "version")
+                if int(current or 0) != expected_version:
+                    await pipe.unwatch()
+                    return False
+
+                pipe.multi()
+                pipe.hset(key, mapping={"data": data, "version": expected_version + 1})
+                if self.ttl_s is not None:
+                    # EXPIRE 는 초 단위 정수이고 0 이하는 즉시 삭제이므로 최소 1초
+                    pipe.expire(key, max(1, math.ceil(self.ttl_s)))
+                pipe.zadd(self.index_key, {session_id: time.time()})
+                await pipe.execute()
+            return True
+        except WatchError:
+            return False
+
+    async def delete(self, session_id: str):
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.delete(self._key(session_id))
+            pipe.zrem(self.index_key, session_id)
+            await pipe.execute()
+
+    async def sweep(self) -> int:
+        # 서버 TTL 로 이미 만료된 세션은 색인에서만 제거
+        expired = 0
+        if self.ttl_s is not None:
+            expired = await self.client.zremrangebyscore(self.index_key, "-inf", time.time() - self.ttl_s)
+
+        # 최대 개수 초과분은 마지막 저장 시각이 오래된 순서로 제거
+        evicted = 0
+        count = await self.client.zcard(self.index_key)
+        if count > self.max_sessions:
+            victims = [
+                member.decode() if isinstance(member, bytes) else member
+                for member in await self.client.zrange(self.index_key, 0, count - self.max_sessions - 1)
+            ]
+            async with self.client.pipeline(transaction=True) as pipe:
+                pipe.delete(*[self._key(session_id) for session_id in victims])
+                pipe.zrem(self.index_key, *victims)
+                await pipe.execute()
+            evicted = len(victims)
+
+        self.expired += expired
+        self.evicted += evicted
+        self.sweeps += 1
+        return expired + evicted
+
+    async def metrics(self) -> dict:
+        """색인의 세션별 data 크기를 파이프라인으로 묶어 조회 (METRICS_CHUNK 개당 왕복 1회)"""
+        session_ids = await self.client.zrange(self.index_key, 0, -1)
+
+        count = size = 0
+        for start in range(0, len(session_ids), self.METRICS_CHUNK):
+            async with self.client.pipeline(transaction=False) as pipe:
+                for session_id in session_ids[start:start + self.METRICS_CHUNK]:
+                    session_id = session_id.decode() if isinstance(session_id, bytes) else session_id
+                    pipe.hstrlen(self._key(session_id), "data")
+                lengths = await pipe.execute()
+
+            # 다음 sweep 전까지 색인에 남아 있는 만료 세션은 길이 0
+            live = [length for length in lengths if length]
+            count += len(live)
+            size += sum(live)
+
+        return {"sessions": count, "bytes": size}
+
+    async def ping(self):
+        await self.client.ping()
+
+    async def close(self):
+        await self.client.aclose()
+
+    def stats(self) -> dict:
+        stats = super().stats()
+        stats["key_prefix"] = self.key_prefix
+        return stats
+
+
+def create_session_store(config: dict = None) -> SessionStore:
+    """
+    설정에 맞는 세션 저장소 생성
+    sqlite / redis 를 설정했는데 만들 수 없으면 예외 (memory 로 대체하면 워커마다 세션이 달라 요청이 무작위로 404)
+
+    Args:
+        config: service_config.json 의 session_store 섹션 (None 이면 설정 파일에서 읽음)
+    """
+    config = config if config is not None else get_service_config("session_store")
+    backend = config.get("backend", "memory")
+    limits = {
+        "ttl_s": config.get("ttl_s", 3600) or None,
+        "max_sessions": config.get("max_sessions", 10000),
+        "max_history_turns": config.get("max_history_turns", 20),
+    }
+
+    if backend == "memory":
+        return MemorySessionStore(**limits)
+
+    try:
+        if backend == "sqlite":
+            return SqliteSessionStore(config.get("sqlite_path", "./data/sessions.sqlite3"), **limits)
+        if backend == "redis":
+            return RedisSessionStore(
+                config.get("redis_url", "redis://localhost:6379/0"),
+                key_prefix=config.get("key_prefix", "haru:session:"),
+                **limits
+            )
+    except Exception as e:
+        logger.error(f"세션 저장소({backend}) 초기화 실패: {e}")
+        raise
+
+    raise ValueError(f"알 수 없는 session_store.backend: {backend}")
+
+
+_SESSION_STORE: Optional[SessionStore] = None
+
+
+def get_session_store() -> SessionStore:
+    global _SESSION_STORE
+
+    if _SESSION_STORE is None:
+        _SESSION_STORE = create_session_store()
+
+    return _SESSION_STORE
+
+
+async def close_session_store():
+    global _SESSION_STORE
+
+    if _SESSION_STORE is not None:
+        await _SESSION_STORE.close()
+        _SESSION_STORE = None
+
+
+async def run_session_sweeper():
+    """
+    만료 / 초과 세션을 주기적으로 정리 (lifespan 에서 백그라운드 task 로 실행, 취소될 때까지 반복)
+    """
+    interval_s = get_service_config("session_store").get("sweep_interval_s", 60)
+    store = get_session_store()
+
+    while True:
+        await asyncio.sleep(interval_s)
+        try:
+            removed = await store.sweep()
+            if removed:
+                logger.info(f"세션 정리: {removed}개 제거")
+        except Exception as e:
+            logger.error(f"세션 정리 중 오류: {e}")
@@ -0,0 +1,149 @@
+"""
+태그 추출 결과 캐시
+(카테고리, 인원 수, 정규화된 메시지) 기준으로 LLM 태그 추출 결과를 재사용합니다.
+인메모리 LRU+TTL 캐시를 우선 사용하고, 설정 시 SQLite 파일에도 저장해 재시작 후에도 유지합니다.
+"""
+import json
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from pathlib import Path
+from typing import List, Optional
+
+from src.logger.custom_logger import get_logger
+from src.utils.config import get_service_config
+from src.utils.ttl_cache import TTLCache
+
+logger = get_logger(__name__)
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_message(message: str) -> str:
+    """
+    캐시 키용 메시지 정규화
+
+    - NFC 정규화: 조합형(NFD)으로 분해되어 들어온 음절을 완성형으로 재결합 (macOS / 일부 키보드 입력)
+      호환 자모(ㄱ-ㅣ, U+3131–U+318E)로 따로 입력한 글자("ㅈㅗㅇ")는 결합하지 않고 그대로 둠
+    - 소문자 변환, 문장부호 제거, 연속 공백 정리
+
+    예: "  조용한   카페!! " -> "조용한 카페"
+    """
+    text = unicodedata.normalize("NFC", message or "")
+    text = text.lower()
+    text = _PUNCTUATION.sub(" ", text)
+    text = _WHITESPACE.sub(" ", text)
+    return text.strip()
+
+
+class TagExtractionCache:
+    """태그 추출 결과 캐시 (메모리 + 선택적 SQLite)"""
+
+    def __init__(self, max_entries: int = 5000, ttl_s: float = 86400, sqlite_path: Optional[str] = None):
+        """
+        Args:
+            max_entries: 메모리 캐시 최대 항목 수
+            ttl_s: 결과 유효 시간 (초)
+            sqlite_path: SQLite 파일 경로 (None 또는 빈 문자열이면 디스크 저장 안 함)
+        """
+        self.ttl_s = ttl_s
+        self.memory = TTLCache(max_entries=max_entries, ttl_s=ttl_s)
+
+        self.disk_hits = 0
+        self._db = None
+        self._db_lock = threading.Lock()
+
+        if sqlite_path:
+            try:
+                Path(sqlite_path).parent.mkdir(parents=True, exist_ok=True)
+                self._db = sqlite3.connect(sqlite_path, check_same_thread=False)
+                self._db.execute("PRAGMA journal_mode=WAL")
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS tag_cache ("
+                    "key TEXT PRIMARY KEY, tags TEXT NOT NULL, expires_at REAL NOT NULL)"
+                )
+                self._db.commit()
+                logger.info(f"태그 캐시 SQLite 사용: {sqlite_path}")
+            except Exception as e:
+                logger.error(f"태그 캐시 SQLite 초기화 실패 - 메모리 캐시만 사용: {e}")
+                self._db = None
+
+    @classmethod
+    def from_config(cls) -> "TagExtractionCache":
+        config = get_service_config("tag_cache")
+
+        return cls(
+            max_entries=config.get("max_entries", 5000),
+            ttl_s=config.get("ttl_s", 86400),
+            sqlite_path=config.get("sqlite_path") or None
+        )
+
+    @staticmethod
+    def make_key(category: str, people_count: int, message: str) -> str:
+        return f"{category}|{people_count}|{normalize_message(message)}"
+
+    def get(self, category: str, people_count: int, message: str) -> Optional[List[str]]:
+        key = self.make_key(category, people_count, message)
+
+        tags = self.memory.get(key)
+        if tags is not None:
+            return list(tags)
+
+        if self._db is None:
+            return None
+
+        try:
+            with self._db_lock:
+                row = self._db.execute(
+                    "SELECT tags, expires_at FROM tag_cache WHERE key = ?", (key,)
+                ).fetchone()
+        except Exception as e:
+            logger.error(f"태그 캐시 조회 오류: {e}")
+            return None
+
+        if row is None or row[1] <= time.time():
+            return None
+
+        tags = json.loads(row[0])
+        self.disk_hits += 1
+        self.memory.set(key, tuple(tags), ttl_s=row[1] - time.time())
+
+        return tags
+
+    def set(self, category: str, people_count: int, message: str, tags: List[str]):
+        key = self.make_key(category, people_count, message)
+        self.memory.set(key, tuple(tags))
+
+        if self._db is None:
+            return
+
+        try:
+            with self._db_lock:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO tag_cache (key, tags, expires_at) VALUES (?, ?, ?)",
+                    (key, json.dumps(tags, ensure_ascii=False), time.time() + self.ttl_s)
+                )
+                self._db.commit()
+        except Exception as e:
+            logger.error(f"태그 캐시 저장 오류: {e}")
+
+    def stats(self) -> dict:
+        stats = self.memory.stats()
+        stats["disk_hits"] = self.disk_hits
+        stats["disk_enabled"] = self._db is not None
+        return stats
+
+
+_TAG_CACHE: Optional[TagExtractionCache] = None
+
+
+def get_tag_cache() -> TagExtractionCache:
+    global _TAG_CACHE
+
+    if _TAG_CACHE is None:
+        _TAG_CACHE = TagExtractionCache.from_config()
+
+    return _TAG_CACHE
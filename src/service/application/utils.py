@@ -2,6 +2,7 @@
 태그 추출, 추천 생성 함수
 """
 
+import asyncio
 import re
 from typing import Dict, List
 
@@ -9,7 +10,12 @@ from langchain_core.output_parsers import StrOutputParser
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_openai import ChatOpenAI
 
+from src.logger.custom_logger import get_logger
+from src.utils.config import get_service_config
 from .prompts import SYSTEM_PROMPT, get_category_prompt
+from .tag_cache import get_tag_cache
+
+logger = get_logger(__name__)
 
 RECOMMENDATION_DATABASE = {
     "카페": {
@@ -111,27 +117,105 @@ def extract_tags_by_category(user_detail: str, category: str, people_count: int
     Returns:
         추출된 태그 리스트 (5-6개)
     """
+    cached = get_tag_cache().get(category, people_count, user_detail)
+    if cached is not None:
+        return cached
+
     try:
         base_prompt = get_category_prompt(category, user_detail, people_count)
 
-        tag_response = chain.invoke({"user_input": base_prompt})
-        tag_list = [tag.strip() for tag in tag_response.split(",") if tag.strip()]
+        tag_list = _parse_tags(chain.invoke({"user_input": base_prompt}))
 
         # 태그가 너무 적으면 재시도
         if len(tag_list) < 3:
-            tag_response = chain.invoke({"user_input": base_prompt})
-            tag_list = [tag.strip() for tag in tag_response.split(",") if tag.strip()]
+            tag_list = _parse_tags(chain.invoke({"user_input": base_prompt}))
 
         # 최소 1개는 보장
         if len(tag_list) == 0:
             tag_list = [user_detail.strip()[:10]]
+        else:
+            get_tag_cache().set(category, people_count, user_detail, tag_list)
 
         return tag_list
 
     except Exception as e:
         # 오류 발생 시 기본 태그 반환
-        fallback_tag = [user_detail.strip()[:10]] if user_detail.strip() else ["일반적인"]
-        return fallback_tag
+        return _fallback_tags(user_detail)
+
+
+async def aextract_tags_by_category(
+    user_detail: str,
+    category: str,
+    people_count: int = 1,
+    timeout_s: float = None,
+    max_attempts: int = None
+) -> List[str]:
+    """
+    extract_tags_by_category 의 비동기 버전 (채팅 API 용)
+
+    chain.ainvoke 로 호출하므로 LLM 응답을 기다리는 동안 이벤트 루프를 막지 않음.
+    호출마다 timeout_s 를 적용하고, 태그가 3개 미만이면 max_attempts 까지 재시도.
+    클라이언트 연결이 끊겨 태스크가 취소되면 CancelledError 를 그대로 전파
+
+    Args:
+        user_detail: 사용자가 입력한 문장
+        category: 카테고리명
+        people_count: 함께 활동할 인원 수
+        timeout_s: LLM 호출 1회당 제한 시간 (None 이면 설정값)
+        max_attempts: 최대 호출 횟수 (None 이면 설정값)
+
+    Returns:
+        추출된 태그 리스트 (5-6개)
+    """
+    # 같은 의도의 메시지는 LLM 호출 없이 캐시된 결과 사용
+    cached = get_tag_cache().get(category, people_count, user_detail)
+    if cached is not None:
+        return cached
+
+    config = get_service_config("tag_extraction")
+    timeout_s = timeout_s if timeout_s is not None else config.get("timeout_s", 10)
+    max_attempts = max_attempts if max_attempts is not None else config.get("max_attempts", 2)
+
+    base_prompt = get_category_prompt(category, user_detail, people_count)
+    tag_list = []
+
+    for attempt in range(1, max_attempts + 1):
+        try:
+            tag_response = await asyncio.wait_for(
+                chain.ainvoke({"user_input": base_prompt}),
+                timeout=timeout_s
+            )
+            candidate = _parse_tags(tag_response)
+
+        except asyncio.TimeoutError:
+            logger.warning(f"태그 추출 시간 초과 ({attempt}/{max_attempts})")
+            continue
+
+        except Exception as e:
+            logger.error(f"태그 추출 중 오류 ({attempt}/{max_attempts}): {e}")
+            continue
+
+        # 더 많은 태그를 얻은 응답을 유지
+        if len(candidate) > len(tag_list):
+            tag_list = candidate
+
+        # 태그가 충분하면 재시도하지 않음
+        if len(tag_list) >= 3:
+            break
+
+    if not tag_list:
+        return _fallback_tags(user_detail)
+
+    get_tag_cache().set(category, people_count, user_detail, tag_list)
+    return tag_list
+
+
+def _parse_tags(tag_response: str) -> List[str]:
+    return [tag.strip() for tag in tag_response.split(",") if tag.strip()]
+
+
+def _fallback_tags(user_detail: str) -> List[str]:
+    return [user_detail.strip()[:10]] if user_detail.strip() else ["일반적인"]
 
 
 # =============================================================================
@@ -0,0 +1,113 @@
+"""
+매장 컬렉션 버전 관리 (blue/green)
+전체 재적재는 새 버전 컬렉션(stores_v{n})에 만든 뒤 alias 파일만 바꿔서 전환합니다.
+검색 서비스는 alias 파일을 보고 현재 컬렉션을 찾습니다.
+"""
+import json
+import os
+import re
+import shutil
+import sqlite3
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from src.logger.custom_logger import get_logger
+
+logger = get_logger(__name__)
+
+COLLECTION_PREFIX = "stores"
+ALIAS_FILE_NAME = "stores.alias.json"
+
+_VERSIONED_NAME = re.compile(rf"^{COLLECTION_PREFIX}_v(\d+)$")
+
+
+def alias_path(persist_directory: str) -> Path:
+    return Path(persist_directory).joinpath(ALIAS_FILE_NAME)
+
+
+def versioned_name(version: int) -> str:
+    return f"{COLLECTION_PREFIX}_v{version}"
+
+
+def parse_version(collection_name: str) -> Optional[int]:
+    """'stores_v3' -> 3, 버전 컬렉션이 아니면 None"""
+    match = _VERSIONED_NAME.match(collection_name)
+    return int(match.group(1)) if match else None
+
+
+def read_alias(persist_directory: str) -> Optional[dict]:
+    """
+    Returns:
+        {"collection": "stores_v3", "version": 3, "updated_at": ...} 또는 None (alias 없음)
+    """
+    try:
+        with open(alias_path(persist_directory), encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def resolve_collection_name(persist_directory: str) -> str:
+    """현재 서비스 중인 컬렉션 이름 (alias 가 없으면 기존 'stores')"""
+    alias = read_alias(persist_directory)
+    return alias["collection"] if alias else COLLECTION_PREFIX
+
+
+def write_alias(persist_directory: str, collection_name: str, extra: dict = None):
+    """
+    alias 원자적 교체 (임시 파일에 쓰고 os.replace)
+    읽는 쪽은 항상 이전 또는 새 alias 중 하나만 보게 됨
+    """
+    alias = {
+        "collection": collection_name,
+        "version": parse_version(collection_name),
+        "updated_at": datetime.now().isoformat(),
+    }
+    if extra:
+        alias.update(extra)
+
+    path = alias_path(persist_directory)
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(alias, f, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+    logger.info(f"컬렉션 alias 전환: {collection_name}")
+
+
+def remove_orphan_segments(persist_directory: str) -> int:
+    """
+    chroma.sqlite3 의 segments 테이블에 없는 세그먼트 디렉토리 삭제
+    (컬렉션 삭제/재생성 후 남은 HNSW 파일 정리)
+
+    Returns:
+        삭제한 디렉토리 수
+    """
+    db_path = Path(persist_directory).joinpath("chroma.sqlite3")
+    if not db_path.exists():
+        logger.warning("chroma.sqlite3 가 없어 세그먼트 정리를 건너뜁니다.")
+        return 0
+
+    with sqlite3.connect(str(db_path)) as conn:
+        live_segments = {row[0] for row in conn.execute("SELECT id FROM segments")}
+
+    removed = 0
+    for entry in Path(persist_directory).iterdir():
+        if not entry.is_dir():
+            continue
+        try:
+            uuid.UUID(entry.name)
+        except ValueError:
+            continue
+
+        if entry.name not in live_segments:
+            shutil.rmtree(entry, ignore_errors=True)
+            removed += 1
+
+    if removed:
+        logger.info(f"사용하지 않는 세그먼트 디렉토리 {removed}개 삭제")
+    return removed
@@ -0,0 +1,109 @@
+"""
+문서 임베딩 저장소 (content-addressed)
+sha256(문서) + 모델 ID 를 키로 벡터를 저장해, 문서와 모델이 같으면 다시 인코딩하지 않습니다.
+"""
+import hashlib
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+STORE_FILE_NAME = "embedding_store.sqlite3"
+
+
+def hash_document(document: str) -> str:
+    return hashlib.sha256(document.encode("utf-8")).hexdigest()
+
+
+class DocumentEmbeddingStore:
+    """(문서 해시, 모델 ID) → 임베딩 벡터 저장소 (SQLite)"""
+
+    def __init__(self, persist_directory: str):
+        """
+        Args:
+            persist_directory: ChromaDB 저장 경로 (같은 디렉토리에 embedding_store.sqlite3 생성)
+        """
+        path = Path(persist_directory).joinpath(STORE_FILE_NAME)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(path), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            "doc_hash TEXT NOT NULL, model_id TEXT NOT NULL, dim INTEGER NOT NULL, vector BLOB NOT NULL, "
+            "PRIMARY KEY (doc_hash, model_id))"
+        )
+        self._db.commit()
+
+        self.hits = 0
+        self.misses = 0
+
+    def get_many(self, doc_hashes: Iterable[str], model_id: str) -> Dict[str, List[float]]:
+        doc_hashes = list(set(doc_hashes))
+        found = {}
+
+        with self._lock:
+            # SQLite 파라미터 수 제한을 넘지 않도록 나눠서 조회
+            for i in range(0, len(doc_hashes), 500):
+                chunk = doc_hashes[i:i + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._db.execute(
+                    f"SELECT doc_hash, vector FROM embeddings WHERE model_id = ? AND doc_hash IN ({placeholders})",
+                    [model_id, *chunk]
+                ).fetchall()
+                for doc_hash, vector in rows:
+                    found[doc_hash] = np.frombuffer(vector, dtype=np.float32).tolist()
+
+        return found
+
+    def put_many(self, items: Iterable[Tuple[str, List[float]]], model_id: str):
+        rows = []
+        for doc_hash, vector in items:
+            vector = np.asarray(vector, dtype=np.float32)
+            rows.append((doc_hash, model_id, int(vector.shape[0]), vector.tobytes()))
+
+        with self._lock:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO embeddings (doc_hash, model_id, dim, vector) VALUES (?, ?, ?, ?)",
+                rows
+            )
+            self._db.commit()
+
+    def embed(self, documents: List[str], model_id: str, encode_fn) -> List[List[float]]:
+        """
+        저장소에 없는 문서만 encode_fn 으로 인코딩하고, 입력 순서대로 임베딩 반환
+
+        Args:
+            documents: 문서 리스트
+            model_id: 임베딩 모델 ID
+            encode_fn: 문서 리스트 → 임베딩 리스트
+        """
+        hashes = [hash_document(doc) for doc in documents]
+        found = self.get_many(hashes, model_id)
+
+        # 저장소에 없고 청크 안에서도 중복되지 않은 문서만 인코딩
+        missing = {}
+        for doc_hash, doc in zip(hashes, documents):
+            if doc_hash not in found and doc_hash not in missing:
+                missing[doc_hash] = doc
+
+        self.hits += len(documents) - len(missing)
+        self.misses += len(missing)
+
+        if missing:
+            vectors = encode_fn(list(missing.values()))
+            encoded = dict(zip(missing.keys(), vectors))
+            self.put_many(encoded.items(), model_id)
+            found.update({doc_hash: list(vector) for doc_hash, vector in encoded.items()})
+
+        return [found[doc_hash] for doc_hash in hashes]
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses}
+
+    def close(self):
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,207 @@
+"""
+매장 문서 BM25 역색인
+벡터 검색이 놓치는 메뉴명/고유명사("쑥라떼", "에끌레어") 검색을 위해
+로더가 ChromaDB 에 넣은 문서와 같은 문서로 역색인을 만들어 chroma_db 옆에 저장합니다.
+"""
+import json
+import math
+import os
+import re
+import unicodedata
+from collections import Counter
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+from src.logger.custom_logger import get_logger
+
+logger = get_logger(__name__)
+
+INDEX_VERSION = 1
+INDEX_DIR_NAME = "lexical"
+
+_WORD = re.compile(r"[가-힣]+|[0-9a-z]+")
+_HANGUL = re.compile(r"^[가-힣]+$")
+
+
+def lexical_index_path(persist_directory: str, collection_name: str) -> Path:
+    """컬렉션별 색인 파일 경로 (blue/green 컬렉션마다 따로 저장)"""
+    return Path(persist_directory).joinpath(INDEX_DIR_NAME, f"{collection_name}.json")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    한국어 n-gram 토크나이저
+
+    - 단어 단위(한글 / 영문·숫자) 분리 후 단어 자체를 토큰으로 사용
+    - 3글자 이상 한글 단어는 음절 bigram 도 추가 (조사가 붙은 형태도 매칭)
+
+    예: "쑥라떼는" -> ["쑥라떼는", "쑥라", "라떼", "떼는"]
+    """
+    text = unicodedata.normalize("NFC", text or "").lower()
+
+    tokens = []
+    for word in _WORD.findall(text):
+        tokens.append(word)
+        if len(word) > 2 and _HANGUL.match(word):
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+    return tokens
+
+
+class LexicalIndex:
+    """BM25 역색인 (region / type_code 필터 지원)"""
+
+    def __init__(self, ids: List[str], regions: List[str], type_codes: List[str],
+                 doc_lens: List[int], postings: dict, k1: float = 1.2, b: float = 0.75):
+        self.ids = ids
+        self.regions = regions
+        self.type_codes = type_codes
+        self.doc_lens = doc_lens
+        self.postings = postings        # term -> [[문서 번호, tf], ...]
+        self.k1 = k1
+        self.b = b
+
+        self._refresh_stats()
+
+    def _refresh_stats(self):
+        """문서 길이 평균 / idf 다시 계산 (문서 추가·삭제 후)"""
+        self.avg_doc_len = sum(self.doc_lens) / len(self.doc_lens) if self.doc_lens else 0.0
+        n_docs = len(self.ids)
+        self.idf = {
+            term: math.log(1 + (n_docs - len(posting) + 0.5) / (len(posting) + 0.5))
+            for term, posting in self.postings.items()
+        }
+
+    def _add(self, store_id: str, document: str, metadata: dict):
+        doc_no = len(self.ids)
+        tokens = tokenize(document)
+        self.ids.append(store_id)
+        self.regions.append((metadata or {}).get("region"))
+        self.type_codes.append((metadata or {}).get("type_code"))
+        self.doc_lens.append(len(tokens))
+
+        for term, tf in Counter(tokens).items():
+            self.postings.setdefault(term, []).append([doc_no, tf])
+
+    @classmethod
+    def build(cls, entries: Iterable[Tuple[str, str, dict]]) -> "LexicalIndex":
+        """
+        Args:
+            entries: (매장ID, 문서, 메타데이터) 목록
+        """
+        index = cls([], [], [], [], {})
+        for store_id, document, metadata in entries:
+            index._add(store_id, document, metadata)
+
+        index._refresh_stats()
+        return index
+
+    def remove(self, store_ids: Iterable[str]) -> int:
+        """
+        매장 문서 제거 (뒤 문서 번호를 앞으로 당겨 postings 를 다시 번호 매김)
+
+        Returns:
+            int: 제거한 문서 수
+        """
+        removed = set(store_ids)
+        keep = [doc_no for doc_no, store_id in enumerate(self.ids) if store_id not in removed]
+        if len(keep) == len(self.ids):
+            return 0
+
+        renumber = {doc_no: new_no for new_no, doc_no in enumerate(keep)}
+        n_removed = len(self.ids) - len(keep)
+
+        self.ids = [self.ids[doc_no] for doc_no in keep]
+        self.regions = [self.regions[doc_no] for doc_no in keep]
+        self.type_codes = [self.type_codes[doc_no] for doc_no in keep]
+        self.doc_lens = [self.doc_lens[doc_no] for doc_no in keep]
+
+        postings = {}
+        for term, posting in self.postings.items():
+            kept = [[renumber[doc_no], tf] for doc_no, tf in posting if doc_no in renumber]
+            if kept:
+                postings[term] = kept
+        self.postings = postings
+
+        self._refresh_stats()
+        return n_removed
+
+    def upsert(self, entries: Iterable[Tuple[str, str, dict]]):
+        """
+        매장 문서 추가 / 교체 (바뀐 매장만 반영, 컬렉션 전체를 다시 읽지 않음)
+
+        Args:
+            entries: (매장ID, 문서, 메타데이터) 목록
+        """
+        entries = list(entries)
+        self.remove(store_id for store_id, _, _ in entries)
+
+        for store_id, document, metadata in entries:
+            self._add(store_id, document, metadata)
+
+        self._refresh_stats()
+
+    def search(self, query: str, top_k: int = 10, region: str = None, type_code: str = None) -> List[Tuple[str, float]]:
+        """
+        BM25 검색
+
+        Returns:
+            [(매장ID, 점수), ...] 점수 내림차순
+        """
+        scores = {}
+
+        for term in set(tokenize(query)):
+            posting = self.postings.get(term)
+            if not posting:
+                continue
+
+            idf = self.idf[term]
+            for doc_no, tf in posting:
+                if region and self.regions[doc_no] != region:
+                    continue
+                if type_code and self.type_codes[doc_no] != type_code:
+                    continue
+
+                norm = self.k1 * (1 - self.b + self.b * self.doc_lens[doc_no] / self.avg_doc_len)
+                scores[doc_no] = scores.get(doc_no, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:top_k]
+        return [(self.ids[doc_no], score) for doc_no, score in ranked]
+
+    def save(self, path: Path):
+        """임시 파일에 쓰고 교체 (검색 서비스가 쓰는 중인 파일을 깨뜨리지 않음)"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        data = {
+            "version": INDEX_VERSION,
+            "ids": self.ids,
+            "regions": self.regions,
+            "type_codes": self.type_codes,
+            "doc_lens": self.doc_lens,
+            "postings": self.postings,
+        }
+
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, path)
+
+        logger.info(f"BM25 색인 저장: {path} ({len(self.ids)}개 문서, {len(self.postings)}개 토큰)")
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["LexicalIndex"]:
+        """색인 파일이 없거나 버전이 다르면 None"""
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+
+        if data.get("version") != INDEX_VERSION:
+            logger.warning(f"BM25 색인 버전 불일치 - 사용 안 함: {path}")
+            return None
+
+        return cls(data["ids"], data["regions"], data["type_codes"], data["doc_lens"], data["postings"])
+
+    def __len__(self) -> int:
+        return len(self.ids)
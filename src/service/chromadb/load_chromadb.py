@@ -17,8 +17,14 @@ from src.logger.custom_logger import get_logger
 logger = get_logger(__name__)
 
 
-async def main():
-    """메인 실행 함수"""
+async def main(incremental: bool = False, full_scan: bool = False):
+    """
+    메인 실행 함수
+    
+    Args:
+        incremental: 컬렉션을 지우지 않고 변경된 매장만 반영
+        full_scan: 증분 동기화 시 last_crawl 과 무관하게 전체 매장의 문서 해시 비교
+    """
     # logger.info("=" * 60)
     logger.info("ChromaDB 데이터 적재 시작")
     # logger.info("=" * 60)
@@ -26,20 +32,20 @@ async def main():
     # ChromaDB 로더 초기화 (임베딩 모델 로딩)
     loader = StoreChromaDBLoader(persist_directory="./chroma_db")
     
-    # 기존 데이터 삭제
-    logger.info("기존 ChromaDB 데이터를 삭제합니다...")
-    loader.reset_collection()
-    logger.info("삭제 완료")
+    if incremental:
+        result = await loader.sync_incremental(full_scan=full_scan)
+        logger.info(f"증분 동기화 결과: {result}")
+        return
     
-    # 전체 매장 데이터 적재
-    logger.info("매장 데이터를 ChromaDB에 적재합니다...")
-    success_count, fail_count = await loader.load_all_stores(batch_size=100)
+    # 새 버전 컬렉션에 전체 적재 후 alias 전환 (적재 중에도 기존 컬렉션으로 검색 가능)
+    logger.info("매장 데이터를 새 버전 컬렉션에 적재합니다...")
+    result = await loader.rebuild_collection()
     
     # 결과 출력
     # logger.info("=" * 60)
     logger.info("적재 완료!")
-    logger.info(f"성공: {success_count}개")
-    logger.info(f"실패: {fail_count}개")
+    logger.info(f"컬렉션: {result['collection']}")
+    logger.info(f"적재: {result['count']}개 / MariaDB: {result['expected']}개")
     # logger.info("=" * 60)
     
     # 컬렉션 정보 출력
@@ -49,4 +55,15 @@ async def main():
     logger.info(f"  - 총 문서 수: {info.get('total_documents', 0)}개")
     logger.info(f"  - 임베딩 모델: {info.get('embedding_model', 'N/A')}")
     logger.info(f"  - 메타데이터: {info.get('metadata', {})}")
-    # logger.info("=" * 60)
\ No newline at end of file
+    # logger.info("=" * 60)
+
+
+if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="ChromaDB 매장 데이터 적재")
+    parser.add_argument("--incremental", action="store_true", help="변경된 매장만 동기화")
+    parser.add_argument("--full-scan", action="store_true", help="증분 동기화 시 전체 매장 문서 해시 비교")
+    args = parser.parse_args()
+    
+    asyncio.run(main(incremental=args.incremental, full_scan=args.full_scan))
@@ -0,0 +1,67 @@
+"""
+지역/타입 파티션 컬렉션 관리
+(구, 타입) 조합마다 작은 컬렉션을 따로 두고, 검색 시 where 필터 대신 해당 파티션을 바로 조회합니다.
+컬렉션 이름에 한글을 쓸 수 없으므로 이름은 해시로 만들고, 파티션 목록은 manifest 파일에 저장합니다.
+"""
+import hashlib
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+PARTITION_DIR_NAME = "partitions"
+MANIFEST_VERSION = 1
+
+
+def partition_key(region: str, type_code: str) -> str:
+    """예: ("강남구", "1") -> "강남구|1" """
+    return f"{region}|{type_code}"
+
+
+def partition_prefix(collection_name: str) -> str:
+    return f"{collection_name}_p_"
+
+
+def partition_collection_name(collection_name: str, region: str, type_code: str) -> str:
+    """예: ("stores_v3", "강남구", "1") -> "stores_v3_p_1a2b3c4d5e6f" """
+    digest = hashlib.sha1(partition_key(region, type_code).encode("utf-8")).hexdigest()[:12]
+    return f"{partition_prefix(collection_name)}{digest}"
+
+
+def manifest_path(persist_directory: str, collection_name: str) -> Path:
+    """전체 컬렉션별 manifest 경로 (blue/green 컬렉션마다 따로 저장)"""
+    return Path(persist_directory).joinpath(PARTITION_DIR_NAME, f"{collection_name}.json")
+
+
+def read_manifest(path: Path) -> Optional[dict]:
+    """
+    Returns:
+        {"강남구|1": {"collection": "stores_v3_p_...", "count": 42}, ...} 또는 None (manifest 없음)
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return None
+
+    if data.get("version") != MANIFEST_VERSION:
+        return None
+    return data["partitions"]
+
+
+def write_manifest(path: Path, partitions: dict):
+    """manifest 원자적 교체 (임시 파일에 쓰고 os.replace)"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    data = {
+        "version": MANIFEST_VERSION,
+        "updated_at": datetime.now().isoformat(),
+        "partitions": partitions,
+    }
+
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
@@ -2,14 +2,30 @@
 ChromaDB 데이터 적재 모듈
 매장 정보를 키워드 중심 문서로 저장합니다.
 """
+import asyncio
+import json
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import List, Dict, Optional
+
 import chromadb
 from chromadb.config import Settings
-from chromadb.utils import embedding_functions
-from typing import List, Dict
+
 from src.logger.custom_logger import get_logger
 from src.infra.database.repository.category_repository import CategoryRepository
 from src.infra.database.repository.category_tags_repository import CategoryTagsRepository
-from src.infra.database.repository.tags_repository import TagsRepository
+from src.service.chromadb.collection_alias import COLLECTION_PREFIX, resolve_collection_name, parse_version, \
+    versioned_name, write_alias, remove_orphan_segments
+from src.service.chromadb.embedding_store import DocumentEmbeddingStore, hash_document
+from src.service.chromadb.lexical_index import LexicalIndex, lexical_index_path
+from src.service.chromadb.vector_export import write_vector_export, patch_vector_export, remove_vector_export
+from src.service.chromadb.partitions import partition_key, partition_prefix, partition_collection_name, \
+    manifest_path, read_manifest, write_manifest
+from src.service.suggest.embedding_provider import LEGACY_MODEL_ID, create_embedding_provider, resolve_model_name
+from src.service.suggest.store_detail_cache import to_projection_metadata
+from src.utils.config import get_service_config
 
 logger = get_logger(__name__)
 
@@ -17,13 +33,34 @@ logger = get_logger(__name__)
 class StoreChromaDBLoader:
     """매장 데이터를 ChromaDB에 적재하는 클래스"""
     
-    def __init__(self, persist_directory: str = "./chroma_db"):
+    def __init__(self, persist_directory: str = "./chroma_db", denormalize_metadata: bool = None,
+                 partitioned: bool = None, export_vectors: bool = None):
         """
         Args:
             persist_directory: ChromaDB 저장 경로
+            denormalize_metadata: 추천 카드 표시용 필드(매장명, 주소, 이미지 등)를 메타데이터에 함께 저장
+                                  (None 이면 service_config.json 의 chroma_loader 설정 사용)
+            partitioned: 전체 컬렉션과 별도로 (구, 타입) 파티션 컬렉션도 유지
+                         (None 이면 service_config.json 의 chroma_loader 설정 사용)
+            export_vectors: NumPy 검색 백엔드용 벡터 행렬 export 도 유지 (chroma_loader.export_dtype: float32 / float16 / int8)
+                            (None 이면 service_config.json 의 chroma_loader 설정 사용)
         """
         logger.info("ChromaDB 초기화 중...")
         
+        config = get_service_config("chroma_loader")
+        if denormalize_metadata is None:
+            denormalize_metadata = config.get("denormalize_metadata", False)
+        self.denormalize_metadata = denormalize_metadata
+        
+        if partitioned is None:
+            partitioned = config.get("partitioned", False)
+        self.partitioned = partitioned
+        
+        if export_vectors is None:
+            export_vectors = config.get("export_vectors", False)
+        self.export_vectors = export_vectors
+        self.export_dtype = config.get("export_dtype", "float32")
+        
         self.client = chromadb.PersistentClient(
             path=persist_directory,
             settings=Settings(
@@ -32,22 +69,73 @@ class StoreChromaDBLoader:
             )
         )
         
-        # 임베딩 모델 설정
-        logger.info("임베딩 모델 로딩 중: intfloat/multilingual-e5-large")
-        self.embedding_function = embedding_functions.SentenceTransformerEmbeddingFunction(
-            model_name="intfloat/multilingual-e5-large"
-        )
-        logger.info("임베딩 모델 로딩 완료")
+        # 임베딩 계산에 CPU 코어 전체 사용 (encode_threads 가 0 이면 전체 코어)
+        self.encode_threads = config.get("encode_threads", 0) or os.cpu_count()
+        
+        # 임베딩 모델 설정 (service_config.json 의 embedding_model, 임베딩은 배치로 직접 계산해서 collection 에 전달)
+        # 모델은 처음 인코딩할 때 로드 (문서가 그대로인 매장 갱신 / 삭제는 모델 없이 처리)
+        self._embedding_provider = None
+        self.model_id = resolve_model_name(get_service_config("embedding_model"))
+        
+        # 문서 해시 + 모델 ID 기준 임베딩 저장소 (내용이 같은 문서는 다시 인코딩하지 않음)
+        self.embedding_store = DocumentEmbeddingStore(persist_directory)
         
-        # 컬렉션 생성 (임베딩 함수 적용)
-        self.store_collection = self.client.get_or_create_collection(
-            name="stores",
-            metadata={"description": "매장 정보 검색용 컬렉션 (임베딩)"},
-            embedding_function=self.embedding_function
+        # 현재 서비스 중인 컬렉션 (alias 가 가리키는 stores_v{n}, 없으면 기존 'stores')
+        # 임베딩을 직접 넣으므로 임베딩 함수 없음
+        self.persist_directory = persist_directory
+        self.store_collection = self._get_or_create_collection(
+            resolve_collection_name(persist_directory), self._collection_metadata()
         )
         
+        # 증분 동기화 상태 파일 (마지막으로 반영한 last_crawl)
+        self.sync_state_path = Path(persist_directory).joinpath("sync_state.json")
+        
         logger.info(f"ChromaDB 초기화 완료: {persist_directory}")
     
+    @property
+    def embedding_provider(self):
+        if self._embedding_provider is None:
+            logger.info(f"임베딩 계산 스레드: {self.encode_threads}")
+            self._embedding_provider = create_embedding_provider(threads=self.encode_threads)
+            logger.info(f"임베딩 모델 로딩 완료: {self._embedding_provider.variant_id}")
+        return self._embedding_provider
+    
+    def follow_alias(self):
+        """alias 가 다른 버전을 가리키면 그 컬렉션으로 전환 (재적재 후에도 계속 쓰는 로더가 이전 컬렉션에 쓰지 않도록)"""
+        name = resolve_collection_name(self.persist_directory)
+        if name != self.store_collection.name:
+            self.store_collection = self.client.get_collection(name=name, embedding_function=None)
+            logger.info(f"매장 컬렉션 '{name}' 으로 전환")
+    
+    def _get_or_create_collection(self, name: str, metadata: dict):
+        """
+        있으면 메타데이터를 건드리지 않고 조회, 없을 때만 메타데이터와 함께 생성
+        (get_or_create_collection 은 chromadb 버전에 따라 기존 메타데이터를 덮어써서
+        다른 모델로 만든 컬렉션의 embedding_model 이 현재 모델로 바뀌면 check_collection_model 이 통과해 버림)
+        """
+        if name in self._list_collection_names():
+            return self.client.get_collection(name=name, embedding_function=None)
+        
+        return self.client.create_collection(name=name, metadata=metadata, embedding_function=None)
+    
+    def _collection_metadata(self) -> dict:
+        """컬렉션 메타데이터 (검색 서비스가 쿼리 모델과 같은지 확인하도록 모델 ID 기록)"""
+        return {"description": "매장 정보 검색용 컬렉션 (임베딩)", "embedding_model": self.model_id}
+    
+    def collection_model_id(self, collection=None) -> str:
+        """컬렉션을 만든 임베딩 모델 (기록이 없는 기존 컬렉션은 e5-large)"""
+        collection = collection or self.store_collection
+        return (collection.metadata or {}).get("embedding_model", LEGACY_MODEL_ID)
+    
+    def check_collection_model(self):
+        """다른 모델로 만든 컬렉션에 벡터를 섞어 넣지 않도록 확인 (모델을 바꿨으면 rebuild_collection 필요)"""
+        collection_model = self.collection_model_id()
+        if collection_model != self.model_id:
+            raise ValueError(
+                f"컬렉션 '{self.store_collection.name}' 은(는) {collection_model} 으로 만들어졌습니다. "
+                f"현재 모델({self.model_id})로는 전체 재적재가 필요합니다."
+            )
+    
     @staticmethod
     def convert_type_to_korean(type_value: int) -> str:
         """
@@ -147,12 +235,15 @@ class StoreChromaDBLoader:
         
         return document
     
-    def create_metadata(self, store_entity) -> dict:
+    def create_metadata(self, store_entity, document: str = None) -> dict:
         """
         메타데이터 생성 (구, 타입, 매장ID, 영업시간 포함)
+        denormalize 모드에서는 추천 카드 표시용 필드와 projection 버전도 포함
+        document 를 넘기면 증분 동기화용 문서 해시(doc_hash)와 임베딩 모델 ID 도 포함
         
         Args:
             store_entity: CategoryEntity 객체
+            document: create_store_document 결과
             
         Returns:
             dict: 메타데이터
@@ -174,112 +265,256 @@ class StoreChromaDBLoader:
             "business_hour": business_hour    # 영업시간
         }
         
+        if store_entity.last_crawl is not None:
+            metadata["last_crawl"] = store_entity.last_crawl.isoformat()
+        
+        if document is not None:
+            metadata["doc_hash"] = self.hash_document(document)
+            metadata["embedding_model"] = self.model_id
+        
+        if self.denormalize_metadata:
+            metadata.update(to_projection_metadata(store_entity))
+        
         return metadata
     
-    async def load_all_stores(self, batch_size: int = 100):
+    @staticmethod
+    def hash_document(document: str) -> str:
+        """문서 내용 해시 (내용이 같으면 다시 임베딩하지 않음)"""
+        return hash_document(document)
+    
+    def needs_embedding(self, existing_metadata: dict, metadata: dict) -> bool:
+        """기존 벡터와 문서 해시 또는 임베딩 모델이 다르면 다시 임베딩"""
+        existing_metadata = existing_metadata or {}
+        return (
+            existing_metadata.get("doc_hash") != metadata["doc_hash"]
+            or existing_metadata.get("embedding_model", LEGACY_MODEL_ID) != self.model_id
+        )
+    
+    def encode_documents(self, documents: List[str], batch_size: int = 64) -> List[List[float]]:
+        """
+        문서 임베딩을 배치로 계산
+        
+        Args:
+            documents: 문서 리스트
+            batch_size: 모델 한 번 호출에 넣을 문서 수
+            
+        Returns:
+            List[List[float]]: 문서별 임베딩
+        """
+        if not documents:
+            return []
+        
+        embeddings = self.embedding_provider.encode(
+            documents,
+            batch_size=batch_size,
+            normalize_embeddings=True
+        )
+        return embeddings.tolist()
+    
+    def embed_documents(self, documents: List[str], batch_size: int = 64) -> List[List[float]]:
+        """
+        임베딩 저장소를 거쳐 문서 임베딩 조회
+        (문서 해시 + 모델 variant ID 로 저장된 벡터가 있으면 재사용하고, 없는 문서만 encode_documents)
+        
+        Args:
+            documents: 문서 리스트
+            batch_size: 모델 한 번 호출에 넣을 문서 수
+            
+        Returns:
+            List[List[float]]: 문서별 임베딩
+        """
+        if not documents:
+            return []
+        
+        return self.embedding_store.embed(
+            documents,
+            self.embedding_provider.variant_id,
+            lambda missing: self.encode_documents(missing, batch_size)
+        )
+    
+    @staticmethod
+    def group_tag_rows(rows) -> Dict[str, List[Dict]]:
+        """
+        category_tags ⋈ tags 조회 결과를 매장별 태그 목록으로 묶음
+        
+        Returns:
+            {매장ID: [{'name': '태그명', 'count': 개수}, ...]}
+        """
+        grouped = {}
+        for row in rows:
+            if row['name'] is None:
+                continue
+            grouped.setdefault(row['category_id'], []).append({
+                'name': row['name'],
+                'count': row['count'] or 0
+            })
+        return grouped
+    
+    async def load_all_stores(self, batch_size: int = None, embedding_batch_size: int = None, save_state: bool = True):
         """
         DB의 모든 매장 데이터를 ChromaDB에 적재
         
+        DB 조회 → 문서 생성 → 임베딩/적재 3단계를 bounded queue 로 연결해 동시에 실행
+        (임베딩 계산은 스레드에서 실행되므로 다음 청크 DB 조회와 겹쳐서 진행)
+        매장은 id 기준 keyset 페이지로 나눠 읽고, 청크마다 태그를 JOIN 한 번으로 조회
+        
         Args:
-            batch_size: 배치 크기 (한 번에 처리할 매장 수)
+            batch_size: 청크 크기 (한 번에 조회/적재할 매장 수, None 이면 설정값)
+            embedding_batch_size: 임베딩 모델 배치 크기 (None 이면 설정값)
+            save_state: 적재 후 증분 동기화 기준 시각 저장 여부
         """
         logger.info("ChromaDB 데이터 적재 시작...")
         
+        # 다른 모델로 만든 컬렉션에는 적재하지 않음 (rebuild_collection 은 새 컬렉션이므로 통과)
+        self.check_collection_model()
+        
+        config = get_service_config("chroma_loader")
+        batch_size = batch_size or config.get("chunk_size", 500)
+        embedding_batch_size = embedding_batch_size or config.get("embedding_batch_size", 64)
+        queue_size = config.get("queue_size", 2)
+        
         # Repository 초기화
         category_repo = CategoryRepository()
         category_tags_repo = CategoryTagsRepository()
-        tags_repo = TagsRepository()
-        
-        # 전체 매장 데이터 조회
-        stores = await category_repo.select()
-        total_stores = len(stores)
         
-        logger.info(f"총 {total_stores}개 매장 데이터 조회 완료")
+        total_stores = await category_repo.count()
+        logger.info(f"총 {total_stores}개 매장 적재 예정")
         
-        # 배치 처리
-        success_count = 0
-        fail_count = 0
+        read_queue = asyncio.Queue(maxsize=queue_size)
+        build_queue = asyncio.Queue(maxsize=queue_size)
+        stats = {"success": 0, "fail": 0, "embed_seconds": 0.0, "high_water_mark": None}
+        started = time.perf_counter()
         
-        for i in range(0, total_stores, batch_size):
-            batch = stores[i:i + batch_size]
-            batch_num = i // batch_size + 1
-            total_batches = (total_stores + batch_size - 1) // batch_size
-            
-            logger.info(f"배치 {batch_num}/{total_batches} 처리 중...")
-            
-            documents = []
-            metadatas = []
-            ids = []
+        async def read_stage():
+            """1단계: 매장 청크 + 태그 조회"""
+            after_id = None
+            while True:
+                stores = await category_repo.select_page(after_id=after_id, limit=batch_size)
+                if not stores:
+                    break
+                after_id = stores[-1].id
+                
+                tag_rows = await category_tags_repo.select_with_tag_names(
+                    category_id=[store.id for store in stores]
+                )
+                await read_queue.put((stores, tag_rows))
             
-            for store in batch:
-                try:
-                    store_id = store.id
-                    
-                    # 매장별 태그 정보 조회
-                    category_tags = await category_tags_repo.select(
-                        category_id=store_id
-                    )
-                    
-                    # 태그 상세 정보 가져오기
-                    tag_details = []
-                    for ct in category_tags:
-                        tag_id = ct.tag_id if hasattr(ct, 'tag_id') else ct['tag_id']
-                        tags = await tags_repo.select(id=tag_id)
+            await read_queue.put(None)
+        
+        async def build_stage():
+            """2단계: 문서 / 메타데이터 생성"""
+            while True:
+                item = await read_queue.get()
+                if item is None:
+                    await build_queue.put(None)
+                    return
+                
+                stores, tag_rows = item
+                tags_by_store = self.group_tag_rows(tag_rows)
+                
+                documents = []
+                metadatas = []
+                ids = []
+                
+                for store in stores:
+                    try:
+                        # 문서 생성 (구, 타입, 매장ID, 영업시간 제외)
+                        doc = self.create_store_document(store, tags_by_store.get(store.id, []))
                         
-                        if tags and len(tags) > 0:
-                            tag = tags[0]
-                            tag_name = tag.name if hasattr(tag, 'name') else tag['name']
-                            count = ct.count if hasattr(ct, 'count') else ct['count']
-                            
-                            tag_details.append({
-                                'name': tag_name,
-                                'count': count
-                            })
-                    
-                    # 문서 생성 (구, 타입, 매장ID, 영업시간 제외)
-                    doc = self.create_store_document(store, tag_details)
-                    
-                    # 메타데이터 생성 (구, 타입, 매장ID, 영업시간 포함)
-                    metadata = self.create_metadata(store)
-                    
-                    documents.append(doc)
-                    metadatas.append(metadata)
-                    ids.append(str(store_id))
-                    
-                    success_count += 1
-                    
-                except Exception as e:
-                    fail_count += 1
-                    store_name = getattr(store, 'name', 'Unknown')
-                    logger.error(f"매장 '{store_name}' 처리 중 오류: {e}")
-                    import traceback
-                    logger.error(traceback.format_exc())
-                    continue
-            
-            # ChromaDB에 배치 추가
-            if documents:
-                try:
-                    self.store_collection.add(
-                        documents=documents,
-                        metadatas=metadatas,
-                        ids=ids
-                    )
-                    logger.info(f"배치 {batch_num}/{total_batches} 적재 완료: {len(documents)}개 매장")
-                except Exception as e:
-                    logger.error(f"ChromaDB 배치 추가 중 오류: {e}")
-                    import traceback
-                    logger.error(traceback.format_exc())
-                    fail_count += len(documents)
-                    success_count -= len(documents)
+                        # 메타데이터 생성 (구, 타입, 매장ID, 영업시간, 문서 해시 포함)
+                        metadatas.append(self.create_metadata(store, doc))
+                        documents.append(doc)
+                        ids.append(str(store.id))
+                        
+                        if store.last_crawl is not None:
+                            stats["high_water_mark"] = max(filter(None, [stats["high_water_mark"], store.last_crawl]))
+                        
+                    except Exception as e:
+                        stats["fail"] += 1
+                        logger.error(f"매장 '{getattr(store, 'name', 'Unknown')}' 처리 중 오류: {e}")
+                
+                await build_queue.put((documents, metadatas, ids))
+        
+        async def encode_stage():
+            """3단계: 임베딩 계산 (스레드) → ChromaDB 적재"""
+            while True:
+                item = await build_queue.get()
+                if item is None:
+                    return
+                
+                documents, metadatas, ids = item
+                if documents:
+                    try:
+                        embed_started = time.perf_counter()
+                        embeddings = await asyncio.to_thread(
+                            self.embed_documents, documents, embedding_batch_size
+                        )
+                        stats["embed_seconds"] += time.perf_counter() - embed_started
+                        
+                        await asyncio.to_thread(
+                            self.store_collection.add,
+                            documents=documents,
+                            embeddings=embeddings,
+                            metadatas=metadatas,
+                            ids=ids
+                        )
+                        stats["success"] += len(documents)
+                        
+                    except Exception as e:
+                        logger.error(f"ChromaDB 청크 추가 중 오류: {e}")
+                        import traceback
+                        logger.error(traceback.format_exc())
+                        stats["fail"] += len(documents)
+                
+                self._log_progress(
+                    stats["success"] + stats["fail"], total_stores, stats["success"],
+                    started, stats["embed_seconds"]
+                )
+        
+        tasks = [
+            asyncio.create_task(read_stage()),
+            asyncio.create_task(build_stage()),
+            asyncio.create_task(encode_stage()),
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        except Exception:
+            # 한 단계가 실패하면 나머지 단계도 중단
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        
+        # 같은 문서로 BM25 색인 / 파티션 컬렉션 / 벡터 export 생성
+        self.build_derived_indexes()
+        
+        # 이후 증분 동기화 기준 시각 저장
+        self.last_high_water_mark = stats["high_water_mark"]
+        if save_state:
+            self.save_sync_state(stats["high_water_mark"])
         
         logger.info(f"ChromaDB 데이터 적재 완료!")
-        logger.info(f"성공: {success_count}개, 실패: {fail_count}개")
+        logger.info(f"성공: {stats['success']}개, 실패: {stats['fail']}개")
+        logger.info(f"임베딩 저장소: {self.embedding_store.stats()}")
+        
+        return stats["success"], stats["fail"]
+    
+    @staticmethod
+    def _log_progress(processed: int, total: int, embedded: int, started: float, embed_seconds: float):
+        elapsed = time.perf_counter() - started
+        stores_per_sec = processed / elapsed if elapsed > 0 else 0.0
+        embeddings_per_sec = embedded / embed_seconds if embed_seconds > 0 else 0.0
+        percent = processed / total * 100 if total else 100.0
         
-        return success_count, fail_count
+        logger.info(
+            f"진행: {processed}/{total} ({percent:.1f}%) - "
+            f"{stores_per_sec:.1f} stores/sec, {embeddings_per_sec:.1f} embeddings/sec"
+        )
     
     async def load_single_store(self, store_id: str):
         """
         단일 매장 데이터를 ChromaDB에 적재 (업데이트용)
+        BM25 색인 / 파티션 컬렉션 / 벡터 export 는 이 매장만 갱신 (update_derived_indexes)
         
         Args:
             store_id: 매장 ID
@@ -288,10 +523,11 @@ class StoreChromaDBLoader:
             bool: 성공 여부
         """
         try:
+            self.check_collection_model()
+            
             # Repository 초기화
             category_repo = CategoryRepository()
             category_tags_repo = CategoryTagsRepository()
-            tags_repo = TagsRepository()
             
             # 매장 데이터 조회
             stores = await category_repo.select(id=store_id)
@@ -301,38 +537,34 @@ class StoreChromaDBLoader:
             
             store = stores[0]
             
-            # 태그 정보 조회
-            category_tags = await category_tags_repo.select(
-                category_id=store_id
-            )
-            
-            tag_details = []
-            for ct in category_tags:
-                tag_id = ct.tag_id if hasattr(ct, 'tag_id') else ct['tag_id']
-                tags = await tags_repo.select(id=tag_id)
-                
-                if tags and len(tags) > 0:
-                    tag = tags[0]
-                    tag_name = tag.name if hasattr(tag, 'name') else tag['name']
-                    count = ct.count if hasattr(ct, 'count') else ct['count']
-                    
-                    tag_details.append({
-                        'name': tag_name,
-                        'count': count
-                    })
+            # 태그 정보 조회 (JOIN 한 번)
+            tag_rows = await category_tags_repo.select_with_tag_names(category_id=store_id)
+            tag_details = self.group_tag_rows(tag_rows).get(store_id, [])
             
             # 문서 생성 (구, 타입, 매장ID, 영업시간 제외)
             doc = self.create_store_document(store, tag_details)
             
-            # 메타데이터 생성 (구, 타입, 매장ID, 영업시간 포함)
-            metadata = self.create_metadata(store)
+            # 메타데이터 생성 (구, 타입, 매장ID, 영업시간, 문서 해시 포함)
+            metadata = self.create_metadata(store, doc)
+            
+            # 문서 해시와 모델이 그대로면 임베딩 없이 메타데이터만 갱신
+            # (구 / 타입은 문서에 없으므로 이 경우에도 파티션 / BM25 필터 / 벡터 export 메타데이터 갱신)
+            existing = self.store_collection.get(ids=[str(store_id)], include=["metadatas"])
+            previous_metadata = dict(zip(existing["ids"], existing["metadatas"]))
+            if existing["ids"] and not self.needs_embedding(existing["metadatas"][0], metadata):
+                self.store_collection.update(ids=[str(store_id)], metadatas=[metadata])
+                self.update_derived_indexes([str(store_id)], previous_metadata)
+                logger.info(f"매장 '{store.name}' 문서 변경 없음 - 메타데이터만 갱신")
+                return True
             
             # ChromaDB에 추가 (이미 있으면 업데이트)
             self.store_collection.upsert(
                 documents=[doc],
+                embeddings=self.embed_documents([doc]),
                 metadatas=[metadata],
                 ids=[str(store_id)]
             )
+            self.update_derived_indexes([str(store_id)], previous_metadata)
             
             logger.info(f"매장 '{store.name}' ChromaDB 적재 완료")
             return True
@@ -343,22 +575,482 @@ class StoreChromaDBLoader:
             logger.error(traceback.format_exc())
             return False
     
+    def delete_store(self, store_id: str) -> bool:
+        """
+        단일 매장 벡터 삭제 (delete_category 후 호출)
+        
+        Returns:
+            bool: 삭제 여부 (컬렉션에 없으면 False)
+        """
+        existing = self.store_collection.get(ids=[str(store_id)], include=["metadatas"])
+        if not existing["ids"]:
+            return False
+        
+        self.store_collection.delete(ids=[str(store_id)])
+        self.update_derived_indexes([str(store_id)], dict(zip(existing["ids"], existing["metadatas"])))
+        
+        logger.info(f"매장 ID '{store_id}' ChromaDB 삭제 완료")
+        return True
+    
+    def load_sync_state(self) -> dict:
+        """
+        증분 동기화 상태 조회
+        
+        Returns:
+            dict: {"high_water_mark": 마지막으로 반영한 last_crawl (datetime 또는 None), "synced_at": ...}
+        """
+        try:
+            with open(self.sync_state_path, encoding="utf-8") as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return {"high_water_mark": None, "synced_at": None}
+        
+        if state.get("high_water_mark"):
+            state["high_water_mark"] = datetime.fromisoformat(state["high_water_mark"])
+        return state
+    
+    def save_sync_state(self, high_water_mark: datetime = None):
+        """증분 동기화 상태 저장 (임시 파일에 쓰고 교체해서 중간 상태가 남지 않게 함)"""
+        state = {
+            "high_water_mark": high_water_mark.isoformat() if high_water_mark else None,
+            "synced_at": datetime.now().isoformat(),
+        }
+        
+        tmp_path = self.sync_state_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False)
+        os.replace(tmp_path, self.sync_state_path)
+    
+    async def sync_incremental(self, full_scan: bool = False, batch_size: int = None):
+        """
+        증분 동기화 (컬렉션을 지우지 않고 변경분만 반영)
+        
+        - 마지막 동기화 이후 last_crawl 이 바뀐 매장만 조회 (full_scan 이면 전체 매장)
+        - 문서 해시나 임베딩 모델이 바뀐 매장만 다시 임베딩해서 upsert, 같으면 메타데이터만 갱신
+          (다시 임베딩하는 경우에도 임베딩 저장소에 같은 문서가 있으면 인코딩 생략)
+        - MariaDB 에서 삭제된 매장(delete_category)의 벡터는 삭제
+        - 바뀐 매장이 있으면 BM25 색인 / 파티션 컬렉션 / 벡터 export 전체 재생성 (배치 경로)
+        
+        Args:
+            full_scan: last_crawl 과 무관하게 전체 매장의 문서 해시를 비교 (태그만 수동 수정한 경우)
+            batch_size: 청크 크기 (None 이면 설정값)
+            
+        Returns:
+            dict: 동기화 결과 (embedded, metadata_only, unchanged, deleted, fail)
+        """
+        self.check_collection_model()
+        
+        config = get_service_config("chroma_loader")
+        batch_size = batch_size or config.get("chunk_size", 500)
+        embedding_batch_size = config.get("embedding_batch_size", 64)
+        
+        state = self.load_sync_state()
+        previous_mark = state["high_water_mark"]
+        crawled_after = None if full_scan else previous_mark
+        high_water_mark = previous_mark
+        
+        logger.info(f"ChromaDB 증분 동기화 시작 (기준 시각: {crawled_after or '전체'})")
+        
+        category_repo = CategoryRepository()
+        category_tags_repo = CategoryTagsRepository()
+        result = {"embedded": 0, "metadata_only": 0, "unchanged": 0, "deleted": 0, "fail": 0}
+        after_id = None
+        
+        while True:
+            stores = await category_repo.select_page(
+                after_id=after_id, limit=batch_size, crawled_after=crawled_after
+            )
+            if not stores:
+                break
+            after_id = stores[-1].id
+            
+            tag_rows = await category_tags_repo.select_with_tag_names(
+                category_id=[store.id for store in stores]
+            )
+            tags_by_store = self.group_tag_rows(tag_rows)
+            
+            # 기존 벡터의 메타데이터 (문서 해시, 임베딩 모델)
+            existing = self.store_collection.get(ids=[str(store.id) for store in stores], include=["metadatas"])
+            existing_metadata = dict(zip(existing["ids"], existing["metadatas"]))
+            
+            embed_docs, embed_metas, embed_ids = [], [], []
+            update_metas, update_ids = [], []
+            
+            for store in stores:
+                try:
+                    doc = self.create_store_document(store, tags_by_store.get(store.id, []))
+                    metadata = self.create_metadata(store, doc)
+                    store_id = str(store.id)
+                    
+                    if self.needs_embedding(existing_metadata.get(store_id), metadata):
+                        embed_docs.append(doc)
+                        embed_metas.append(metadata)
+                        embed_ids.append(store_id)
+                    elif previous_mark is None or (store.last_crawl and store.last_crawl > previous_mark):
+                        update_metas.append(metadata)
+                        update_ids.append(store_id)
+                    else:
+                        result["unchanged"] += 1
+                    
+                    if store.last_crawl is not None:
+                        high_water_mark = max(filter(None, [high_water_mark, store.last_crawl]))
+                        
+                except Exception as e:
+                    result["fail"] += 1
+                    logger.error(f"매장 '{getattr(store, 'name', 'Unknown')}' 처리 중 오류: {e}")
+            
+            if embed_docs:
+                embeddings = await asyncio.to_thread(self.embed_documents, embed_docs, embedding_batch_size)
+                self.store_collection.upsert(
+                    documents=embed_docs,
+                    embeddings=embeddings,
+                    metadatas=embed_metas,
+                    ids=embed_ids
+                )
+                result["embedded"] += len(embed_docs)
+            
+            # 문서가 같으면 임베딩 없이 메타데이터만 갱신
+            if update_ids:
+                self.store_collection.update(ids=update_ids, metadatas=update_metas)
+                result["metadata_only"] += len(update_ids)
+        
+        # 삭제된 매장 정리 (ChromaDB 에만 남아 있는 id)
+        db_ids = set(await category_repo.select_ids())
+        vector_ids = set(self.store_collection.get(include=[])["ids"])
+        removed_ids = list(vector_ids - db_ids)
+        if removed_ids:
+            self.store_collection.delete(ids=removed_ids)
+            result["deleted"] = len(removed_ids)
+        
+        if result["embedded"] or result["metadata_only"] or result["deleted"]:
+            self.build_derived_indexes()
+        
+        self.save_sync_state(high_water_mark)
+        
+        logger.info(f"ChromaDB 증분 동기화 완료: {result}")
+        return result
+    
+    def _iter_collection(self, include: List[str], page_size: int = 1000):
+        """현재 컬렉션 전체를 페이지 단위로 조회 (collection.get 결과 dict 를 yield)"""
+        offset = 0
+        while True:
+            page = self.store_collection.get(include=include, limit=page_size, offset=offset)
+            if not page["ids"]:
+                return
+            yield page
+            offset += len(page["ids"])
+    
+    def build_derived_indexes(self):
+        """컬렉션 내용이 바뀐 뒤 BM25 색인 / 파티션 컬렉션 / 벡터 export 갱신"""
+        self.build_lexical_index()
+        if self.partitioned:
+            self.build_partitions()
+        if self.export_vectors:
+            self.build_vector_export()
+    
+    def update_derived_indexes(self, store_ids: List[str], previous_metadata: Dict[str, dict] = None):
+        """
+        일부 매장만 바뀐 뒤 BM25 색인 / 파티션 컬렉션 / 벡터 export 에 해당 매장만 반영
+        (load_single_store / delete_store 용, 컬렉션 전체를 다시 읽지 않음)
+        색인 파일 / manifest / export 가 아직 없으면 그 항목만 전체 생성
+        
+        Args:
+            store_ids: 추가 / 수정 / 삭제한 매장 ID (컬렉션에 없으면 삭제로 처리)
+            previous_metadata: 변경 전 메타데이터 {매장ID: 메타데이터} (구 / 타입이 바뀐 매장을 이전 파티션에서 제거)
+        """
+        include = ["documents", "metadatas"]
+        if self.partitioned or self.export_vectors:
+            include.append("embeddings")
+        
+        fetched = self.store_collection.get(ids=list(store_ids), include=include)
+        rows = {
+            store_id: (
+                fetched["documents"][i],
+                fetched["metadatas"][i],
+                list(fetched["embeddings"][i]) if "embeddings" in include else None
+            )
+            for i, store_id in enumerate(fetched["ids"])
+        }
+        removed_ids = [store_id for store_id in store_ids if store_id not in rows]
+        
+        self._update_lexical_index(rows, removed_ids)
+        if self.partitioned:
+            self._update_partitions(rows, removed_ids, previous_metadata or {})
+        if self.export_vectors:
+            self._update_vector_export(rows, removed_ids)
+    
+    def _update_lexical_index(self, rows: Dict[str, tuple], removed_ids: List[str]):
+        path = lexical_index_path(self.persist_directory, self.store_collection.name)
+        index = LexicalIndex.load(path)
+        if index is None:
+            self.build_lexical_index()
+            return
+        
+        index.remove(removed_ids)
+        index.upsert((store_id, document, metadata) for store_id, (document, metadata, _) in rows.items())
+        index.save(path)
+    
+    def _update_vector_export(self, rows: Dict[str, tuple], removed_ids: List[str]):
+        ids = list(rows)
+        patched = patch_vector_export(
+            self.persist_directory, self.store_collection.name,
+            ids,
+            [rows[store_id][2] for store_id in ids],
+            [rows[store_id][1] for store_id in ids],
+            [rows[store_id][0] for store_id in ids],
+            removed_ids,
+            dtype=self.export_dtype, extra={"embedding_model": self.model_id}
+        )
+        if not patched:
+            self.build_vector_export()
+    
+    def _partition_collection(self, base_name: str, region: str, type_code: str):
+        return self._get_or_create_collection(
+            partition_collection_name(base_name, region, type_code),
+            {"description": "매장 파티션 컬렉션", "partition_of": base_name,
+             "region": region, "type_code": type_code, "embedding_model": self.model_id}
+        )
+    
+    def _update_partitions(self, rows: Dict[str, tuple], removed_ids: List[str], previous_metadata: Dict[str, dict]):
+        """바뀐 매장만 파티션에 upsert 하고, 삭제됐거나 구 / 타입이 바뀐 매장은 이전 파티션에서 제거"""
+        base_name = self.store_collection.name
+        path = manifest_path(self.persist_directory, base_name)
+        manifest = read_manifest(path)
+        if manifest is None:
+            self.build_partitions()
+            return
+        
+        touched = {}
+        
+        for store_id in list(rows) + removed_ids:
+            previous = previous_metadata.get(store_id)
+            if previous is None:
+                continue
+            
+            key = (previous.get("region"), previous.get("type_code"))
+            current = rows.get(store_id)
+            if current is not None and (current[1].get("region"), current[1].get("type_code")) == key:
+                continue
+            
+            if partition_key(*key) in manifest:
+                collection = touched.get(key) or self._partition_collection(base_name, *key)
+                collection.delete(ids=[store_id])
+                touched[key] = collection
+        
+        groups = {}
+        for store_id, (document, metadata, embedding) in rows.items():
+            key = (metadata.get("region"), metadata.get("type_code"))
+            group = groups.setdefault(key, {"ids": [], "documents": [], "metadatas": [], "embeddings": []})
+            group["ids"].append(store_id)
+            group["documents"].append(document)
+            group["metadatas"].append(metadata)
+            group["embeddings"].append(embedding)
+        
+        for key, group in groups.items():
+            collection = touched.get(key) or self._partition_collection(base_name, *key)
+            collection.upsert(**group)
+            touched[key] = collection
+        
+        emptied = []
+        for (region, type_code), collection in touched.items():
+            count = collection.count()
+            if count:
+                manifest[partition_key(region, type_code)] = {"collection": collection.name, "count": count}
+            else:
+                manifest.pop(partition_key(region, type_code), None)
+                emptied.append(collection.name)
+        
+        write_manifest(path, manifest)
+        
+        # 비어 버린 파티션 삭제 (manifest 교체 후 삭제해서 검색 서비스가 참조하지 않게 함)
+        for name in emptied:
+            self.client.delete_collection(name=name)
+    
+    def build_lexical_index(self) -> int:
+        """
+        현재 컬렉션에 저장된 문서로 BM25 색인을 만들어 chroma_db/lexical/{컬렉션명}.json 에 저장
+        
+        Returns:
+            int: 색인한 문서 수
+        """
+        entries = []
+        for page in self._iter_collection(["documents", "metadatas"]):
+            entries.extend(zip(page["ids"], page["documents"], page["metadatas"]))
+        
+        index = LexicalIndex.build(entries)
+        index.save(lexical_index_path(self.persist_directory, self.store_collection.name))
+        return len(index)
+    
+    def build_vector_export(self) -> int:
+        """
+        현재 컬렉션의 임베딩을 chroma_db/vectors/{컬렉션명}.npy (+ .json) 로 export
+        (NumPy 전수 검색 백엔드용, 임베딩은 다시 계산하지 않음)
+        
+        Returns:
+            int: export 한 벡터 수
+        """
+        ids, embeddings, metadatas, documents = [], [], [], []
+        for page in self._iter_collection(["documents", "metadatas", "embeddings"]):
+            ids.extend(page["ids"])
+            embeddings.extend(page["embeddings"])
+            metadatas.extend(page["metadatas"])
+            documents.extend(page["documents"])
+        
+        write_vector_export(
+            self.persist_directory, self.store_collection.name, ids, embeddings, metadatas, documents,
+            dtype=self.export_dtype, extra={"embedding_model": self.model_id}
+        )
+        logger.info(f"벡터 export 완료: {len(ids)}개 ({self.export_dtype})")
+        return len(ids)
+    
+    def build_partitions(self) -> dict:
+        """
+        현재 컬렉션의 벡터를 (구, 타입) 별 파티션 컬렉션에 동기화하고 manifest 저장
+        (임베딩은 전체 컬렉션에서 그대로 복사, 다시 계산하지 않음)
+        
+        - 파티션마다 upsert 후 더 이상 속하지 않는 매장은 삭제 (검색 중인 컬렉션을 지우지 않음)
+        - 매장이 모두 빠진 파티션 컬렉션만 삭제
+        
+        Returns:
+            dict: manifest ({"강남구|1": {"collection": ..., "count": ...}, ...})
+        """
+        base_name = self.store_collection.name
+        groups = {}
+        for page in self._iter_collection(["documents", "metadatas", "embeddings"]):
+            for store_id, document, metadata, embedding in zip(
+                page["ids"], page["documents"], page["metadatas"], page["embeddings"]
+            ):
+                key = (metadata.get("region"), metadata.get("type_code"))
+                group = groups.setdefault(key, {"ids": [], "documents": [], "metadatas": [], "embeddings": []})
+                group["ids"].append(store_id)
+                group["documents"].append(document)
+                group["metadatas"].append(metadata)
+                group["embeddings"].append(list(embedding))
+        
+        manifest = {}
+        for (region, type_code), group in groups.items():
+            collection = self._partition_collection(base_name, region, type_code)
+            name = collection.name
+            
+            for i in range(0, len(group["ids"]), 500):
+                collection.upsert(
+                    ids=group["ids"][i:i + 500],
+                    documents=group["documents"][i:i + 500],
+                    metadatas=group["metadatas"][i:i + 500],
+                    embeddings=group["embeddings"][i:i + 500]
+                )
+            
+            stale_ids = set(collection.get(include=[])["ids"]) - set(group["ids"])
+            if stale_ids:
+                collection.delete(ids=list(stale_ids))
+            
+            manifest[partition_key(region, type_code)] = {"collection": name, "count": len(group["ids"])}
+        
+        path = manifest_path(self.persist_directory, base_name)
+        live_names = {entry["collection"] for entry in manifest.values()}
+        write_manifest(path, manifest)
+        
+        # 비어 버린 파티션 삭제 (manifest 교체 후 삭제해서 검색 서비스가 참조하지 않게 함)
+        for name in self._list_collection_names():
+            if name.startswith(partition_prefix(base_name)) and name not in live_names:
+                self.client.delete_collection(name=name)
+        
+        logger.info(f"파티션 컬렉션 {len(manifest)}개 동기화 완료 ({base_name})")
+        return manifest
+    
+    def drop_partitions(self, collection_name: str):
+        """전체 컬렉션에 딸린 파티션 컬렉션과 manifest 삭제"""
+        for name in self._list_collection_names():
+            if name.startswith(partition_prefix(collection_name)):
+                self.client.delete_collection(name=name)
+        manifest_path(self.persist_directory, collection_name).unlink(missing_ok=True)
+    
+    async def rebuild_collection(self) -> dict:
+        """
+        무중단 전체 재적재 (blue/green)
+        
+        1. 새 버전 컬렉션(stores_v{n+1})에 전체 적재
+        2. 적재 건수를 MariaDB 매장 수와 비교 (min_count_ratio 미만이면 새 컬렉션 삭제 후 중단)
+        3. alias 파일을 원자적으로 교체 → 검색 서비스가 재시작 없이 새 컬렉션 사용
+        4. 이전 버전 컬렉션(keep_versions 개 제외)과 고아 세그먼트 디렉토리 삭제
+        
+        Returns:
+            dict: {"collection": 새 컬렉션명, "count": 적재 건수, "expected": MariaDB 매장 수}
+        """
+        config = get_service_config("chroma_loader")
+        min_count_ratio = config.get("min_count_ratio", 1.0)
+        keep_versions = config.get("keep_versions", 1)
+        
+        previous_collection = self.store_collection
+        versions = [v for v in map(parse_version, self._list_collection_names()) if v is not None]
+        new_name = versioned_name(max(versions, default=0) + 1)
+        
+        logger.info(f"새 컬렉션 '{new_name}' 에 전체 적재 시작 (현재: '{previous_collection.name}')")
+        self.store_collection = self.client.create_collection(
+            name=new_name,
+            metadata=self._collection_metadata(),
+            embedding_function=None
+        )
+        
+        try:
+            await self.load_all_stores(save_state=False)
+            
+            count = self.store_collection.count()
+            expected = await CategoryRepository().count()
+            if count < expected * min_count_ratio:
+                raise Exception(f"적재 건수 부족: {count}/{expected}")
+            
+        except Exception as e:
+            logger.error(f"'{new_name}' 적재 실패 - 기존 컬렉션 유지: {e}")
+            self.client.delete_collection(name=new_name)
+            lexical_index_path(self.persist_directory, new_name).unlink(missing_ok=True)
+            remove_vector_export(self.persist_directory, new_name)
+            self.drop_partitions(new_name)
+            self.store_collection = previous_collection
+            raise
+        
+        # 전환
+        write_alias(self.persist_directory, new_name, {"count": count})
+        self.save_sync_state(self.last_high_water_mark)
+        
+        # 이전 버전 정리 (롤백용으로 keep_versions 개 유지)
+        # 기존 'stores' 컬렉션은 버전 0 으로 취급: 검색 서비스가 alias 를 다시 확인할 때까지
+        # (alias_check_interval_s) 계속 조회하므로 첫 재적재 직후 바로 삭제하지 않음
+        new_version = parse_version(new_name)
+        for name in self._list_collection_names():
+            version = 0 if name == COLLECTION_PREFIX else parse_version(name)
+            if version is not None and version < new_version - keep_versions:
+                self.client.delete_collection(name=name)
+                lexical_index_path(self.persist_directory, name).unlink(missing_ok=True)
+                remove_vector_export(self.persist_directory, name)
+                self.drop_partitions(name)
+                logger.info(f"이전 컬렉션 '{name}' 삭제")
+        
+        remove_orphan_segments(self.persist_directory)
+        
+        return {"collection": new_name, "count": count, "expected": expected}
+    
+    def _list_collection_names(self) -> List[str]:
+        # chromadb 버전에 따라 Collection 객체 또는 이름(str) 목록을 반환
+        return [c.name if hasattr(c, "name") else c for c in self.client.list_collections()]
+    
     def reset_collection(self):
         """
         컬렉션 초기화 (모든 데이터 삭제)
-        주의: 이 메서드는 모든 데이터를 삭제합니다!
+        주의: 이 메서드는 모든 데이터를 삭제합니다! (재적재 중 검색이 실패하므로 rebuild_collection 사용 권장)
         """
+        name = self.store_collection.name
         try:
-            self.client.delete_collection(name="stores")
-            logger.info("기존 'stores' 컬렉션 삭제 완료")
+            self.client.delete_collection(name=name)
+            logger.info(f"기존 '{name}' 컬렉션 삭제 완료")
             
             # 임베딩 함수로 새 컬렉션 생성
             self.store_collection = self.client.create_collection(
-                name="stores",
-                metadata={"description": "매장 정보 검색용 컬렉션 (임베딩)"},
-                embedding_function=self.embedding_function
+                name=name,
+                metadata=self._collection_metadata(),
+                embedding_function=None
             )
-            logger.info("새로운 'stores' 컬렉션 생성 완료")
+            logger.info(f"새로운 '{name}' 컬렉션 생성 완료")
             
         except Exception as e:
             logger.error(f"컬렉션 초기화 중 오류: {e}")
@@ -377,11 +1069,28 @@ class StoreChromaDBLoader:
                 "collection_name": self.store_collection.name,
                 "total_documents": count,
                 "metadata": self.store_collection.metadata,
-                "embedding_model": "intfloat/multilingual-e5-large"
+                "embedding_model": self.collection_model_id(),
+                "embedding_backend": self.embedding_provider.variant_id,
+                "embedding_store": self.embedding_store.stats()
             }
             
             return info
             
         except Exception as e:
             logger.error(f"컬렉션 정보 조회 중 오류: {e}")
-            return {}
\ No newline at end of file
+            return {}
+
+_STORE_LOADER: Optional[StoreChromaDBLoader] = None
+
+
+def get_store_chromadb_loader(persist_directory: str = "./chroma_db") -> StoreChromaDBLoader:
+    """크롤러가 매장 저장 / 삭제 후 같은 프로세스에서 계속 사용하는 로더 (alias 가 바뀌면 현재 컬렉션으로 전환)"""
+    global _STORE_LOADER
+    
+    if _STORE_LOADER is None:
+        _STORE_LOADER = StoreChromaDBLoader(persist_directory=persist_directory)
+    else:
+        _STORE_LOADER.follow_alias()
+    
+    return _STORE_LOADER
+
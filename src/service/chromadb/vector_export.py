@@ -0,0 +1,255 @@
+"""
+매장 벡터 export (NumPy 검색 백엔드용)
+컬렉션의 임베딩을 {컬렉션명}.npy 행렬로, id / 메타데이터 / 문서를 {컬렉션명}.json 으로 저장합니다.
+검색 서비스는 행렬을 memmap 으로 열어 전수 검색(행렬 × 벡터)합니다.
+
+양자화 저장 (dtype)
+- float32: 원본 그대로 (벡터당 4 KB, 1024차원 기준)
+- float16: 절반 크기
+- int8: 차원별 scalar 양자화 (min / step 을 메타데이터에 저장, 1/4 크기)
+양자화한 경우 원본 float32 행렬을 {컬렉션명}.full.npy 로 함께 저장해 상위 후보만 원본으로 재정렬합니다.
+(full 행렬은 memmap 이라 후보 행만 읽으므로 워커 메모리에는 거의 올라오지 않음)
+"""
+import json
+import os
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+EXPORT_DIR_NAME = "vectors"
+EXPORT_VERSION = 2
+EXPORT_DTYPES = ("float32", "float16", "int8")
+
+# write_vector_export 가 직접 채우는 메타데이터 키 (나머지는 extra)
+_EXPORT_FIELDS = ("version", "collection", "dtype", "count", "dim", "ids", "metadatas", "documents", "quantization")
+
+
+def export_paths(persist_directory: str, collection_name: str) -> Tuple[Path, Path]:
+    """(행렬 .npy 경로, 메타데이터 .json 경로)"""
+    directory = Path(persist_directory).joinpath(EXPORT_DIR_NAME)
+    return directory.joinpath(f"{collection_name}.npy"), directory.joinpath(f"{collection_name}.json")
+
+
+def full_matrix_path(persist_directory: str, collection_name: str) -> Path:
+    """양자화 export 의 원본 float32 행렬 경로"""
+    return Path(persist_directory).joinpath(EXPORT_DIR_NAME, f"{collection_name}.full.npy")
+
+
+def quantize_int8(matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    차원별 scalar int8 양자화  x ≈ min + (code + 128) × step
+
+    Returns:
+        (int8 코드 행렬, 차원별 min, 차원별 step)
+    """
+    if matrix.size == 0:
+        return matrix.astype(np.int8), np.zeros(matrix.shape[1], np.float32), np.ones(matrix.shape[1], np.float32)
+
+    mins = matrix.min(axis=0)
+    step = (matrix.max(axis=0) - mins) / 255
+    step = np.where(step == 0, 1.0, step).astype(np.float32)
+
+    codes = np.rint((matrix - mins) / step) - 128
+    return np.clip(codes, -128, 127).astype(np.int8), mins.astype(np.float32), step
+
+
+def _save_npy(path: Path, matrix: np.ndarray):
+    tmp_path = path.with_suffix(".tmp.npy")
+    np.save(tmp_path, matrix)
+    os.replace(tmp_path, path)
+
+
+def _save_meta(path: Path, meta: dict):
+    tmp_meta = path.with_suffix(".tmp")
+    with open(tmp_meta, "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp_meta, path)
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms == 0, 1.0, norms)
+
+
+def write_vector_export(persist_directory: str, collection_name: str, ids: List[str], embeddings,
+                        metadatas: List[dict], documents: List[str], dtype: str = "float32", extra: dict = None):
+    """
+    벡터 export 저장 (행렬 → 메타데이터 순서로 교체, 읽는 쪽은 행 수가 맞는지 확인)
+
+    Args:
+        dtype: 행렬 저장 타입 ("float32", "float16", "int8")
+        extra: 메타데이터 파일에 함께 기록할 값
+    """
+    if dtype not in EXPORT_DTYPES:
+        raise ValueError(f"지원하지 않는 export dtype: {dtype}")
+
+    matrix_path, meta_path = export_paths(persist_directory, collection_name)
+    matrix_path.parent.mkdir(parents=True, exist_ok=True)
+
+    matrix = np.asarray(embeddings, dtype=np.float32)
+    if matrix.size == 0:
+        matrix = np.zeros((0, 0), dtype=np.float32)
+    matrix = _normalize_rows(matrix)
+
+    meta = {
+        "version": EXPORT_VERSION,
+        "collection": collection_name,
+        "dtype": dtype,
+        "count": len(ids),
+        "dim": int(matrix.shape[1]),
+        "ids": ids,
+        "metadatas": metadatas,
+        "documents": documents,
+    }
+    if extra:
+        meta.update(extra)
+
+    full_path = full_matrix_path(persist_directory, collection_name)
+    if dtype == "float32":
+        _save_npy(matrix_path, matrix)
+        full_path.unlink(missing_ok=True)
+    else:
+        _save_npy(full_path, matrix)
+        if dtype == "int8":
+            codes, mins, step = quantize_int8(matrix)
+            meta["quantization"] = {"min": mins.tolist(), "step": step.tolist()}
+            _save_npy(matrix_path, codes)
+        else:
+            _save_npy(matrix_path, matrix.astype(np.float16))
+
+    _save_meta(meta_path, meta)
+
+
+def patch_vector_export(persist_directory: str, collection_name: str, ids: List[str], embeddings,
+                        metadatas: List[dict], documents: List[str], removed_ids: List[str],
+                        dtype: str = "float32", extra: dict = None) -> bool:
+    """
+    바뀐 매장만 기존 export 에 반영 (컬렉션 전체 임베딩을 다시 읽지 않음)
+
+    - 기존 매장 수정만 있으면 행렬 파일의 해당 행만 제자리에서 수정 (int8 은 기존 양자화 범위로 clip)
+    - 매장 추가 / 삭제가 있으면 기존 export 행렬(양자화한 경우 원본 float32)에 반영해서 다시 저장
+    메타데이터 파일은 행렬 수정 후 교체 (검색 서비스는 메타데이터 파일 mtime 으로 다시 로드)
+
+    Args:
+        ids / embeddings / metadatas / documents: 추가 / 수정된 매장
+        removed_ids: 삭제된 매장 ID
+
+    Returns:
+        bool: False 면 반영하지 못함 (export 없음 / dtype 변경 / 원본 행렬 없음) → 전체 export 필요
+    """
+    loaded = read_vector_export(persist_directory, collection_name)
+    if loaded is None:
+        return False
+
+    matrix, meta, full_matrix = loaded
+    if meta["dtype"] != dtype or (dtype != "float32" and full_matrix is None):
+        return False
+
+    if ids:
+        vectors = _normalize_rows(np.asarray(embeddings, dtype=np.float32).reshape(len(ids), -1))
+        if meta["count"] and vectors.shape[1] != meta["dim"]:
+            return False
+    else:
+        vectors = np.zeros((0, meta["dim"]), dtype=np.float32)
+
+    row_of = {store_id: row for row, store_id in enumerate(meta["ids"])}
+    removed = {store_id for store_id in removed_ids if store_id in row_of}
+    if extra:
+        meta.update(extra)
+
+    if not removed and all(store_id in row_of for store_id in ids):
+        # 행 수가 그대로면 바뀐 행만 수정
+        matrix_path, meta_path = export_paths(persist_directory, collection_name)
+        rows = [row_of[store_id] for store_id in ids]
+        if rows:
+            if dtype == "float32":
+                stored = vectors
+            elif dtype == "float16":
+                stored = vectors.astype(np.float16)
+            else:
+                quantization = meta["quantization"]
+                mins = np.asarray(quantization["min"], dtype=np.float32)
+                step = np.asarray(quantization["step"], dtype=np.float32)
+                stored = np.clip(np.rint((vectors - mins) / step) - 128, -128, 127).astype(np.int8)
+
+            target = np.load(matrix_path, mmap_mode="r+")
+            target[rows] = stored
+            target.flush()
+            del target
+
+            if dtype != "float32":
+                target = np.load(full_matrix_path(persist_directory, collection_name), mmap_mode="r+")
+                target[rows] = vectors
+                target.flush()
+                del target
+
+        for store_id, metadata, document in zip(ids, metadatas, documents):
+            meta["metadatas"][row_of[store_id]] = metadata
+            meta["documents"][row_of[store_id]] = document
+        _save_meta(meta_path, meta)
+        return True
+
+    keep = [row for row, store_id in enumerate(meta["ids"]) if store_id not in removed]
+    source = full_matrix if full_matrix is not None else matrix
+    all_embeddings = [np.asarray(source[keep], dtype=np.float32)] if meta["count"] else []
+    all_ids = [meta["ids"][row] for row in keep]
+    all_metadatas = [meta["metadatas"][row] for row in keep]
+    all_documents = [meta["documents"][row] for row in keep]
+
+    position = {store_id: i for i, store_id in enumerate(all_ids)}
+    appended = []
+    for store_id, vector, metadata, document in zip(ids, vectors, metadatas, documents):
+        if store_id in position:
+            all_embeddings[0][position[store_id]] = vector
+            all_metadatas[position[store_id]] = metadata
+            all_documents[position[store_id]] = document
+        else:
+            all_ids.append(store_id)
+            all_metadatas.append(metadata)
+            all_documents.append(document)
+            appended.append(vector)
+    if appended:
+        all_embeddings.append(np.asarray(appended, dtype=np.float32))
+
+    merged = np.concatenate(all_embeddings) if all_embeddings else np.zeros((0, 0), dtype=np.float32)
+    extra = {key: value for key, value in meta.items() if key not in _EXPORT_FIELDS}
+    write_vector_export(
+        persist_directory, collection_name, all_ids, merged, all_metadatas, all_documents, dtype=dtype, extra=extra
+    )
+    return True
+
+
+def read_vector_export(persist_directory: str, collection_name: str) \
+        -> Optional[Tuple[np.ndarray, dict, Optional[np.ndarray]]]:
+    """
+    Returns:
+        (memmap 행렬, 메타데이터, 원본 float32 memmap 행렬 또는 None)
+        export 없음 / 버전·행 수 불일치면 None
+    """
+    matrix_path, meta_path = export_paths(persist_directory, collection_name)
+    try:
+        with open(meta_path, encoding="utf-8") as f:
+            meta = json.load(f)
+        matrix = np.load(matrix_path, mmap_mode="r")
+    except FileNotFoundError:
+        return None
+
+    if meta.get("version") != EXPORT_VERSION or matrix.shape[0] != meta["count"]:
+        return None
+
+    full_matrix = None
+    if meta["dtype"] != "float32":
+        try:
+            full_matrix = np.load(full_matrix_path(persist_directory, collection_name), mmap_mode="r")
+        except FileNotFoundError:
+            full_matrix = None
+        if full_matrix is not None and full_matrix.shape[0] != meta["count"]:
+            full_matrix = None
+
+    return matrix, meta, full_matrix
+
+
+def remove_vector_export(persist_directory: str, collection_name: str):
+    for path in (*export_paths(persist_directory, collection_name), full_matrix_path(persist_directory, collection_name)):
+        path.unlink(missing_ok=True)
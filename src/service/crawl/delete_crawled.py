@@ -1,12 +1,15 @@
 from src.infra.database.repository.category_repository import CategoryRepository
 from src.infra.database.repository.category_tags_repository import CategoryTagsRepository
 from src.logger.custom_logger import get_logger
+from src.service.suggest.store_detail_cache import invalidate_store_detail
+from src.utils.config import get_service_config
 
 logger = get_logger(__name__)
 
 async def delete_category(id: str):
     """
         Warning! 이 메서드 실행 전 해당 카테고리에 연결 되어있는 친구들 부터 삭제(ex. category tags, reviews, user history, user like)
+        ChromaDB 벡터는 카드 projection 을 쓰는 경우(denormalize_metadata) 바로 삭제, 아니면 다음 증분 동기화(load_chromadb --incremental)에서 삭제됨
     """
     try:
         logger.info(f"delete_category: {id}")
@@ -16,16 +19,30 @@ async def delete_category(id: str):
             raise Exception(f"다른 테이블 삭제 먼저 하기")
 
         repository = CategoryRepository()
-        flag = await repository.delete(id)
+        flag = await repository.delete(id=id)
 
         if flag:
             logger.info(f"successful delete_category: {id}")
+            invalidate_store_detail(id)
+            await delete_store_index(id)
         else:
             raise Exception(f"{id} delete category error")
     except Exception as ex:
         logger.error(f"delete category error: {ex}")
         raise Exception(f"{id} delete category error")
 
+async def delete_store_index(id: str):
+    """삭제한 매장이 추천 카드(projection)로 계속 나오지 않도록 ChromaDB 벡터 삭제 (실패하면 다음 증분 동기화에서 삭제)"""
+    if not get_service_config("chroma_loader").get("denormalize_metadata", False):
+        return
+
+    try:
+        from src.service.chromadb.store_chromadb_loader import get_store_chromadb_loader
+
+        get_store_chromadb_loader().delete_store(id)
+    except Exception as e:
+        logger.error(f"ChromaDB 매장 삭제 오류 - 다음 증분 동기화에서 삭제: {id} {e}")
+
 async def delete_category_tags(id: str):
     logger.info(f"delete_category_tags: {id}")
     repository = CategoryTagsRepository()
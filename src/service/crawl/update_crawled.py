@@ -5,6 +5,8 @@ from src.domain.entities.category_tags_entity import CategoryTagsEntity
 from src.infra.database.repository.category_repository import CategoryRepository
 from src.infra.database.repository.category_tags_repository import CategoryTagsRepository
 from src.logger.custom_logger import get_logger
+from src.service.suggest.store_detail_cache import invalidate_store_detail
+from src.utils.config import get_service_config
 
 async def update_category(dto: InsertCategoryDto) -> str:
     try:
@@ -26,6 +28,7 @@ async def update_category(dto: InsertCategoryDto) -> str:
 
             if flag:
                 logger.info(f"successful Updated category: {dto}")
+                invalidate_store_detail(id)
                 return id
             else:
                 logger.info(f"failed Updated category: {dto}")
@@ -63,4 +66,22 @@ async def update_category_tags(dto: InsertCategoryTagsDTO) -> int:
 
     except Exception as e:
         logger.error(e)
-        raise Exception(f"update category tags error: {e}")
\ No newline at end of file
+        raise Exception(f"update category tags error: {e}")
+
+async def refresh_store_index(id: str):
+    """
+        매장 / 태그 저장 후 ChromaDB 벡터와 카드 projection 갱신 (chroma_loader.denormalize_metadata 인 경우)
+        검색 서비스는 추천 카드를 projection 으로만 만들고 MariaDB 와 비교하지 않으므로 쓰는 쪽에서 바로 반영
+        실패해도 크롤링은 계속 진행 (다음 증분 동기화에서 반영)
+    """
+    if not get_service_config("chroma_loader").get("denormalize_metadata", False):
+        return
+
+    logger = get_logger(__name__)
+    try:
+        from src.service.chromadb.store_chromadb_loader import get_store_chromadb_loader
+
+        if not await get_store_chromadb_loader().load_single_store(id):
+            logger.error(f"ChromaDB 매장 갱신 실패 - 다음 증분 동기화에서 반영: {id}")
+    except Exception as e:
+        logger.error(f"ChromaDB 매장 갱신 오류 - 다음 증분 동기화에서 반영: {id} {e}")
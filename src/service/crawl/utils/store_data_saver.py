@@ -8,7 +8,7 @@ from src.infra.external.category_classifier_service import CategoryTypeClassifie
 from src.infra.external.kakao_geocoding_service import GeocodingService
 from src.logger.custom_logger import get_logger
 from src.service.crawl.insert_crawled import insert_category, insert_category_tags, insert_tags
-from src.service.crawl.update_crawled import update_category, update_category_tags
+from src.service.crawl.update_crawled import update_category, update_category_tags, refresh_store_index
 from src.service.crawl.utils.address_parser import AddressParser
 
 logger = get_logger(__name__)
@@ -122,6 +122,9 @@ class StoreDataSaver:
                         logger.error(f"태그 저장 중 오류: {tag_name} - {tag_error}")
                         continue
                 
+                # 태그까지 저장한 뒤 ChromaDB 벡터 / 카드 projection 갱신
+                await refresh_store_index(category_id)
+                
                 success_msg = f"[{log_prefix} 저장 {idx}/{total}] '{name}' 완료"
                 logger.info(success_msg)
                 return True, success_msg
@@ -0,0 +1,190 @@
+"""
+검색 쿼리 임베딩 캐시
+같은 검색 문장은 다시 인코딩하지 않도록 float32 벡터를 쿼리 문자열 기준으로 저장합니다.
+메모리 캐시는 항목 수가 아닌 바이트 예산으로 제한하고,
+설정 시 memmap 파일(+ SQLite 인덱스)에도 저장해 재시작 후에도 재사용합니다.
+"""
+import sqlite3
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from src.logger.custom_logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class _MemmapVectorStore:
+    """
+    고정 크기 링 버퍼 형태의 디스크 벡터 저장소
+    vectors.f32 (capacity × dim memmap) + index.sqlite3 (query → slot)
+    """
+
+    def __init__(self, directory: str, capacity: int):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.capacity = max(1, capacity)
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.directory.joinpath("index.sqlite3")), check_same_thread=False)
+        self._db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+        self._db.execute("CREATE TABLE IF NOT EXISTS slots (query TEXT PRIMARY KEY, slot INTEGER NOT NULL UNIQUE)")
+        self._db.commit()
+
+        self.dim = self._get_meta("dim")
+        self._vectors = None
+        if self.dim:
+            self._open(self.dim)
+
+    def _get_meta(self, key: str) -> Optional[int]:
+        row = self._db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key: str, value: int):
+        self._db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def _open(self, dim: int):
+        path = self.directory.joinpath("vectors.f32")
+        mode = "r+" if path.exists() else "w+"
+        self._vectors = np.memmap(path, dtype=np.float32, mode=mode, shape=(self.capacity, dim))
+
+    def get(self, query: str) -> Optional[np.ndarray]:
+        if self._vectors is None:
+            return None
+
+        with self._lock:
+            row = self._db.execute("SELECT slot FROM slots WHERE query = ?", (query,)).fetchone()
+            if row is None:
+                return None
+            return np.array(self._vectors[row[0]])
+
+    def set(self, query: str, vector: np.ndarray):
+        with self._lock:
+            if self._vectors is None:
+                self.dim = int(vector.shape[0])
+                self._set_meta("dim", self.dim)
+                self._open(self.dim)
+            elif vector.shape[0] != self.dim:
+                return
+
+            row = self._db.execute("SELECT slot FROM slots WHERE query = ?", (query,)).fetchone()
+            if row is not None:
+                slot = row[0]
+            else:
+                # 다음 슬롯을 덮어쓰며 이전 항목 제거 (링 버퍼)
+                slot = (self._get_meta("next_slot") or 0) % self.capacity
+                self._set_meta("next_slot", slot + 1)
+                self._db.execute("DELETE FROM slots WHERE slot = ?", (slot,))
+                self._db.execute("INSERT INTO slots (query, slot) VALUES (?, ?)", (query, slot))
+
+            self._vectors[slot] = vector
+            self._db.commit()
+
+    def __len__(self) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM slots").fetchone()[0]
+
+    def flush(self):
+        if self._vectors is not None:
+            self._vectors.flush()
+
+
+class QueryEmbeddingCache:
+    """쿼리 임베딩 캐시 (바이트 예산 LRU + 선택적 memmap 디스크 저장)"""
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, disk_path: Optional[str] = None, disk_capacity: int = 50000):
+        """
+        Args:
+            max_bytes: 메모리 캐시 바이트 예산 (벡터 + 쿼리 문자열)
+            disk_path: 디스크 저장 디렉토리 (None 또는 빈 문자열이면 사용 안 함)
+            disk_capacity: 디스크에 저장할 최대 벡터 수
+        """
+        self.max_bytes = max(0, max_bytes)
+
+        self._items = OrderedDict()     # query -> float32 vector
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._disk = None
+        if disk_path:
+            try:
+                self._disk = _MemmapVectorStore(disk_path, disk_capacity)
+                logger.info(f"쿼리 임베딩 디스크 캐시 사용: {disk_path}")
+            except Exception as e:
+                logger.error(f"쿼리 임베딩 디스크 캐시 초기화 실패 - 메모리 캐시만 사용: {e}")
+
+    @staticmethod
+    def _entry_size(query: str, vector: np.ndarray) -> int:
+        return vector.nbytes + len(query.encode("utf-8"))
+
+    def get(self, query: str) -> Optional[np.ndarray]:
+        with self._lock:
+            vector = self._items.get(query)
+            if vector is not None:
+                self._items.move_to_end(query)
+                self.hits += 1
+                return vector
+
+        if self._disk is not None:
+            vector = self._disk.get(query)
+            if vector is not None:
+                self.disk_hits += 1
+                self._put_memory(query, vector)
+                return vector
+
+        self.misses += 1
+        return None
+
+    def set(self, query: str, vector):
+        vector = np.asarray(vector, dtype=np.float32)
+        self._put_memory(query, vector)
+
+        if self._disk is not None:
+            try:
+                self._disk.set(query, vector)
+            except Exception as e:
+                logger.error(f"쿼리 임베딩 디스크 저장 오류: {e}")
+
+    def _put_memory(self, query: str, vector: np.ndarray):
+        size = self._entry_size(query, vector)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            previous = self._items.pop(query, None)
+            if previous is not None:
+                self._bytes -= self._entry_size(query, previous)
+
+            self._items[query] = vector
+            self._bytes += size
+
+            while self._bytes > self.max_bytes:
+                old_query, old_vector = self._items.popitem(last=False)
+                self._bytes -= self._entry_size(old_query, old_vector)
+                self.evictions += 1
+
+    def stats(self) -> dict:
+        total = self.hits + self.disk_hits + self.misses
+
+        return {
+            "entries": len(self._items),
+            "memory_bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": round((self.hits + self.disk_hits) / total, 4) if total else 0.0,
+            "disk_entries": len(self._disk) if self._disk is not None else 0,
+        }
+
+    def close(self):
+        if self._disk is not None:
+            self._disk.flush()
@@ -0,0 +1,157 @@
+"""
+임베딩 추론 실행기
+동시에 들어온 쿼리를 짧은 시간 동안 모아 한 번의 encode(batch) 로 처리합니다.
+CPU 연산은 스레드 풀에서 실행되므로 이벤트 루프를 막지 않습니다.
+(모델 가중치를 프로세스 간에 복제하지 않도록 프로세스 풀 대신 스레드 풀 사용, torch 연산 중에는 GIL 이 해제됨)
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional
+
+from src.logger.custom_logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class BatchedEmbeddingExecutor:
+    """마이크로 배칭 임베딩 실행기"""
+
+    def __init__(
+        self,
+        encode_fn: Callable[[List[str]], list],
+        max_batch_size: int = 16,
+        max_wait_ms: float = 10,
+        workers: int = 1
+    ):
+        """
+        Args:
+            encode_fn: 문장 리스트를 받아 벡터 리스트를 반환하는 함수 (예: SentenceTransformer.encode)
+            max_batch_size: 한 번에 인코딩할 최대 쿼리 수
+            max_wait_ms: 첫 쿼리 도착 후 배치를 채우기 위해 기다리는 최대 시간
+            workers: 동시에 실행할 배치 수 (스레드 수)
+        """
+        self.encode_fn = encode_fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+        self.workers = max(1, workers)
+
+        self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="embedding")
+        self._queue: Optional[asyncio.Queue] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._inflight = set()
+
+        # 지표
+        self._batches = 0
+        self._items = 0
+        self._last_batch_size = 0
+        self._max_queue_depth = 0
+        self._errors = 0
+
+    def _ensure_started(self):
+        """이벤트 루프 안에서 처음 호출될 때 큐와 디스패처 생성"""
+        if self._dispatcher is not None and not self._dispatcher.done():
+            return
+
+        self._queue = asyncio.Queue()
+        self._slots = asyncio.Semaphore(self.workers)
+        self._dispatcher = asyncio.create_task(self._dispatch())
+
+    async def encode(self, text: str):
+        """
+        단일 쿼리 인코딩 (내부적으로 다른 요청과 함께 배치 처리)
+
+        Returns:
+            해당 쿼리의 임베딩 벡터
+        """
+        self._ensure_started()
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((text, future))
+        self._max_queue_depth = max(self._max_queue_depth, self._queue.qsize())
+
+        return await future
+
+    async def _dispatch(self):
+        loop = asyncio.get_running_loop()
+
+        while True:
+            # 실행 슬롯이 빌 때까지 대기하는 동안에도 큐에는 계속 쌓임
+            await self._slots.acquire()
+
+            try:
+                batch = [await self._queue.get()]
+                deadline = loop.time() + self.max_wait
+
+                while len(batch) < self.max_batch_size:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                    except asyncio.TimeoutError:
+                        break
+
+            except BaseException:
+                self._slots.release()
+                raise
+
+            task = asyncio.create_task(self._run_batch(batch))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+
+    async def _run_batch(self, batch: list):
+        texts = [text for text, _ in batch]
+
+        try:
+            vectors = await asyncio.get_running_loop().run_in_executor(self._pool, self.encode_fn, texts)
+
+            self._batches += 1
+            self._items += len(batch)
+            self._last_batch_size = len(batch)
+
+            for (_, future), vector in zip(batch, vectors):
+                if not future.done():
+                    future.set_result(vector)
+
+        except Exception as e:
+            self._errors += 1
+            logger.error(f"임베딩 배치 처리 중 오류 ({len(batch)}개): {e}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+
+        finally:
+            self._slots.release()
+
+    def get_metrics(self) -> dict:
+        """큐 길이, 배치 채움률 등 실행기 지표"""
+        avg_batch_size = self._items / self._batches if self._batches else 0.0
+
+        return {
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "max_queue_depth": self._max_queue_depth,
+            "inflight_batches": len(self._inflight),
+            "batches": self._batches,
+            "items": self._items,
+            "errors": self._errors,
+            "last_batch_size": self._last_batch_size,
+            "avg_batch_size": round(avg_batch_size, 2),
+            "avg_batch_fill": round(avg_batch_size / self.max_batch_size, 4),
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000,
+        }
+
+    async def close(self):
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+            try:
+                await self._dispatcher
+            except asyncio.CancelledError:
+                pass
+            self._dispatcher = None
+
+        if self._inflight:
+            await asyncio.gather(*self._inflight, return_exceptions=True)
+
+        self._pool.shutdown(wait=False)
@@ -0,0 +1,267 @@
+"""
+임베딩 모델 provider
+검색 서비스(쿼리)와 ChromaDB 로더(문서)가 같은 설정(service_config.json 의 embedding_model)으로 모델을 로드합니다.
+
+- tier: large / base / small (multilingual-e5 계열, model_name 을 지정하면 그 모델 사용)
+- backend: sentence_transformers (기본) / onnx (ONNX Runtime CPU 추론, onnx_int8 이면 dynamic int8 양자화)
+  onnx 변환본은 가중치를 external data 파일로 저장하므로 2GB 가 넘는 large tier 도 변환 / 양자화 가능
+
+모델 ID 는 컬렉션 메타데이터에 기록하고, 검색 서비스는 쿼리 모델과 다른 모델로 만든 컬렉션을 사용하지 않습니다.
+"""
+import os
+import shutil
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import List, Union
+
+import numpy as np
+
+from src.logger.custom_logger import get_logger
+from src.utils.config import get_service_config
+
+logger = get_logger(__name__)
+
+MODEL_TIERS = {
+    "large": "intfloat/multilingual-e5-large",     # 1024차원
+    "base": "intfloat/multilingual-e5-base",       # 768차원
+    "small": "intfloat/multilingual-e5-small",     # 384차원
+}
+
+# 모델 ID 가 기록되지 않은 기존 컬렉션 / 벡터의 모델
+LEGACY_MODEL_ID = MODEL_TIERS["large"]
+
+
+class EmbeddingProvider(ABC):
+    """임베딩 모델 인터페이스 (SentenceTransformer.encode 와 같은 형태로 호출)"""
+
+    backend = ""
+
+    def __init__(self, model_name: str):
+        self.model_name = model_name
+
+    @property
+    def model_id(self) -> str:
+        """벡터 공간 식별자 (같은 모델이면 backend 가 달라도 같은 공간이므로 모델명만 사용)"""
+        return self.model_name
+
+    @property
+    def variant_id(self) -> str:
+        """실제 추론 경로까지 포함한 식별자 (문서 임베딩 저장소 키)"""
+        return self.model_name
+
+    @abstractmethod
+    def encode(self, texts: Union[str, List[str]], batch_size: int = 32, normalize_embeddings: bool = True,
+               **kwargs) -> np.ndarray:
+        """
+        Returns:
+            str 이면 (dim,), 리스트면 (n, dim) float32 배열
+        """
+
+
+class SentenceTransformerProvider(EmbeddingProvider):
+    """sentence-transformers (PyTorch) 추론"""
+
+    backend = "sentence_transformers"
+
+    def __init__(self, model_name: str, threads: int = 0):
+        super().__init__(model_name)
+
+        import torch
+        from sentence_transformers import SentenceTransformer
+
+        if threads:
+            torch.set_num_threads(threads)
+        self.model = SentenceTransformer(model_name)
+
+    def encode(self, texts, batch_size: int = 32, normalize_embeddings: bool = True, **kwargs) -> np.ndarray:
+        return self.model.encode(
+            texts,
+            batch_size=batch_size,
+            normalize_embeddings=normalize_embeddings,
+            show_progress_bar=False
+        )
+
+
+class OnnxEmbeddingProvider(EmbeddingProvider):
+    """
+    ONNX Runtime CPU 추론 (mean pooling, e5 와 같은 방식)
+    최초 실행 시 모델을 ONNX 로 변환해 onnx_cache_dir 에 저장하고, onnx_int8 이면 dynamic int8 양자화본도 저장
+
+    가중치는 모델 파일과 분리해 {모델 파일}.data 에 저장 (external data)
+    protobuf 한 파일은 2GB 를 넘을 수 없어 e5-large fp32 (약 2.2GB) 는 한 파일로 저장 / 양자화할 수 없음
+    """
+
+    backend = "onnx"
+
+    MAX_LENGTH = 512
+
+    def __init__(self, model_name: str, cache_dir: str = "./models/onnx", quantize_int8: bool = False, threads: int = 0):
+        super().__init__(model_name)
+        self.quantize_int8 = quantize_int8
+
+        import onnxruntime as ort
+        from transformers import AutoTokenizer
+
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+        model_path = self._prepare_model(Path(cache_dir).joinpath(model_name.replace("/", "__")))
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads:
+            options.intra_op_num_threads = threads
+
+        self.session = ort.InferenceSession(str(model_path), options, providers=["CPUExecutionProvider"])
+        self._input_names = [model_input.name for model_input in self.session.get_inputs()]
+        logger.info(f"ONNX 모델 로드 완료: {model_path}")
+
+    @property
+    def variant_id(self) -> str:
+        return f"{self.model_name}@onnx{'-int8' if self.quantize_int8 else ''}"
+
+    def _prepare_model(self, directory: Path) -> Path:
+        directory.mkdir(parents=True, exist_ok=True)
+
+        fp32_path = directory.joinpath("model.onnx")
+        if not fp32_path.exists():
+            self._export_onnx(fp32_path)
+
+        if not self.quantize_int8:
+            return fp32_path
+
+        int8_path = directory.joinpath("model.int8.onnx")
+        if not int8_path.exists():
+            from onnxruntime.quantization import QuantType, quantize_dynamic
+
+            logger.info(f"ONNX int8 양자화 중: {int8_path}")
+            tmp_dir = self._make_tmp_dir(directory)
+            quantize_dynamic(
+                str(fp32_path), str(tmp_dir.joinpath(int8_path.name)),
+                weight_type=QuantType.QInt8, use_external_data_format=True
+            )
+            self._publish(tmp_dir, int8_path)
+        return int8_path
+
+    @staticmethod
+    def _make_tmp_dir(directory: Path, name: str = "tmp") -> Path:
+        tmp_dir = directory.joinpath(name)
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        tmp_dir.mkdir(parents=True)
+        return tmp_dir
+
+    @staticmethod
+    def _publish(tmp_dir: Path, path: Path):
+        """
+        임시 디렉토리의 모델 / 가중치 파일을 path 옆으로 이동
+        가중치 파일을 먼저 옮기고 모델 파일을 마지막에 교체 (모델 파일이 있으면 변환 완료로 판단)
+        external data 경로는 모델 파일 기준 상대 경로이므로 임시 디렉토리에서도 최종 파일명으로 저장
+        """
+        for data_path in tmp_dir.iterdir():
+            if data_path.name != path.name:
+                os.replace(data_path, path.with_name(data_path.name))
+        os.replace(tmp_dir.joinpath(path.name), path)
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    def _export_onnx(self, path: Path):
+        import onnx
+        import torch
+        from transformers import AutoModel
+
+        logger.info(f"ONNX 변환 중: {self.model_name} → {path}")
+        model = AutoModel.from_pretrained(self.model_name).eval()
+        dummy = self.tokenizer(["onnx export"], return_tensors="pt")
+
+        # 2GB 를 넘는 모델은 exporter 가 텐서마다 파일을 따로 쓰므로 별도 디렉토리에 export 한 뒤
+        # 가중치를 {모델 파일}.data 한 파일로 모아 다시 저장
+        export_dir = self._make_tmp_dir(path.parent, "export")
+        export_path = export_dir.joinpath(path.name)
+        with torch.no_grad():
+            torch.onnx.export(
+                model,
+                (dummy["input_ids"], dummy["attention_mask"]),
+                str(export_path),
+                input_names=["input_ids", "attention_mask"],
+                output_names=["last_hidden_state"],
+                dynamic_axes={
+                    "input_ids": {0: "batch", 1: "sequence"},
+                    "attention_mask": {0: "batch", 1: "sequence"},
+                    "last_hidden_state": {0: "batch", 1: "sequence"},
+                },
+                opset_version=14
+            )
+
+        tmp_dir = self._make_tmp_dir(path.parent)
+        onnx.save_model(
+            onnx.load(str(export_path)),
+            str(tmp_dir.joinpath(path.name)),
+            save_as_external_data=True,
+            all_tensors_to_one_file=True,
+            location=f"{path.name}.data"
+        )
+        shutil.rmtree(export_dir, ignore_errors=True)
+        self._publish(tmp_dir, path)
+
+    def encode(self, texts, batch_size: int = 32, normalize_embeddings: bool = True, **kwargs) -> np.ndarray:
+        single = isinstance(texts, str)
+        if single:
+            texts = [texts]
+
+        outputs = []
+        for start in range(0, len(texts), batch_size):
+            batch = self.tokenizer(
+                texts[start:start + batch_size],
+                padding=True,
+                truncation=True,
+                max_length=self.MAX_LENGTH,
+                return_tensors="np"
+            )
+            feeds = {name: batch[name].astype(np.int64) for name in self._input_names if name in batch}
+            hidden = self.session.run(None, feeds)[0]
+
+            # mean pooling (패딩 토큰 제외)
+            mask = batch["attention_mask"][..., None].astype(np.float32)
+            outputs.append((hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None))
+
+        embeddings = np.concatenate(outputs).astype(np.float32) if outputs else np.zeros((0, 0), np.float32)
+        if normalize_embeddings and embeddings.size:
+            embeddings /= np.clip(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12, None)
+
+        return embeddings[0] if single else embeddings
+
+
+def resolve_model_name(config: dict) -> str:
+    if config.get("model_name"):
+        return config["model_name"]
+
+    tier = config.get("tier", "large")
+    if tier not in MODEL_TIERS:
+        logger.warning(f"알 수 없는 embedding_model.tier '{tier}' - large 사용")
+        tier = "large"
+    return MODEL_TIERS[tier]
+
+
+def create_embedding_provider(config: dict = None, threads: int = None) -> EmbeddingProvider:
+    """
+    설정에 맞는 임베딩 provider 생성
+
+    Args:
+        config: service_config.json 의 embedding_model 섹션 (None 이면 설정 파일에서 읽음)
+        threads: 추론 스레드 수 (None 이면 설정값, 0 이면 라이브러리 기본값)
+    """
+    config = config if config is not None else get_service_config("embedding_model")
+    model_name = resolve_model_name(config)
+    backend = config.get("backend", "sentence_transformers")
+    threads = threads if threads is not None else config.get("threads", 0)
+
+    logger.info(f"임베딩 모델 로딩 중: {model_name} ({backend})")
+
+    if backend == "onnx":
+        return OnnxEmbeddingProvider(
+            model_name,
+            cache_dir=config.get("onnx_cache_dir", "./models/onnx"),
+            quantize_int8=config.get("onnx_int8", False),
+            threads=threads
+        )
+    if backend != "sentence_transformers":
+        logger.warning(f"알 수 없는 embedding_model.backend '{backend}' - sentence_transformers 사용")
+
+    return SentenceTransformerProvider(model_name, threads=threads)
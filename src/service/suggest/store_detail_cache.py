@@ -0,0 +1,97 @@
+"""
+매장 상세 정보 read-through 캐시
+update_category / delete_category 로 매장 정보가 바뀌거나 삭제되면 invalidate_store_detail 로 해당 항목을 제거합니다.
+(다른 프로세스에서 수정된 경우는 TTL 로 갱신)
+
+매장 카드 projection: 벡터 검색 결과만으로 추천 카드를 만들 수 있도록
+ChromaDB 메타데이터에 함께 저장하는 표시용 필드 (StoreChromaDBLoader denormalize 모드)
+검색 서비스는 MariaDB 를 조회하지 않고 projection 을 그대로 사용하므로, 크롤러가 매장을 저장 / 삭제할 때
+(refresh_store_index / delete_store_index) 와 증분 동기화 때 쓰는 쪽에서 projection 을 갱신합니다.
+"""
+from typing import Dict, Optional
+
+from src.utils.config import get_service_config
+from src.utils.ttl_cache import TTLCache
+
+_STORE_DETAIL_CACHE: Optional[TTLCache] = None
+
+
+def get_store_detail_cache() -> Optional[TTLCache]:
+    """설정에서 비활성화되어 있으면 None"""
+    global _STORE_DETAIL_CACHE
+
+    if _STORE_DETAIL_CACHE is None:
+        config = get_service_config("store_detail_cache")
+        if not config.get("enabled", True):
+            return None
+
+        _STORE_DETAIL_CACHE = TTLCache(
+            max_entries=config.get("max_entries", 5000),
+            ttl_s=config.get("ttl_s", 600)
+        )
+
+    return _STORE_DETAIL_CACHE
+
+
+def invalidate_store_detail(store_id: str):
+    if _STORE_DETAIL_CACHE is not None:
+        _STORE_DETAIL_CACHE.delete(store_id)
+
+
+def to_store_detail(store) -> Dict:
+    """CategoryEntity → 추천 카드용 dict"""
+    return {
+        'id': store.id,
+        'name': store.name,
+        'do': store.do,
+        'si': store.si,
+        'gu': store.gu,
+        'detail_address': store.detail_address,
+        'sub_category': store.sub_category,
+        'business_hour': store.business_hour,
+        'phone': store.phone,
+        'type': store.type,
+        'image': store.image,
+        'latitude': store.latitude,
+        'longitude': store.longitude,
+        'menu': store.menu
+    }
+
+
+#   projection 필드 구성이 바뀌면 올려서 이전 버전으로 적재된 row 를 stale 로 판단
+STORE_PROJECTION_VERSION = 1
+
+#   카드 필드 → 메타데이터 키 (ChromaDB 메타데이터는 None 을 허용하지 않아 "" 로 저장)
+_PROJECTION_FIELDS = [
+    'name', 'do', 'si', 'gu', 'detail_address', 'sub_category',
+    'business_hour', 'phone', 'image', 'latitude', 'longitude', 'menu'
+]
+
+
+def to_projection_metadata(store) -> Dict:
+    """CategoryEntity → ChromaDB 메타데이터에 추가할 표시용 필드"""
+    metadata = {
+        f"detail_{field}": (getattr(store, field) if getattr(store, field) is not None else "")
+        for field in _PROJECTION_FIELDS
+    }
+    metadata["detail_type"] = int(store.type)
+    metadata["projection_version"] = STORE_PROJECTION_VERSION
+
+    return metadata
+
+
+def from_projection_metadata(metadata: Dict) -> Optional[Dict]:
+    """
+    메타데이터 → 추천 카드 dict
+    projection 이 없거나 버전이 다르면(stale) None → MariaDB 에서 조회
+    """
+    if not metadata or metadata.get("projection_version") != STORE_PROJECTION_VERSION:
+        return None
+
+    detail = {'id': metadata.get("store_id")}
+    for field in _PROJECTION_FIELDS:
+        detail[field] = metadata.get(f"detail_{field}", "")
+    detail['type'] = metadata.get("detail_type")
+    detail['menu'] = detail['menu'] or None
+
+    return detail
@@ -1,14 +1,26 @@
 """
 ChromaDB 기반 매장 제안 서비스
 """
-from typing import List, Dict, Optional
+import os
+import re
+import time
+from typing import List, Dict, Optional, Set, Tuple
 
 import chromadb
 from chromadb.config import Settings
-from sentence_transformers import SentenceTransformer
 
+from src.infra.database.repository.category_repository import CategoryRepository
 from src.infra.external.query_enchantment import QueryEnhancementService
 from src.logger.custom_logger import get_logger
+from src.service.chromadb.collection_alias import alias_path, resolve_collection_name
+from src.service.chromadb.lexical_index import LexicalIndex, lexical_index_path
+from src.service.suggest.embedding_cache import QueryEmbeddingCache
+from src.service.suggest.embedding_executor import BatchedEmbeddingExecutor
+from src.service.suggest.embedding_provider import create_embedding_provider
+from src.service.suggest.store_detail_cache import get_store_detail_cache, to_store_detail, \
+    from_projection_metadata
+from src.service.suggest.vector_backend import ChromaVectorBackend, create_vector_backend
+from src.utils.config import get_service_config
 
 logger = get_logger(__name__)
 
@@ -32,21 +44,143 @@ class StoreSuggestService:
             )
         )
         
-        # 한국어 임베딩 모델 로드
+        # 한국어 임베딩 모델 로드 (service_config.json 의 embedding_model, 로더와 같은 설정)
         logger.info("한국어 임베딩 모델 로딩 중...")
-        self.embedding_model = SentenceTransformer("intfloat/multilingual-e5-large")
+        self.embedding_model = create_embedding_provider()
+        
+        # 임베딩 추론은 배치 실행기를 통해 이벤트 루프 밖에서 수행
+        self.embedding_executor = BatchedEmbeddingExecutor(
+            self.embedding_model.encode,
+            **get_service_config("embedding_executor")
+        )
+        
+        # 검색 쿼리 임베딩 캐시 (같은 문장은 다시 인코딩하지 않음)
+        # 디스크 캐시는 모델별 하위 디렉토리 사용 (모델을 바꾸면 이전 모델 벡터를 읽지 않도록)
+        cache_config = get_service_config("embedding_cache")
+        disk_path = cache_config.get("disk_path") or None
+        if disk_path:
+            disk_path = os.path.join(disk_path, re.sub(r"[^0-9A-Za-z._-]", "_", self.embedding_model.variant_id))
+        self.embedding_cache = QueryEmbeddingCache(
+            max_bytes=cache_config.get("max_bytes", 64 * 1024 * 1024),
+            disk_path=disk_path,
+            disk_capacity=cache_config.get("disk_capacity", 50000)
+        )
         
         # 쿼리 개선 서비스 초기화
         self.query_enhancer = QueryEnhancementService()
         
-        # 컬렉션 가져오기
+        # 매장 상세 조회용 Repository (요청마다 생성하지 않음)
+        self.category_repo = CategoryRepository()
+        
+        # 컬렉션 가져오기 (alias 가 가리키는 버전, 재적재 후 alias 가 바뀌면 자동 전환)
+        self.persist_directory = persist_directory
+        self.alias_check_interval_s = get_service_config("suggest").get("alias_check_interval_s", 5)
+        self._alias_checked_at = 0.0
+        self._alias_mtime = None
+        
+        # BM25 색인 (하이브리드 검색, 로더가 컬렉션별로 저장 / 없으면 벡터 검색만 사용)
+        self.hybrid_config = get_service_config("hybrid_search")
+        self.lexical_index = None
+        self._lexical_mtime = None
+        
+        # 벡터 검색 백엔드 (chroma / numpy, numpy 는 로더의 벡터 export 필요)
+        partition_config = get_service_config("partition_search")
+        self.vector_backend = create_vector_backend(
+            get_service_config("vector_backend"), self.client, persist_directory, partition_config
+        )
+        collection_name = resolve_collection_name(persist_directory)
+        try:
+            self._switch_collection(collection_name)
+        except Exception as e:
+            if isinstance(self.vector_backend, ChromaVectorBackend):
+                logger.error(f"매장 컬렉션을 찾을 수 없습니다: {e}")
+                raise
+            
+            logger.error(f"{self.vector_backend.name} 백엔드 로드 실패 - chroma 백엔드 사용: {e}")
+            self.vector_backend = ChromaVectorBackend(self.client, persist_directory, partition_config)
+            self._switch_collection(collection_name)
+    
+    def _switch_collection(self, name: str):
+        # 쿼리 모델과 다른 모델로 만든 컬렉션이면 예외 (전환하지 않음)
+        self.vector_backend.switch(name, embedding_model=self.embedding_model.model_id)
+        self._alias_mtime = self._read_alias_mtime()
+        logger.info(f"매장 컬렉션 '{name}' 로드 완료 ({self.vector_backend.name}): {self.vector_backend.count()}개 매장")
+        self._load_lexical_index()
+    
+    def _lexical_path(self):
+        return lexical_index_path(self.persist_directory, self.vector_backend.collection_name)
+    
+    def _read_lexical_mtime(self) -> Optional[float]:
+        try:
+            return os.stat(self._lexical_path()).st_mtime
+        except FileNotFoundError:
+            return None
+    
+    def _load_lexical_index(self):
+        if not self.hybrid_config.get("enabled", True):
+            return
+        
+        self._lexical_mtime = self._read_lexical_mtime()
         try:
-            self.store_collection = self.client.get_collection(name="stores")
-            logger.info(f"매장 컬렉션 로드 완료: {self.store_collection.count()}개 매장")
+            self.lexical_index = LexicalIndex.load(self._lexical_path())
         except Exception as e:
-            logger.error(f"매장 컬렉션을 찾을 수 없습니다: {e}")
-            raise
+            logger.error(f"BM25 색인 로드 실패 - 벡터 검색만 사용: {e}")
+            self.lexical_index = None
+        
+        if self.lexical_index is None:
+            logger.warning(f"'{self.vector_backend.collection_name}' BM25 색인 없음 - 벡터 검색만 사용")
+        else:
+            logger.info(f"BM25 색인 로드 완료: {len(self.lexical_index)}개 문서")
     
+    def _read_alias_mtime(self) -> Optional[float]:
+        try:
+            return os.stat(alias_path(self.persist_directory)).st_mtime
+        except FileNotFoundError:
+            return None
+    
+    def refresh_collection(self):
+        """
+        alias 파일이 바뀌었으면 새 버전 컬렉션으로 전환 (alias_check_interval_s 마다 확인)
+        전환에 실패하면 기존 컬렉션을 계속 사용
+        BM25 색인 / 파티션 manifest / 벡터 export 가 바뀌었으면 (증분 동기화) 해당 파일만 다시 로드
+        """
+        now = time.monotonic()
+        if now - self._alias_checked_at < self.alias_check_interval_s:
+            return
+        self._alias_checked_at = now
+        
+        if self.hybrid_config.get("enabled", True) and self._read_lexical_mtime() != self._lexical_mtime:
+            self._load_lexical_index()
+        
+        self.vector_backend.refresh()
+        
+        if self._read_alias_mtime() == self._alias_mtime:
+            return
+        
+        name = resolve_collection_name(self.persist_directory)
+        if name == self.vector_backend.collection_name:
+            self._alias_mtime = self._read_alias_mtime()
+            return
+        
+        try:
+            self._switch_collection(name)
+        except Exception as e:
+            logger.error(f"컬렉션 '{name}' 전환 실패 - 기존 컬렉션 유지: {e}")
+    
+    def warm_up(self):
+        """
+        첫 요청 지연을 없애기 위해 더미 문장으로 모델을 한 번 실행
+        """
+        logger.info("임베딩 모델 워밍업 중...")
+        self.embedding_model.encode("warm up")
+        logger.info("임베딩 모델 워밍업 완료")
+
+    async def close(self):
+        """lifespan 종료 시 실행기 / HTTP 세션 정리"""
+        await self.embedding_executor.close()
+        await self.query_enhancer.close()
+        self.embedding_cache.close()
+
     @staticmethod
     def convert_type_to_code(type_korean: str) -> str:
         """
@@ -76,7 +210,7 @@ class StoreSuggestService:
         min_similarity_threshold: float = 0.75
     ) -> List[Dict]:
         """
-        매장 제안 (메타데이터 필터링 → 유사도 검색)
+        매장 제안 (메타데이터 필터링 → 유사도 검색, BM25 색인이 있으면 RRF 로 결합)
         
         Args:
             personnel: 인원 수 (1, 2, 3, 4, 5+)
@@ -115,70 +249,71 @@ class StoreSuggestService:
         
         logger.info(f"최종 검색 쿼리: {search_query}")
         
-        # ===== 메타데이터 필터 조건 구성 (ChromaDB 문법) =====
-        where_filter = None
-        filter_conditions = []
-        
-        # 지역 필터
+        # ===== 메타데이터 필터 조건 (구, 타입 코드) =====
         if region:
-            filter_conditions.append({"region": region})
             logger.info(f"지역 필터 적용: {region}")
         
-        # 타입 필터
-        if category_type:
-            type_code = self.convert_type_to_code(category_type)
-            if type_code:
-                filter_conditions.append({"type_code": type_code})
-                logger.info(f"타입 필터 적용: {category_type} (코드: {type_code})")
-        
-        # 필터 조건이 있으면 $and로 결합
-        if len(filter_conditions) > 1:
-            where_filter = {"$and": filter_conditions}
-        elif len(filter_conditions) == 1:
-            where_filter = filter_conditions[0]
+        type_code = self.convert_type_to_code(category_type) if category_type else ""
+        if type_code:
+            logger.info(f"타입 필터 적용: {category_type} (코드: {type_code})")
         
-        logger.info(f"최종 where 필터: {where_filter}")
+        # 쿼리 임베딩 (캐시 → 배치 실행기 순서로 조회)
+        query_embedding = self.embedding_cache.get(search_query)
+        if query_embedding is None:
+            query_embedding = await self.embedding_executor.encode(search_query)
+            self.embedding_cache.set(search_query, query_embedding)
         
-        # 쿼리 임베딩
-        query_embedding = self.embedding_model.encode(search_query)
-        
-        # ===== ChromaDB 검색 (메타데이터 필터 + 유사도 검색) =====
+        # ===== 벡터 검색 (메타데이터 필터 + 유사도 검색) =====
+        self.refresh_collection()
+        lexical_index = self.lexical_index
+        lexical_ids = set()
         try:
-            search_n_results = n_results * 3  # 🔥 3배 더 가져오기
-    
-            results = self.store_collection.query(
-                query_embeddings=[query_embedding.tolist()],
-                n_results=search_n_results,  # 🔥 변경
-                where=where_filter,
-                include=["metadatas", "documents", "distances"]
+            # BM25 색인이 있으면 BM25 후보로 재현율을 보완하므로 벡터 후보는 적게 가져옴
+            fetch_factor = self.hybrid_config.get("vector_fetch_factor", 2) if lexical_index is not None else 3
+            search_n_results = n_results * fetch_factor
+            
+            results = self.vector_backend.query(
+                query_embedding,
+                n_results=search_n_results,
+                region=region,
+                type_code=type_code
             )
             
-            logger.info(f"ChromaDB 검색 결과: {len(results['ids'][0])}개")
+            logger.info(f"벡터 검색 결과 ({self.vector_backend.name}): {len(results['ids'])}개")
+            
+            # BM25 후보와 RRF 로 결합 (원본 키워드에 메뉴명이 그대로 들어 있으므로 함께 검색)
+            if lexical_index is not None:
+                results, lexical_ids = self._fuse_lexical(
+                    results, lexical_index, query_embedding, f"{user_keyword} {search_query}",
+                    n_results, region, type_code
+                )
+                logger.info(f"하이브리드 결합 후: {len(results['ids'])}개 (BM25 후보 {len(lexical_ids)}개)")
             
             # 디버그: 처음 3개 결과의 메타데이터 출력
-            for i in range(min(3, len(results['ids'][0]))):
-                logger.debug(f"결과 {i+1} 메타데이터: {results['metadatas'][0][i]}")
+            for i in range(min(3, len(results['ids']))):
+                logger.debug(f"결과 {i+1} 메타데이터: {results['metadatas'][i]}")
             
         except Exception as e:
-            logger.error(f"ChromaDB 검색 중 오류: {e}")
+            logger.error(f"벡터 검색 중 오류: {e}")
             import traceback
             logger.error(traceback.format_exc())
             return []
         
         # 결과가 없으면 빈 리스트 반환
-        if not results['ids'][0]:
+        if not results['ids']:
             logger.warning("검색 결과가 없습니다.")
             return []
         
         # 결과 포맷팅
         suggestions = []
+        suggestion_ids = []
         
-        for i in range(len(results['ids'][0])):
+        for i in range(len(results['ids'])):
             try:
-                metadata = results['metadatas'][0][i]
-                document = results['documents'][0][i]
-                distance = results['distances'][0][i]
-                store_id = results['ids'][0][i]
+                metadata = results['metadatas'][i]
+                document = results['documents'][i]
+                distance = results['distances'][i]
+                store_id = results['ids'][i]
                 
                 # 유사도 점수 계산 (거리를 점수로 변환)
                 similarity_score = max(0, 1 - distance)
@@ -191,20 +326,25 @@ class StoreSuggestService:
                     'similarity_score': round(similarity_score, 4),
                     'distance': round(distance, 4),
                     'document': document,                          # 태그 + 메뉴
-                    'search_query': search_query
+                    'search_query': search_query,
+                    'detail': from_projection_metadata(metadata)   # 카드 projection (없거나 stale 이면 None)
                 }
                 
                 suggestions.append(suggestion)
+                suggestion_ids.append(store_id)
                 
             except Exception as e:
                 logger.error(f"결과 {i+1} 처리 중 오류: {e}")
-                logger.error(f"메타데이터: {results['metadatas'][0][i]}")
+                logger.error(f"메타데이터: {results['metadatas'][i]}")
                 continue
         
         # 🔥 유사도 임계값 필터링 추가
+        # BM25 로 매칭된 매장은 완화된 임계값(lexical_min_similarity) 적용
+        lexical_threshold = min(min_similarity_threshold, self.hybrid_config.get("lexical_min_similarity", 0.5))
         filtered_suggestions = [
-            sug for sug in suggestions 
+            sug for sug, store_id in zip(suggestions, suggestion_ids)
             if sug['similarity_score'] >= min_similarity_threshold
+            or (store_id in lexical_ids and sug['similarity_score'] >= lexical_threshold)
         ]
         
         # 🔥 상위 n_results개만 반환
@@ -215,9 +355,91 @@ class StoreSuggestService:
         
         return final_suggestions
     
+    def _fuse_lexical(
+        self,
+        results: dict,
+        lexical_index: LexicalIndex,
+        query_embedding,
+        lexical_query: str,
+        n_results: int,
+        region: Optional[str],
+        type_code: str
+    ) -> Tuple[dict, Set[str]]:
+        """
+        벡터 검색 결과와 BM25 결과를 Reciprocal Rank Fusion 으로 결합
+        
+        score(d) = Σ 1 / (rrf_k + rank(d))
+        BM25 에만 있는 매장은 벡터 백엔드에서 쿼리와의 거리를 직접 계산
+        
+        Returns:
+            (query 결과와 같은 형태의 결합 결과 (RRF 점수 순), BM25 로 매칭된 매장 ID 집합)
+        """
+        rrf_k = self.hybrid_config.get("rrf_k", 60)
+        lexical_top_k = n_results * self.hybrid_config.get("lexical_fetch_factor", 2)
+        
+        lexical_hits = lexical_index.search(lexical_query, top_k=lexical_top_k, region=region, type_code=type_code)
+        lexical_ids = {store_id for store_id, _ in lexical_hits}
+        
+        rows = {}
+        scores = {}
+        for rank, store_id in enumerate(results['ids']):
+            rows[store_id] = (results['metadatas'][rank], results['documents'][rank], results['distances'][rank])
+            scores[store_id] = 1 / (rrf_k + rank + 1)
+        
+        for rank, (store_id, _) in enumerate(lexical_hits):
+            scores[store_id] = scores.get(store_id, 0.0) + 1 / (rrf_k + rank + 1)
+        
+        missing_ids = [store_id for store_id, _ in lexical_hits if store_id not in rows]
+        if missing_ids:
+            fetched = self.vector_backend.fetch(missing_ids, query_embedding)
+            for store_id, metadata, document, distance in zip(
+                fetched['ids'], fetched['metadatas'], fetched['documents'], fetched['distances']
+            ):
+                rows[store_id] = (metadata, document, distance)
+        
+        ordered = sorted(rows, key=lambda store_id: scores[store_id], reverse=True)
+        fused = {
+            'ids': ordered,
+            'metadatas': [rows[store_id][0] for store_id in ordered],
+            'documents': [rows[store_id][1] for store_id in ordered],
+            'distances': [rows[store_id][2] for store_id in ordered],
+        }
+        return fused, lexical_ids
+    
+    async def get_store_cards(self, suggestions: List[Dict]) -> List[Dict]:
+        """
+        제안 결과로 추천 카드 구성
+        메타데이터 projection 이 있는 매장은 그대로 사용하고, 없거나 stale 인 매장만 MariaDB 에서 조회
+        (projection 최신 여부는 확인하지 않음 - 크롤러 저장 / 삭제와 증분 동기화 때 쓰는 쪽에서 갱신)
+        
+        Args:
+            suggestions: suggest_stores 결과
+            
+        Returns:
+            List[Dict]: 매장 상세 정보 (유사도 순서)
+        """
+        missing_ids = [
+            sug['store_id'] for sug in suggestions
+            if sug.get('store_id') and sug.get('detail') is None
+        ]
+        
+        fetched = {}
+        if missing_ids:
+            logger.info(f"projection 없는 매장 {len(missing_ids)}개 DB 조회")
+            fetched = {store['id']: store for store in await self.get_store_details(missing_ids)}
+        
+        cards = []
+        for sug in suggestions:
+            card = sug.get('detail') or fetched.get(sug.get('store_id'))
+            if card is not None:
+                cards.append(dict(card))
+        
+        return cards
+    
     async def get_store_details(self, store_ids: List[str]) -> List[Dict]:
         """
         매장 ID 목록으로 상세 정보 조회
+        캐시에 없는 매장만 IN 조회 한 번으로 가져오고, 입력(유사도) 순서를 유지
         
         Args:
             store_ids: 매장 ID 리스트
@@ -225,35 +447,29 @@ class StoreSuggestService:
         Returns:
             List[Dict]: 매장 상세 정보
         """
-        from src.infra.database.repository.category_repository import CategoryRepository
+        cache = get_store_detail_cache()
+        details = {}
+        
+        if cache is not None:
+            for store_id in store_ids:
+                cached = cache.get(store_id)
+                if cached is not None:
+                    details[store_id] = cached
         
-        category_repo = CategoryRepository()
-        store_details = []
+        missing_ids = list(dict.fromkeys(i for i in store_ids if i not in details))
         
-        for store_id in store_ids:
+        if missing_ids:
             try:
-                stores = await category_repo.select(id=store_id)
-                if stores and len(stores) > 0:
-                    store = stores[0]
-                    store_dict = {
-                        'id': store.id,
-                        'name': store.name,
-                        'do': store.do,
-                        'si': store.si,
-                        'gu': store.gu,
-                        'detail_address': store.detail_address,
-                        'sub_category': store.sub_category,
-                        'business_hour': store.business_hour,
-                        'phone': store.phone,
-                        'type': store.type,
-                        'image': store.image,
-                        'latitude': store.latitude,
-                        'longitude': store.longitude,
-                        'menu': store.menu
-                    }
-                    store_details.append(store_dict)
+                stores = await self.category_repo.select(id=missing_ids)
             except Exception as e:
-                logger.error(f"매장 ID '{store_id}' 조회 중 오류: {e}")
-                continue
+                logger.error(f"매장 ID {missing_ids} 조회 중 오류: {e}")
+                stores = []
+            
+            for store in stores:
+                store_dict = to_store_detail(store)
+                details[store.id] = store_dict
+                if cache is not None:
+                    cache.set(store.id, store_dict)
         
-        return store_details
\ No newline at end of file
+        # 유사도 순서 유지 (DB 에 없는 ID 는 제외)
+        return [dict(details[store_id]) for store_id in store_ids if store_id in details]
@@ -0,0 +1,90 @@
+"""
+StoreSuggestService 프로세스 단위 싱글톤
+임베딩 모델과 ChromaDB 클라이언트를 한 번만 로드하고 lifespan 에서 관리합니다.
+"""
+import asyncio
+import time
+
+from src.logger.custom_logger import get_logger
+
+logger = get_logger(__name__)
+
+_SERVICE = None
+_SERVICE_LOCK = asyncio.Lock()
+_STATUS = {
+    "status": "not_loaded",     #   not_loaded, loading, ready, failed
+    "error": None,
+    "load_seconds": None,
+}
+
+
+def _build_service():
+    """모델 로드 + 워밍업 (블로킹 작업이므로 스레드에서 실행)"""
+    from src.service.suggest.store_suggest_service import StoreSuggestService
+
+    service = StoreSuggestService()
+    service.warm_up()
+    return service
+
+
+async def init_suggest_service():
+    """
+    서비스 로드 (이미 로드되어 있으면 그대로 반환)
+    lifespan 시작 시 백그라운드로 호출하고, 요청이 먼저 들어오면 로드 완료까지 대기
+    """
+    global _SERVICE
+
+    if _SERVICE is not None:
+        return _SERVICE
+
+    async with _SERVICE_LOCK:
+        if _SERVICE is not None:
+            return _SERVICE
+
+        _STATUS["status"] = "loading"
+        _STATUS["error"] = None
+        start = time.perf_counter()
+
+        try:
+            _SERVICE = await asyncio.to_thread(_build_service)
+
+        except Exception as e:
+            _STATUS["status"] = "failed"
+            _STATUS["error"] = str(e)
+            logger.error(f"매장 제안 서비스 로드 실패: {e}")
+            raise
+
+        _STATUS["status"] = "ready"
+        _STATUS["load_seconds"] = round(time.perf_counter() - start, 2)
+        logger.info(f"매장 제안 서비스 로드 완료 ({_STATUS['load_seconds']}초)")
+
+        return _SERVICE
+
+
+async def get_suggest_service():
+    return await init_suggest_service()
+
+
+async def close_suggest_service():
+    global _SERVICE
+
+    async with _SERVICE_LOCK:
+        if _SERVICE is not None:
+            await _SERVICE.close()
+
+        _SERVICE = None
+        _STATUS["status"] = "not_loaded"
+        _STATUS["load_seconds"] = None
+
+
+def get_loaded_suggest_service():
+    """로드가 끝난 서비스 (모니터링용, 로드 중이면 None)"""
+    return _SERVICE
+
+
+def is_suggest_service_ready() -> bool:
+    return _STATUS["status"] == "ready"
+
+
+def get_suggest_status() -> dict:
+    return dict(_STATUS)
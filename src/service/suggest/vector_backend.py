@@ -0,0 +1,405 @@
+"""
+매장 벡터 검색 백엔드
+StoreSuggestService 는 이 인터페이스로만 벡터 검색을 하고, 실제 구현은 설정(vector_backend.type)으로 선택합니다.
+
+- chroma: ChromaDB HNSW 검색 (+ (구, 타입) 파티션 라우팅)
+- numpy: 로더가 export 한 행렬을 memmap 으로 열어 전수 검색 (행렬 × 벡터 + 구/타입 마스크)
+
+거리는 두 백엔드 모두 ChromaDB 기본 공간(l2, 정규화 벡터의 제곱 거리 = 2 - 2cos) 기준으로 반환해
+기존 유사도 임계값(1 - distance)을 그대로 사용합니다.
+"""
+import os
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from src.logger.custom_logger import get_logger
+from src.service.chromadb.partitions import partition_key, manifest_path, read_manifest
+from src.service.chromadb.vector_export import export_paths, read_vector_export
+from src.service.suggest.embedding_provider import LEGACY_MODEL_ID
+
+logger = get_logger(__name__)
+
+
+def _normalize(vector) -> np.ndarray:
+    vector = np.asarray(vector, dtype=np.float32)
+    return vector / (np.linalg.norm(vector) or 1.0)
+
+
+def _check_model(collection_name: str, collection_model: str, embedding_model: Optional[str]):
+    """쿼리 모델과 컬렉션(문서) 모델이 다르면 검색 결과가 의미 없으므로 전환 거부"""
+    if embedding_model and collection_model != embedding_model:
+        raise ValueError(
+            f"컬렉션 '{collection_name}' 임베딩 모델({collection_model})이 쿼리 모델({embedding_model})과 다릅니다."
+        )
+
+
+def _file_mtime(path) -> Optional[float]:
+    try:
+        return os.stat(path).st_mtime
+    except FileNotFoundError:
+        return None
+
+
+class VectorBackend(ABC):
+    """
+    벡터 검색 백엔드 인터페이스
+
+    query / fetch 결과는 같은 형태의 dict:
+        {"ids": [...], "metadatas": [...], "documents": [...], "distances": [...]}
+    """
+
+    name = ""
+
+    def __init__(self, persist_directory: str):
+        self.persist_directory = persist_directory
+        self.collection_name = None
+        self.embedding_model = None
+
+    @abstractmethod
+    def switch(self, collection_name: str, embedding_model: Optional[str] = None):
+        """
+        alias 가 가리키는 컬렉션으로 전환 (실패하면 예외, 기존 상태 유지)
+
+        Args:
+            embedding_model: 쿼리 임베딩 모델 ID (지정하면 컬렉션 모델과 다를 때 전환 거부)
+        """
+
+    def refresh(self):
+        """컬렉션에 딸린 파일(파티션 manifest, 벡터 export)이 바뀌었으면 다시 로드"""
+
+    @abstractmethod
+    def count(self) -> int:
+        """검색 대상 벡터 수"""
+
+    @abstractmethod
+    def query(self, query_embedding, n_results: int, region: Optional[str] = None,
+              type_code: Optional[str] = None) -> Dict[str, list]:
+        """유사도 검색 (거리 오름차순)"""
+
+    @abstractmethod
+    def fetch(self, ids: List[str], query_embedding) -> Dict[str, list]:
+        """지정한 매장의 메타데이터 / 문서와 쿼리와의 거리 (BM25 로만 찾은 후보용)"""
+
+    def stats(self) -> dict:
+        return {
+            "backend": self.name,
+            "collection": self.collection_name,
+            "embedding_model": self.embedding_model,
+            "count": self.count(),
+        }
+
+
+class ChromaVectorBackend(VectorBackend):
+    """ChromaDB 검색 (구/타입이 모두 지정되고 파티션이 충분히 크면 파티션 컬렉션 검색)"""
+
+    name = "chroma"
+
+    def __init__(self, client, persist_directory: str, partition_config: dict):
+        super().__init__(persist_directory)
+        self.client = client
+        self.partition_config = partition_config
+        self.store_collection = None
+        self.partition_manifest = None
+        self._partition_collections = {}
+        self._manifest_mtime = None
+
+    def switch(self, collection_name: str, embedding_model: Optional[str] = None):
+        collection = self.client.get_collection(name=collection_name)
+        collection_model = (collection.metadata or {}).get("embedding_model", LEGACY_MODEL_ID)
+        _check_model(collection_name, collection_model, embedding_model)
+
+        self.store_collection = collection
+        self.collection_name = collection_name
+        self.embedding_model = collection_model
+        self._load_partition_manifest()
+
+    def _manifest_path(self):
+        return manifest_path(self.persist_directory, self.collection_name)
+
+    def _load_partition_manifest(self):
+        self._partition_collections = {}
+        self.partition_manifest = None
+        if not self.partition_config.get("enabled", True):
+            return
+
+        self._manifest_mtime = _file_mtime(self._manifest_path())
+        try:
+            self.partition_manifest = read_manifest(self._manifest_path())
+        except Exception as e:
+            logger.error(f"파티션 manifest 로드 실패 - 전체 컬렉션만 사용: {e}")
+
+        if self.partition_manifest is not None:
+            logger.info(f"파티션 manifest 로드 완료: {len(self.partition_manifest)}개 파티션")
+
+    def refresh(self):
+        if self.partition_config.get("enabled", True) and _file_mtime(self._manifest_path()) != self._manifest_mtime:
+            self._load_partition_manifest()
+
+    def count(self) -> int:
+        return self.store_collection.count()
+
+    def _route_partition(self, region: Optional[str], type_code: Optional[str], where_filter: Optional[dict]):
+        """
+        (구, 타입) 이 모두 지정되고 파티션이 충분히 크면 파티션 컬렉션을 필터 없이 조회
+        그 외(파티션 없음 / min_partition_size 미만)에는 전체 컬렉션 + where 필터
+
+        Returns:
+            (조회할 컬렉션, where 필터)
+        """
+        if not (region and type_code) or not self.partition_manifest:
+            return self.store_collection, where_filter
+
+        entry = self.partition_manifest.get(partition_key(region, type_code))
+        if entry is None or entry["count"] < self.partition_config.get("min_partition_size", 30):
+            return self.store_collection, where_filter
+
+        name = entry["collection"]
+        collection = self._partition_collections.get(name)
+        if collection is None:
+            try:
+                collection = self.client.get_collection(name=name)
+            except Exception as e:
+                logger.error(f"파티션 컬렉션 '{name}' 조회 실패 - 전체 컬렉션 사용: {e}")
+                return self.store_collection, where_filter
+            self._partition_collections[name] = collection
+
+        return collection, None
+
+    @staticmethod
+    def _build_where(region: Optional[str], type_code: Optional[str]) -> Optional[dict]:
+        filter_conditions = []
+        if region:
+            filter_conditions.append({"region": region})
+        if type_code:
+            filter_conditions.append({"type_code": type_code})
+
+        # 필터 조건이 있으면 $and로 결합
+        if len(filter_conditions) > 1:
+            return {"$and": filter_conditions}
+        if len(filter_conditions) == 1:
+            return filter_conditions[0]
+        return None
+
+    def query(self, query_embedding, n_results: int, region: Optional[str] = None,
+              type_code: Optional[str] = None) -> Dict[str, list]:
+        where_filter = self._build_where(region, type_code)
+        logger.debug(f"최종 where 필터: {where_filter}")
+
+        # 파티션이 있으면 where 필터 없이 해당 파티션만 검색
+        collection, collection_where = self._route_partition(region, type_code, where_filter)
+        if collection is not self.store_collection:
+            logger.debug(f"파티션 컬렉션 검색: {collection.name}")
+
+        query_embeddings = [np.asarray(query_embedding, dtype=np.float32).tolist()]
+        include = ["metadatas", "documents", "distances"]
+        try:
+            results = collection.query(
+                query_embeddings=query_embeddings, n_results=n_results, where=collection_where, include=include
+            )
+        except Exception as e:
+            if collection is self.store_collection:
+                raise
+            # 재적재 중 파티션이 삭제된 경우 등 → 전체 컬렉션으로 재시도
+            logger.error(f"파티션 검색 실패 - 전체 컬렉션으로 재시도: {e}")
+            self._partition_collections.pop(collection.name, None)
+            results = self.store_collection.query(
+                query_embeddings=query_embeddings, n_results=n_results, where=where_filter, include=include
+            )
+
+        return {key: results[key][0] for key in ("ids", "metadatas", "documents", "distances")}
+
+    def fetch(self, ids: List[str], query_embedding) -> Dict[str, list]:
+        fetched = self.store_collection.get(ids=ids, include=["metadatas", "documents", "embeddings"])
+        query_vector = _normalize(query_embedding)
+        cosine_space = (self.store_collection.metadata or {}).get("hnsw:space") == "cosine"
+
+        distances = []
+        for embedding in fetched["embeddings"]:
+            cosine = float(np.dot(query_vector, _normalize(embedding)))
+            # 컬렉션 거리 공간과 같은 기준 (기본 l2 는 정규화 벡터의 제곱 거리 = 2 - 2cos)
+            distances.append(1 - cosine if cosine_space else 2 - 2 * cosine)
+
+        return {
+            "ids": list(fetched["ids"]),
+            "metadatas": list(fetched["metadatas"]),
+            "documents": list(fetched["documents"]),
+            "distances": distances,
+        }
+
+    def stats(self) -> dict:
+        stats = super().stats()
+        stats["partitions"] = len(self.partition_manifest or {})
+        return stats
+
+
+class NumpyVectorBackend(VectorBackend):
+    """
+    로더가 export 한 행렬(chroma_db/vectors/{컬렉션명}.npy)로 전수 검색
+    수천 건 규모에서는 HNSW + SQLite 경로보다 빠르고 지연 시간이 일정하며 재현율 100%
+
+    양자화 export(float16 / int8)는 양자화 행렬로 후보(n_results × rerank_factor)를 고르고,
+    후보만 원본 float32 행렬(memmap)로 다시 계산해 정렬
+    """
+
+    name = "numpy"
+
+    BLOCK_ROWS = 4096       # 양자화 행렬을 float32 로 변환할 때 한 번에 처리할 행 수
+
+    def __init__(self, persist_directory: str, rerank_factor: int = 4):
+        super().__init__(persist_directory)
+        self.rerank_factor = max(1, rerank_factor)
+        self.matrix = None
+        self.full_matrix = None
+        self.quant_min = None
+        self.quant_step = None
+        self.ids = []
+        self.metadatas = []
+        self.documents = []
+        self.regions = None
+        self.type_codes = None
+        self._id_to_row = {}
+        self._export_mtime = None
+
+    def switch(self, collection_name: str, embedding_model: Optional[str] = None):
+        loaded = read_vector_export(self.persist_directory, collection_name)
+        if loaded is None:
+            raise FileNotFoundError(f"'{collection_name}' 벡터 export 없음 (chroma_loader.export_vectors 설정 후 재적재 필요)")
+
+        matrix, meta, full_matrix = loaded
+        collection_model = meta.get("embedding_model", LEGACY_MODEL_ID)
+        _check_model(collection_name, collection_model, embedding_model)
+
+        self.embedding_model = collection_model
+        quantization = meta.get("quantization")
+        self.matrix = matrix
+        self.full_matrix = full_matrix
+        self.quant_min = np.asarray(quantization["min"], dtype=np.float32) if quantization else None
+        self.quant_step = np.asarray(quantization["step"], dtype=np.float32) if quantization else None
+        self.ids = meta["ids"]
+        self.metadatas = meta["metadatas"]
+        self.documents = meta["documents"]
+        self.regions = np.array([m.get("region") for m in self.metadatas], dtype=object)
+        self.type_codes = np.array([m.get("type_code") for m in self.metadatas], dtype=object)
+        self._id_to_row = {store_id: row for row, store_id in enumerate(self.ids)}
+        self.collection_name = collection_name
+        self._export_mtime = _file_mtime(export_paths(self.persist_directory, collection_name)[1])
+
+        if meta["dtype"] != "float32" and full_matrix is None:
+            logger.warning("원본 float32 행렬 없음 - 양자화 행렬 점수로만 정렬")
+        logger.info(f"벡터 export 로드 완료: {len(self.ids)}개 ({meta['dtype']}, {matrix.shape[1] if matrix.ndim == 2 else 0}차원)")
+
+    def refresh(self):
+        if _file_mtime(export_paths(self.persist_directory, self.collection_name)[1]) == self._export_mtime:
+            return
+        try:
+            self.switch(self.collection_name, self.embedding_model)
+        except Exception as e:
+            logger.error(f"벡터 export 다시 로드 실패 - 기존 행렬 유지: {e}")
+
+    def count(self) -> int:
+        return len(self.ids)
+
+    def _approx_scores(self, query_vector: np.ndarray) -> np.ndarray:
+        """
+        저장된 행렬 기준 코사인 유사도 (export 행렬은 정규화되어 있음)
+        int8 은 x ≈ min + (code + 128) × step 이므로 q·x = (q × step)·code + q·(min + 128 × step)
+        """
+        if self.matrix.dtype == np.float32:
+            return self.matrix @ query_vector
+
+        weights = query_vector if self.quant_step is None else query_vector * self.quant_step
+        scores = np.empty(self.matrix.shape[0], dtype=np.float32)
+        for start in range(0, self.matrix.shape[0], self.BLOCK_ROWS):
+            block = np.asarray(self.matrix[start:start + self.BLOCK_ROWS], dtype=np.float32)
+            scores[start:start + self.BLOCK_ROWS] = block @ weights
+
+        if self.quant_step is not None:
+            scores += float(query_vector @ (self.quant_min + 128 * self.quant_step))
+        return scores
+
+    def _exact_scores(self, query_vector: np.ndarray, rows) -> np.ndarray:
+        """후보 행의 원본 정밀도 코사인 유사도"""
+        if self.full_matrix is not None:
+            return np.asarray(self.full_matrix[rows], dtype=np.float32) @ query_vector
+        if self.matrix.dtype == np.float32:
+            return self.matrix[rows] @ query_vector
+        return self._approx_scores(query_vector)[rows]
+
+    def _result(self, rows, cosines) -> Dict[str, list]:
+        return {
+            "ids": [self.ids[row] for row in rows],
+            "metadatas": [self.metadatas[row] for row in rows],
+            "documents": [self.documents[row] for row in rows],
+            "distances": [float(2 - 2 * cosine) for cosine in cosines],
+        }
+
+    def query(self, query_embedding, n_results: int, region: Optional[str] = None,
+              type_code: Optional[str] = None) -> Dict[str, list]:
+        if not self.ids:
+            return self._result([], [])
+
+        query_vector = _normalize(query_embedding)
+        scores = self._approx_scores(query_vector)
+
+        mask = None
+        if region:
+            mask = self.regions == region
+        if type_code:
+            type_mask = self.type_codes == type_code
+            mask = type_mask if mask is None else mask & type_mask
+        if mask is not None:
+            scores = np.where(mask, scores, -np.inf)
+            n_results = min(n_results, int(mask.sum()))
+
+        n_results = min(n_results, len(scores))
+        if n_results <= 0:
+            return self._result([], [])
+
+        # 양자화 행렬이면 후보를 넉넉히 고른 뒤 원본 정밀도로 재정렬
+        quantized = self.matrix.dtype != np.float32
+        n_candidates = min(len(scores), n_results * self.rerank_factor) if quantized else n_results
+        if mask is not None:
+            n_candidates = min(n_candidates, int(mask.sum()))
+
+        top = np.argpartition(-scores, n_candidates - 1)[:n_candidates]
+        if quantized:
+            top = np.sort(top)      # memmap 을 파일 순서대로 읽도록 정렬
+            top_scores = self._exact_scores(query_vector, top)
+        else:
+            top_scores = scores[top]
+
+        order = np.argsort(-top_scores)[:n_results]
+        return self._result(top[order].tolist(), top_scores[order])
+
+    def fetch(self, ids: List[str], query_embedding) -> Dict[str, list]:
+        rows = [self._id_to_row[store_id] for store_id in ids if store_id in self._id_to_row]
+        if not rows:
+            return self._result([], [])
+        return self._result(rows, self._exact_scores(_normalize(query_embedding), rows))
+
+    def stats(self) -> dict:
+        stats = super().stats()
+        if self.matrix is not None:
+            stats["dtype"] = str(self.matrix.dtype)
+            stats["matrix_bytes"] = int(self.matrix.nbytes)
+            stats["rerank"] = self.full_matrix is not None
+        return stats
+
+
+def create_vector_backend(config: dict, client, persist_directory: str, partition_config: dict) -> VectorBackend:
+    """
+    설정(vector_backend.type)에 맞는 백엔드 생성
+
+    Args:
+        config: service_config.json 의 vector_backend 섹션
+    """
+    backend_type = config.get("type", "chroma")
+
+    if backend_type == "numpy":
+        return NumpyVectorBackend(persist_directory, rerank_factor=config.get("rerank_factor", 4))
+    if backend_type != "chroma":
+        logger.warning(f"알 수 없는 vector_backend.type '{backend_type}' - chroma 사용")
+
+    return ChromaVectorBackend(client, persist_directory, partition_config)
@@ -0,0 +1,17 @@
+from functools import lru_cache
+from json import load
+
+from src.utils.path import path_dic
+
+
+@lru_cache(maxsize=None)
+def _load_service_config() -> dict:
+    with open(path_dic["service_config"], encoding="utf-8") as f:
+        return load(f)
+
+
+def get_service_config(section: str) -> dict:
+    """
+    service_config.json 의 섹션 조회 (없으면 빈 dict → 각 모듈 기본값 사용)
+    """
+    return dict(_load_service_config().get(section, {}))
@@ -0,0 +1,120 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    LRU + TTL 인메모리 캐시
+
+    cache = TTLCache(max_entries=1000, ttl_s=600)
+    cache.set(("카페", 2, "조용한 카페"), ["조용한", "아늑한"])
+    cache.get(("카페", 2, "조용한 카페"))   # 만료 전이면 값, 아니면 None
+    """
+
+    def __init__(self, max_entries: int = 1000, ttl_s: Optional[float] = None):
+        """
+        Args:
+            max_entries: 최대 항목 수 (초과 시 가장 오래 사용되지 않은 항목부터 제거)
+            ttl_s: 항목 유효 시간 (None 이면 만료 없음)
+        """
+        self.max_entries = max(1, max_entries)
+        self.ttl_s = ttl_s
+
+        self._items = OrderedDict()     # key -> (expires_at, value)
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            item = self._items.get(key, _MISSING)
+
+            if item is _MISSING:
+                self.misses += 1
+                return default
+
+            expires_at, value = item
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._items[key]
+                self.misses += 1
+                return default
+
+            self._items.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl_s: Optional[float] = None):
+        ttl_s = ttl_s if ttl_s is not None else self.ttl_s
+        expires_at = time.monotonic() + ttl_s if ttl_s is not None else None
+
+        with self._lock:
+            self._items[key] = (expires_at, value)
+            self._items.move_to_end(key)
+
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: Hashable) -> bool:
+        with self._lock:
+            return self._items.pop(key, _MISSING) is not _MISSING
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+    def purge_expired(self) -> int:
+        """만료된 항목 정리, 제거한 개수 반환"""
+        now = time.monotonic()
+
+        with self._lock:
+            expired = [
+                key for key, (expires_at, _) in self._items.items()
+                if expires_at is not None and expires_at <= now
+            ]
+            for key in expired:
+                del self._items[key]
+
+        return len(expired)
+
+    def values(self) -> list:
+        """만료되지 않은 값 목록 (LRU 순서를 바꾸지 않음)"""
+        now = time.monotonic()
+
+        with self._lock:
+            return [
+                value for expires_at, value in self._items.values()
+                if expires_at is None or expires_at > now
+            ]
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            item = self._items.get(key, _MISSING)
+
+        if item is _MISSING:
+            return False
+
+        expires_at, _ = item
+        return expires_at is None or expires_at > time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+
+        return {
+            "entries": len(self._items),
+            "max_entries": self.max_entries,
+            "ttl_s": self.ttl_s,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+        }
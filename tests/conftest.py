@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가 (src 패키지 import)
+sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -0,0 +1,53 @@
+"""
+BM25 색인 부분 갱신 테스트 (upsert / remove 결과가 전체 재생성과 같은지)
+"""
+from src.service.chromadb.lexical_index import LexicalIndex
+
+ENTRIES = [
+    ("a", "쑥라떼가 맛있는 조용한 카페", {"region": "강남구", "type_code": "1"}),
+    ("b", "에끌레어와 마카롱 디저트 카페", {"region": "마포구", "type_code": "1"}),
+    ("c", "숯불 고기 회식 장소", {"region": "강남구", "type_code": "0"}),
+]
+
+
+def snapshot(index: LexicalIndex) -> dict:
+    docs = {
+        store_id: (index.regions[doc_no], index.type_codes[doc_no], index.doc_lens[doc_no])
+        for doc_no, store_id in enumerate(index.ids)
+    }
+    postings = {
+        term: sorted((index.ids[doc_no], tf) for doc_no, tf in posting)
+        for term, posting in index.postings.items()
+    }
+    return {"docs": docs, "postings": postings, "avg_doc_len": index.avg_doc_len, "idf": index.idf}
+
+
+def test_remove_matches_rebuild():
+    index = LexicalIndex.build(ENTRIES)
+    assert index.remove(["a", "missing"]) == 1
+
+    assert snapshot(index) == snapshot(LexicalIndex.build(ENTRIES[1:]))
+    assert [store_id for store_id, _ in index.search("쑥라떼")] == []
+
+
+def test_upsert_replaces_document_and_metadata():
+    index = LexicalIndex.build(ENTRIES)
+    changed = ("a", "흑임자 라떼 카페", {"region": "서초구", "type_code": "1"})
+    added = ("d", "보드게임 카페", {"region": "마포구", "type_code": "1"})
+    index.upsert([changed, added])
+
+    expected = LexicalIndex.build([ENTRIES[1], ENTRIES[2], changed, added])
+    assert snapshot(index) == snapshot(expected)
+
+    assert index.search("조용한") == []
+    assert [store_id for store_id, _ in index.search("흑임자", region="서초구")] == ["a"]
+    assert index.search("흑임자", region="강남구") == []
+
+
+def test_save_load_after_update(tmp_path):
+    index = LexicalIndex.build(ENTRIES)
+    index.upsert([("b", "에끌레어 전문점", {"region": "마포구", "type_code": "1"})])
+    index.save(tmp_path / "stores.json")
+
+    loaded = LexicalIndex.load(tmp_path / "stores.json")
+    assert snapshot(loaded) == snapshot(index)
@@ -0,0 +1,282 @@
+"""
+세션 저장소 백엔드 테스트 (memory / sqlite / redis - fakeredis 로 대체)
+"""
+import asyncio
+import time
+
+import pytest
+
+from src.service.application.session_store import MemorySessionStore, SqliteSessionStore, RedisSessionStore, \
+    SessionConflictError, compact_session, create_session_store
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+@pytest.fixture(params=["memory", "sqlite", "redis"])
+def make_store(request, tmp_path):
+    def factory(ttl_s=None, **kwargs):
+        if request.param == "memory":
+            return MemorySessionStore(ttl_s=ttl_s, **kwargs)
+        if request.param == "sqlite":
+            return SqliteSessionStore(str(tmp_path / "sessions.sqlite3"), ttl_s=ttl_s, **kwargs)
+
+        fakeredis = pytest.importorskip("fakeredis")
+        return RedisSessionStore(ttl_s=ttl_s, client=fakeredis.FakeAsyncRedis(), **kwargs)
+
+    return factory
+
+
+def test_set_get_delete(make_store):
+    async def scenario():
+        store = make_store()
+        await store.ping()
+
+        assert await store.get("missing") is None
+
+        await store.set("s1", {"stage": "collecting_details", "collectedTags": {"카페": ["조용한"]}})
+        session = await store.get("s1")
+        assert session["stage"] == "collecting_details"
+        assert session["collectedTags"] == {"카페": ["조용한"]}
+
+        await store.delete("s1")
+        assert await store.get("s1") is None
+        await store.close()
+
+    run(scenario())
+
+
+def test_get_returns_copy(make_store):
+    async def scenario():
+        store = make_store()
+        await store.set("s1", {"conversationHistory": []})
+
+        session = await store.get("s1")
+        session["conversationHistory"].append({"role": "user", "message": "안녕"})
+        assert (await store.get("s1"))["conversationHistory"] == []
+        await store.close()
+
+    run(scenario())
+
+
+def test_expiry(make_store):
+    async def scenario():
+        # redis 는 초 단위 TTL 이므로 1초
+        store = make_store(ttl_s=1)
+        await store.set("s1", {"stage": "collecting_details"})
+        assert await store.get("s1") is not None
+
+        time.sleep(1.1)
+        assert await store.get("s1") is None
+        await store.close()
+
+    run(scenario())
+
+
+def test_concurrent_save_conflicts(make_store):
+    async def scenario():
+        store = make_store()
+        await store.set("s1", {"currentCategoryIndex": 0})
+
+        # 같은 세션을 두 요청이 동시에 읽음 (더블 탭, /chat + /chat/stream)
+        first = await store.get("s1")
+        second = await store.get("s1")
+
+        first["currentCategoryIndex"] = 1
+        await store.set("s1", first)
+
+        second["currentCategoryIndex"] = 2
+        with pytest.raises(SessionConflictError):
+            await store.set("s1", second)
+
+        # 먼저 저장한 요청의 변경 유지, 저장한 쪽은 다음 저장도 가능
+        assert (await store.get("s1"))["currentCategoryIndex"] == 1
+        first["currentCategoryIndex"] = 3
+        await store.set("s1", first)
+        assert (await store.get("s1"))["currentCategoryIndex"] == 3
+        await store.close()
+
+    run(scenario())
+
+
+def test_new_session_does_not_overwrite_existing(make_store):
+    async def scenario():
+        store = make_store()
+        await store.set("s1", {"stage": "collecting_details"})
+
+        with pytest.raises(SessionConflictError):
+            await store.set("s1", {"stage": "completed"})
+        await store.close()
+
+    run(scenario())
+
+
+def test_redis_sub_second_ttl_rounds_up():
+    fakeredis = pytest.importorskip("fakeredis")
+
+    async def scenario():
+        store = RedisSessionStore(ttl_s=0.2, client=fakeredis.FakeAsyncRedis())
+        await store.set("s1", {"stage": "collecting_details"})
+
+        assert await store.client.ttl(store._key("s1")) == 1
+        assert await store.get("s1") is not None
+        await store.close()
+
+    run(scenario())
+
+
+def test_sqlite_migrates_sessions_without_version(tmp_path):
+    import sqlite3
+
+    path = tmp_path / "sessions.sqlite3"
+    db = sqlite3.connect(path)
+    db.execute("CREATE TABLE sessions (session_id TEXT PRIMARY KEY, data BLOB NOT NULL, expires_at REAL)")
+    db.execute("INSERT INTO sessions VALUES ('s1', ?, NULL)", (b'{"stage":"collecting_details"}',))
+    db.commit()
+    db.close()
+
+    async def scenario():
+        store = SqliteSessionStore(str(path))
+        session = await store.get("s1")
+        assert session["version"] == 1
+
+        session["stage"] = "confirming_results"
+        await store.set("s1", session)
+        assert (await store.get("s1"))["stage"] == "confirming_results"
+        await store.close()
+
+    run(scenario())
+
+
+def test_sweep_evicts_least_recently_saved(make_store):
+    async def scenario():
+        store = make_store(max_sessions=2)
+        for session_id in ("s1", "s2", "s3"):
+            await store.set(session_id, {"stage": "collecting_details"})
+            time.sleep(0.01)
+
+        await store.sweep()
+        assert await store.get("s1") is None
+        assert await store.get("s2") is not None
+        assert await store.get("s3") is not None
+
+        metrics = await store.metrics()
+        assert metrics["sessions"] == 2
+        assert metrics["bytes"] > 0
+        await store.close()
+
+    run(scenario())
+
+
+def test_redis_sweep_drops_expired_from_index():
+    fakeredis = pytest.importorskip("fakeredis")
+
+    async def scenario():
+        store = RedisSessionStore(ttl_s=1, client=fakeredis.FakeAsyncRedis())
+        await store.set("s1", {"stage": "collecting_details"})
+        assert (await store.metrics())["sessions"] == 1
+
+        time.sleep(1.1)
+        assert await store.sweep() == 1
+        assert await store.client.zcard(store.index_key) == 0
+        assert await store.metrics() == {"sessions": 0, "bytes": 0}
+        await store.close()
+
+    run(scenario())
+
+
+def test_unknown_or_broken_backend_raises(tmp_path):
+    with pytest.raises(ValueError):
+        create_session_store({"backend": "memcached"})
+
+    # 디렉토리 경로는 SQLite 파일로 열 수 없음 → memory 로 대체하지 않고 예외
+    with pytest.raises(Exception):
+        create_session_store({"backend": "sqlite", "sqlite_path": str(tmp_path)})
+
+
+def test_memory_backend_from_config():
+    store = create_session_store({"backend": "memory", "max_sessions": 2, "ttl_s": 60})
+    assert isinstance(store, MemorySessionStore)
+    assert store.max_sessions == 2
+
+
+def completed_session() -> dict:
+    return {
+        "stage": "completed",
+        "conversationHistory": [{"role": "user", "message": f"메시지 {i}"} for i in range(5)],
+        "pendingTags": ["조용한"],
+        "lastUserMessage": "추천해줘",
+        "recommendations": {
+            "카페": [{"id": "c1", "name": "카페 1", "image": "a.jpg"}, {"id": "c2", "name": "카페 2"}],
+            "음식점": [{"id": "r1", "name": "식당 1"}],
+        },
+    }
+
+
+def test_compact_trims_history():
+    session = {"stage": "collecting_details", "conversationHistory": list(range(5))}
+    compacted = compact_session(session, max_history_turns=2)
+
+    assert compacted["conversationHistory"] == [3, 4]
+    assert session["conversationHistory"] == list(range(5))
+    assert "compacted" not in compacted
+
+    # 0 이면 전체 유지
+    assert compact_session(session)["conversationHistory"] == list(range(5))
+
+
+def test_compact_completed_keeps_store_ids():
+    session = completed_session()
+    compacted = compact_session(session, max_history_turns=2)
+
+    assert compacted["recommendations"] == {"카페": ["c1", "c2"], "음식점": ["r1"]}
+    assert compacted["conversationHistory"] == []
+    assert compacted["pendingTags"] == []
+    assert compacted["lastUserMessage"] == ""
+    assert compacted["compacted"] is True
+
+    # 원본은 그대로
+    assert session["recommendations"]["카페"][0]["name"] == "카페 1"
+    assert len(session["conversationHistory"]) == 5
+
+
+def test_compact_is_idempotent():
+    once = compact_session(completed_session())
+    twice = compact_session(once)
+
+    assert twice == once
+    assert compact_session({**once, "recommendations": {"카페": ["c1"]}})["recommendations"] == {"카페": ["c1"]}
+
+
+def test_completed_session_round_trip(make_store):
+    async def scenario():
+        store = make_store(max_history_turns=2)
+        session = completed_session()
+        await store.set("s1", session)
+
+        stored = await store.get("s1")
+        assert stored["recommendations"] == {"카페": ["c1", "c2"], "음식점": ["r1"]}
+        assert stored["conversationHistory"] == []
+        assert stored["compacted"] is True
+        assert stored["version"] == 1
+
+        # 다시 저장해도 그대로 (이미 축소된 세션)
+        await store.set("s1", stored)
+        again = await store.get("s1")
+        assert {k: v for k, v in again.items() if k != "version"} == {k: v for k, v in stored.items() if k != "version"}
+        assert again["version"] == 2
+        await store.close()
+
+    run(scenario())
+
+
+def test_history_trimmed_on_save(make_store):
+    async def scenario():
+        store = make_store(max_history_turns=3)
+        await store.set("s1", {"stage": "collecting_details", "conversationHistory": list(range(10))})
+
+        assert (await store.get("s1"))["conversationHistory"] == [7, 8, 9]
+        await store.close()
+
+    run(scenario())
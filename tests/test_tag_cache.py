@@ -0,0 +1,21 @@
+"""
+태그 캐시 키 정규화 테스트
+"""
+import unicodedata
+
+from src.service.application.tag_cache import normalize_message
+
+
+def test_recomposes_decomposed_syllables():
+    decomposed = unicodedata.normalize("NFD", "조용한 카페")
+    assert decomposed != "조용한 카페"
+    assert normalize_message(decomposed) == "조용한 카페"
+
+
+def test_keeps_compatibility_jamo():
+    assert normalize_message("ㅈㅗㅇ") == "ㅈㅗㅇ"
+
+
+def test_punctuation_case_and_whitespace():
+    assert normalize_message("  조용한   카페!! ") == "조용한 카페"
+    assert normalize_message("Quiet CAFE") == "quiet cafe"
@@ -0,0 +1,75 @@
+"""
+벡터 export 부분 갱신 테스트 (patch_vector_export 결과가 전체 export 와 같은지)
+"""
+import numpy as np
+import pytest
+
+from src.service.chromadb.vector_export import patch_vector_export, read_vector_export, write_vector_export
+
+DIM = 8
+
+
+def make_rows(ids, seed):
+    rng = np.random.default_rng(seed)
+    embeddings = rng.normal(size=(len(ids), DIM)).astype(np.float32)
+    metadatas = [{"store_id": store_id, "region": "강남구", "type_code": "1"} for store_id in ids]
+    documents = [f"문서 {store_id}" for store_id in ids]
+    return embeddings, metadatas, documents
+
+
+def load(tmp_path, dtype):
+    matrix, meta, full_matrix = read_vector_export(str(tmp_path), "stores_v1")
+    rows = {store_id: row for row, store_id in enumerate(meta["ids"])}
+    vectors = np.asarray(full_matrix if full_matrix is not None else matrix, dtype=np.float32)
+    return rows, vectors, meta
+
+
+@pytest.mark.parametrize("dtype", ["float32", "float16", "int8"])
+def test_update_existing_rows_in_place(tmp_path, dtype):
+    ids = ["a", "b", "c"]
+    embeddings, metadatas, documents = make_rows(ids, 0)
+    write_vector_export(str(tmp_path), "stores_v1", ids, embeddings, metadatas, documents, dtype=dtype)
+
+    new_embedding, new_metadata, _ = make_rows(["b"], 1)
+    new_metadata[0]["region"] = "마포구"
+    assert patch_vector_export(
+        str(tmp_path), "stores_v1", ["b"], new_embedding, new_metadata, ["새 문서"], [], dtype=dtype
+    )
+
+    rows, vectors, meta = load(tmp_path, dtype)
+    assert meta["ids"] == ids
+    assert meta["metadatas"][rows["b"]]["region"] == "마포구"
+    assert meta["documents"][rows["b"]] == "새 문서"
+
+    expected = new_embedding[0] / np.linalg.norm(new_embedding[0])
+    np.testing.assert_allclose(vectors[rows["b"]], expected, atol=1e-6)
+    np.testing.assert_allclose(vectors[rows["a"]], embeddings[0] / np.linalg.norm(embeddings[0]), atol=1e-6)
+
+
+@pytest.mark.parametrize("dtype", ["float32", "int8"])
+def test_insert_and_delete_rewrites_from_export(tmp_path, dtype):
+    ids = ["a", "b", "c"]
+    embeddings, metadatas, documents = make_rows(ids, 0)
+    write_vector_export(str(tmp_path), "stores_v1", ids, embeddings, metadatas, documents, dtype=dtype,
+                        extra={"embedding_model": "m"})
+
+    new_embedding, new_metadata, new_document = make_rows(["d"], 2)
+    assert patch_vector_export(
+        str(tmp_path), "stores_v1", ["d"], new_embedding, new_metadata, new_document, ["a"], dtype=dtype,
+        extra={"embedding_model": "m"}
+    )
+
+    rows, vectors, meta = load(tmp_path, dtype)
+    assert meta["ids"] == ["b", "c", "d"]
+    assert meta["count"] == 3
+    assert meta["embedding_model"] == "m"
+    np.testing.assert_allclose(vectors[rows["d"]], new_embedding[0] / np.linalg.norm(new_embedding[0]), atol=1e-6)
+    np.testing.assert_allclose(vectors[rows["c"]], embeddings[2] / np.linalg.norm(embeddings[2]), atol=1e-6)
+
+
+def test_missing_export_or_dtype_change_needs_full_export(tmp_path):
+    embedding, metadata, document = make_rows(["a"], 0)
+    assert not patch_vector_export(str(tmp_path), "stores_v1", ["a"], embedding, metadata, document, [])
+
+    write_vector_export(str(tmp_path), "stores_v1", ["a"], embedding, metadata, document, dtype="float32")
+    assert not patch_vector_export(str(tmp_path), "stores_v1", ["a"], embedding, metadata, document, [], dtype="int8")